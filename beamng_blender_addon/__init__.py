@@ -31,6 +31,10 @@ classes = []
 
 def register():
     """Register all addon classes and handlers"""
+    # Register addon preferences first so operators can read them
+    from .utils import preferences
+    preferences.register()
+    
     # Register operators
     operators.register()
     
@@ -41,17 +45,34 @@ def register():
     from .utils.properties import register_properties
     register_properties()
     
+    # Start the terrain tile LOD timer
+    from .utils import terrain_lod
+    terrain_lod.register()
+    
+    # Keep the DecalRoad persistent ID registry in step with the scene
+    from .utils import road_registry
+    road_registry.register()
+    
     print("BeamNG Blender Addon: Registered successfully")
 
 def unregister():
     """Unregister all addon classes and handlers"""
     # Unregister in reverse order
+    from .utils import road_registry
+    road_registry.unregister()
+    
+    from .utils import terrain_lod
+    terrain_lod.unregister()
+    
     from .utils.properties import unregister_properties
     unregister_properties()
     
     ui.unregister()
     operators.unregister()
     
+    from .utils import preferences
+    preferences.unregister()
+    
     print("BeamNG Blender Addon: Unregistered successfully")
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+"""
+Formats module for BeamNG Blender addon
+Standalone readers and writers for BeamNG binary formats - no bpy
+dependency, so the same code is shared by the addon and the command line tools
+"""
+
+from .ter import (
+    TerrainFile,
+    TerrainLayout,
+    patch_terrain,
+    quantize_heightmap,
+    terrain_config,
+    write_terrain,
+)
+from .stats import cached_terrain_stats, terrain_stats
+
+__all__ = [
+    'TerrainFile',
+    'TerrainLayout',
+    'cached_terrain_stats',
+    'patch_terrain',
+    'quantize_heightmap',
+    'terrain_config',
+    'terrain_stats',
+    'write_terrain'
+]
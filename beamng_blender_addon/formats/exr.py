@@ -0,0 +1,125 @@
+"""
+Single-Channel EXR Writer
+Minimal scanline OpenEXR encoder (half or float, NONE/ZIPS/ZIP compression)
+that streams an image block by block, so only one block is ever converted
+"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Tuple, Union
+
+import numpy as np
+
+
+EXR_MAGIC = 20000630
+EXR_VERSION = 2  # single-part scanline file
+
+PIXEL_TYPES: Dict[str, Tuple[int, np.dtype]] = {
+    'HALF': (1, np.dtype('<f2')),
+    'FLOAT': (2, np.dtype('<f4')),
+}
+
+# Compression name -> (EXR compression id, scanlines per chunk)
+COMPRESSIONS: Dict[str, Tuple[int, int]] = {
+    'NONE': (0, 1),
+    'ZIPS': (2, 1),
+    'ZIP': (3, 16),
+}
+
+# Scanlines converted per step when chunks hold a single line
+MIN_LINES_PER_STEP = 64
+
+
+def _attribute(name: str, type_name: str, value: bytes) -> bytes:
+    return name.encode() + b'\0' + type_name.encode() + b'\0' + struct.pack('<i', len(value)) + value
+
+
+def _header(width: int, height: int, channel: str, pixel_type: int, compression: int) -> bytes:
+    channels = channel.encode() + b'\0' + struct.pack('<iB3xii', pixel_type, 0, 1, 1) + b'\0'
+    window = struct.pack('<iiii', 0, 0, width - 1, height - 1)
+    return b''.join([
+        struct.pack('<ii', EXR_MAGIC, EXR_VERSION),
+        _attribute('channels', 'chlist', channels),
+        _attribute('compression', 'compression', bytes([compression])),
+        _attribute('dataWindow', 'box2i', window),
+        _attribute('displayWindow', 'box2i', window),
+        _attribute('lineOrder', 'lineOrder', bytes([0])),  # INCREASING_Y
+        _attribute('pixelAspectRatio', 'float', struct.pack('<f', 1.0)),
+        _attribute('screenWindowCenter', 'v2f', struct.pack('<ff', 0.0, 0.0)),
+        _attribute('screenWindowWidth', 'float', struct.pack('<f', 1.0)),
+        b'\0',
+    ])
+
+
+def _zip_block(raw: bytes, level: int) -> bytes:
+    """EXR ZIP/ZIPS chunk: split even/odd bytes, delta-encode, deflate; raw data if that is not smaller"""
+    data = np.frombuffer(raw, dtype=np.uint8)
+    half = (len(data) + 1) // 2
+    reordered = np.empty_like(data)
+    reordered[:half] = data[0::2]
+    reordered[half:] = data[1::2]
+
+    predicted = reordered.copy()
+    predicted[1:] = (reordered[1:].astype(np.int16) - reordered[:-1] + 128).astype(np.uint8)
+
+    compressed = zlib.compress(predicted.tobytes(), level)
+    return compressed if len(compressed) < len(raw) else raw
+
+
+def write_exr(output: Union[str, Path, BinaryIO], array: np.ndarray, pixel_type: str = 'HALF',
+              compression: str = 'ZIP', scale: float = 1.0, channel: str = 'Y',
+              flip_rows: bool = True, level: int = 6) -> None:
+    """Write a (height, width) array as a single-channel scanline EXR
+
+    Values are multiplied by scale and converted to half or float one chunk
+    of scanlines at a time, so a memory-mapped source is never loaded whole.
+    Like the PNG writer, rows are flipped by default so row 0 ends up at the
+    bottom of the image in Blender.
+    """
+    if pixel_type not in PIXEL_TYPES:
+        raise ValueError(f"Unsupported EXR pixel type: {pixel_type}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported EXR compression: {compression}")
+
+    if isinstance(output, (str, Path)):
+        with open(output, 'wb') as f:
+            write_exr(f, array, pixel_type, compression, scale, channel, flip_rows, level)
+        return
+
+    type_id, dtype = PIXEL_TYPES[pixel_type]
+    compression_id, lines_per_chunk = COMPRESSIONS[compression]
+    height, width = array.shape
+    rows = array[::-1] if flip_rows else array
+
+    # Convert a few chunks at a time; the offset table is filled in at the end
+    group = max(lines_per_chunk, MIN_LINES_PER_STEP)
+    chunk_count = (height + lines_per_chunk - 1) // lines_per_chunk
+
+    f = output
+    f.write(_header(width, height, channel, type_id, compression_id))
+    table_position = f.tell()
+    f.write(b'\0' * (8 * chunk_count))
+
+    offsets = []
+    block = np.empty((group, width), dtype=dtype)
+    for start in range(0, height, group):
+        stop = min(start + group, height)
+        view = block[:stop - start]
+        if scale == 1.0:
+            view[:] = rows[start:stop]
+        else:
+            np.multiply(rows[start:stop], scale, out=view, casting='unsafe')
+
+        for chunk_start in range(start, stop, lines_per_chunk):
+            chunk_stop = min(chunk_start + lines_per_chunk, stop)
+            raw = view[chunk_start - start:chunk_stop - start].tobytes()
+            data = raw if compression == 'NONE' else _zip_block(raw, level)
+            offsets.append(f.tell())
+            f.write(struct.pack('<ii', chunk_start, len(data)))
+            f.write(data)
+
+    end = f.tell()
+    f.seek(table_position)
+    f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+    f.seek(end)
@@ -0,0 +1,64 @@
+"""
+Grayscale PNG Writer
+Minimal 8/16-bit single-channel PNG encoder for compact terrain images
+"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+ROWS_PER_CHUNK = 256
+
+
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def encode_grayscale_png(array: np.ndarray, flip_rows: bool = True, level: int = 6) -> bytes:
+    """Encode a (height, width) uint8 or uint16 array as a single-channel PNG
+
+    PNG stores the top row first while Blender images start at the bottom, so
+    rows are flipped by default to keep row 0 at the bottom of the image.
+    Rows are compressed in blocks to bound the temporary memory.
+    """
+    if array.dtype.kind == 'u' and array.dtype.itemsize == 1:
+        bit_depth, dtype = 8, np.dtype(np.uint8)
+    elif array.dtype.kind == 'u' and array.dtype.itemsize == 2:
+        bit_depth, dtype = 16, np.dtype('>u2')
+    else:
+        raise ValueError(f"Unsupported PNG dtype: {array.dtype}")
+
+    height, width = array.shape
+    rows = array[::-1] if flip_rows else array
+
+    header = struct.pack('>IIBBBBB', width, height, bit_depth, 0, 0, 0, 0)
+    compressor = zlib.compressobj(level)
+    compressed = []
+
+    row_bytes = width * dtype.itemsize
+    block = np.zeros((min(ROWS_PER_CHUNK, height), row_bytes + 1), dtype=np.uint8)
+    for start in range(0, height, ROWS_PER_CHUNK):
+        stop = min(start + ROWS_PER_CHUNK, height)
+        view = block[:stop - start]
+        # Column 0 is the per-row filter type (0 = none), the rest is big-endian pixel data
+        view[:, 1:] = np.ascontiguousarray(rows[start:stop], dtype=dtype).view(np.uint8).reshape(stop - start, row_bytes)
+        compressed.append(compressor.compress(view.tobytes()))
+    compressed.append(compressor.flush())
+
+    return b''.join([
+        PNG_SIGNATURE,
+        _chunk(b'IHDR', header),
+        _chunk(b'IDAT', b''.join(compressed)),
+        _chunk(b'IEND', b''),
+    ])
+
+
+def write_grayscale_png(path: Union[str, Path], array: np.ndarray, flip_rows: bool = True) -> None:
+    """Write a (height, width) uint8 or uint16 array as a single-channel PNG file"""
+    with open(path, 'wb') as f:
+        f.write(encode_grayscale_png(array, flip_rows=flip_rows))
@@ -0,0 +1,113 @@
+"""
+Terrain Height Statistics
+Single-pass histogram statistics for uint16 heightmaps, cached next to the .ter
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+
+HISTOGRAM_BINS = 65536
+CHUNK_ROWS = 256
+STATS_CACHE_SUFFIX = '.stats.json'
+STATS_CACHE_VERSION = 1
+
+
+def height_histogram(heightmap: np.ndarray, chunk_rows: int = CHUNK_ROWS) -> np.ndarray:
+    """Count every uint16 height value in one chunked pass
+
+    Works on memory-mapped input: only chunk_rows rows are resident at a time.
+    """
+    histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+    for start in range(0, heightmap.shape[0], chunk_rows):
+        chunk = np.asarray(heightmap[start:start + chunk_rows])
+        histogram += np.bincount(chunk.ravel(), minlength=HISTOGRAM_BINS)
+    return histogram
+
+
+def stats_from_histogram(histogram: np.ndarray, shape) -> Dict[str, Any]:
+    """Derive min, max, mean, std, median and unique count from a height histogram"""
+    count = int(histogram.sum())
+    if count == 0:
+        raise ValueError("Cannot compute statistics of an empty heightmap")
+
+    values = np.flatnonzero(histogram)
+    counts = histogram[values]
+    weights = counts / count
+    mean = float(np.dot(values, weights))
+    variance = float(np.dot((values - mean) ** 2, weights))
+
+    # Median: average of the two middle samples, located through the cumulative counts
+    cumulative = np.cumsum(counts)
+    lower = values[np.searchsorted(cumulative, (count - 1) // 2, side='right')]
+    upper = values[np.searchsorted(cumulative, count // 2, side='right')]
+
+    zero_count = int(histogram[0])
+    return {
+        'shape': tuple(shape),
+        'min_height': int(values[0]),
+        'max_height': int(values[-1]),
+        'mean_height': mean,
+        'std_height': variance ** 0.5,
+        'median_height': (float(lower) + float(upper)) / 2,
+        'unique_values': int(len(values)),
+        'zero_count': zero_count,
+        'zero_percentage': zero_count / count * 100,
+    }
+
+
+def terrain_stats(heightmap: np.ndarray, chunk_rows: int = CHUNK_ROWS) -> Dict[str, Any]:
+    """Height statistics of a uint16 heightmap from a single chunked pass"""
+    return stats_from_histogram(height_histogram(heightmap, chunk_rows), heightmap.shape)
+
+
+def _stats_cache_path(ter_file: Path) -> Path:
+    return ter_file.with_name(ter_file.name + STATS_CACHE_SUFFIX)
+
+
+def load_cached_stats(ter_file: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Return the cached statistics for ter_file, if they still describe the file"""
+    ter_file = Path(ter_file)
+    try:
+        with open(_stats_cache_path(ter_file), 'r') as f:
+            cache = json.load(f)
+        stat = ter_file.stat()
+    except (OSError, ValueError):
+        return None
+
+    if (cache.get('version') != STATS_CACHE_VERSION or
+            cache.get('file_size') != stat.st_size or cache.get('mtime_ns') != stat.st_mtime_ns):
+        return None
+    stats = cache['stats']
+    stats['shape'] = tuple(stats['shape'])
+    return stats
+
+
+def save_cached_stats(ter_file: Union[str, Path], stats: Dict[str, Any]) -> bool:
+    """Write stats next to ter_file; returns False if the directory is not writable"""
+    ter_file = Path(ter_file)
+    try:
+        stat = ter_file.stat()
+        cache = {
+            'version': STATS_CACHE_VERSION,
+            'file_size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'stats': stats,
+        }
+        with open(_stats_cache_path(ter_file), 'w') as f:
+            json.dump(cache, f, indent=2)
+    except OSError:
+        return False
+    return True
+
+
+def cached_terrain_stats(ter_file: Union[str, Path], heightmap: np.ndarray) -> Dict[str, Any]:
+    """Statistics for the heightmap of ter_file, reusing the cache while the file is unchanged"""
+    stats = load_cached_stats(ter_file)
+    if stats is None:
+        stats = terrain_stats(heightmap)
+        save_cached_stats(ter_file, stats)
+    return stats
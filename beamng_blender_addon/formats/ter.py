@@ -0,0 +1,554 @@
+"""
+BeamNG .ter Terrain Format
+Lazy reader and buffered writer for .ter terrain files
+(see BeamNG_TER_Format_Documentation.md)
+
+Layout (all little-endian):
+    version (uint8), size (uint32)
+    heightmap         size*size uint16
+    layermap          size*size uint8   (255 = hole)
+    layer texture map size*size uint8
+    coverage maps     4 x size*size uint8
+    material table    count (uint32) + length-prefixed names
+"""
+
+import hashlib
+import json
+import os
+from functools import cached_property
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+
+import numpy as np
+
+
+HEADER_SIZE = 5
+COVERAGE_MAP_COUNT = 4
+HOLE_VALUE = 255
+DEFAULT_VERSION = 9
+WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+BINARY_FORMAT = ("version(char), size(unsigned int), heightMap(heightMapSize * heightMapItemSize), "
+                 "layerMap(layerMapSize * layerMapItemSize), layerTextureMap(layerMapSize * layerMapItemSize), "
+                 "materialNames")
+
+
+class TerrainLayout:
+    """Byte offsets of every .ter section, computed from the header and file size"""
+
+    def __init__(self, size: int, file_size: int):
+        self.size = size
+        self.file_size = file_size
+        self.map_bytes = size * size
+
+        self.heightmap_offset = HEADER_SIZE
+        self.heightmap_bytes = self.map_bytes * 2
+        self.layermap_offset = self.heightmap_offset + self.heightmap_bytes
+
+        layermap_end = self.layermap_offset + self.map_bytes
+        self.layermap_bytes = max(min(file_size, layermap_end) - self.layermap_offset, 0)
+
+        # The byte maps after the layermap are not present in every file version;
+        # the material table is always much smaller than one map, so the number
+        # of whole maps in the tail tells us which sections exist
+        tail_bytes = max(file_size - layermap_end, 0)
+        self.extra_map_count = tail_bytes // self.map_bytes if self.map_bytes else 0
+
+        self.layer_texture_map_offset = layermap_end if self.extra_map_count >= 1 else None
+        self.coverage_map_offsets = [
+            layermap_end + self.map_bytes * (i + 1)
+            for i in range(min(max(self.extra_map_count - 1, 0), COVERAGE_MAP_COUNT))
+        ]
+        self.material_table_offset = (layermap_end + self.map_bytes * self.extra_map_count
+                                      if file_size > layermap_end else None)
+
+    @property
+    def is_truncated(self) -> bool:
+        """True if the layermap is incomplete"""
+        return self.layermap_bytes < self.map_bytes
+
+
+def _parse_names(data: bytes, terminated: bool) -> Optional[List[str]]:
+    count = int.from_bytes(data[:4], 'little')
+    names = []
+    pos = 4
+    for _ in range(count):
+        if pos >= len(data):
+            return None
+        length = data[pos]
+        end = pos + 1 + length
+        if end + terminated > len(data) or (terminated and data[end] != 0):
+            return None
+        names.append(data[pos + 1:end].decode('ascii', errors='replace'))
+        pos = end + terminated
+    return names if pos == len(data) else None
+
+
+def parse_material_table(data: bytes) -> Optional[List[str]]:
+    """Decode a count-prefixed table of length-prefixed names, or None if malformed
+
+    Names are accepted with or without a trailing null byte after each string.
+    """
+    if len(data) < 4:
+        return None
+    names = _parse_names(data, terminated=False)
+    if names is None:
+        names = _parse_names(data, terminated=True)
+    return names
+
+
+def _read_into(f: BinaryIO, array: np.ndarray) -> int:
+    """Fill a contiguous array from the current file position, returning bytes read"""
+    view = memoryview(array.reshape(-1).view(np.uint8))
+    filled = 0
+    while filled < len(view):
+        count = f.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+class TerrainFile:
+    """BeamNG terrain file with lazily decoded sections
+
+    Only the 5-byte header is read on construction. Each map is a view over a
+    memory map of the file and is created on first access, so callers only pay
+    for the sections they touch. Use load() to decode everything in one pass.
+    """
+
+    def __init__(self, ter_file: Union[str, Path], json_file: Union[str, Path, None, bool] = None,
+                 offset: int = 0, length: Optional[int] = None, config: Optional[Dict[str, Any]] = None):
+        """Open a terrain; json_file defaults to the sibling .terrain.json, pass False to skip it
+
+        offset and length locate the terrain inside a larger container file, such
+        as an uncompressed zip member. A pre-parsed config replaces the .terrain.json.
+        """
+        self.path = Path(ter_file)
+        self.offset = offset
+
+        if config is not None:
+            self.__dict__['config'] = config
+            json_file = False
+        if json_file is None:
+            sibling = self.path.with_suffix('.terrain.json')
+            json_file = sibling if sibling.exists() else None
+        self.json_path = Path(json_file) if json_file else None
+
+        self.file_size = length if length is not None else self.path.stat().st_size - offset
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            header = f.read(HEADER_SIZE)
+
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"File too small for a .ter header: {self.path}")
+
+        self.version = header[0]
+        self.size = int.from_bytes(header[1:5], 'little')
+        self.layout = TerrainLayout(self.size, self.file_size)
+        self.loaded = False
+
+        if self.file_size < self.layout.layermap_offset:
+            raise ValueError(f"Truncated heightmap: expected {self.layout.heightmap_bytes} bytes, "
+                             f"got {max(self.file_size - HEADER_SIZE, 0)}")
+
+        config = self.config
+        if config and (config.get('version', self.version) != self.version or
+                       config.get('size', self.size) != self.size):
+            raise ValueError(f"Header mismatch: got version={self.version}, size={self.size}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @cached_property
+    def config(self) -> Dict[str, Any]:
+        """Parsed .terrain.json, or an empty dict if there is none"""
+        if not self.json_path:
+            return {}
+        with open(self.json_path, 'r') as f:
+            return json.load(f)
+
+    @property
+    def materials(self) -> List[str]:
+        """Material names, preferring .terrain.json over the embedded table"""
+        return self.config.get('materials') or self.material_names
+
+    @cached_property
+    def _data(self) -> np.memmap:
+        return np.memmap(self.path, dtype=np.uint8, mode='r', offset=self.offset, shape=(self.file_size,))
+
+    def _map(self, offset: int) -> np.ndarray:
+        return self._data[offset:offset + self.layout.map_bytes].reshape((self.size, self.size))
+
+    @cached_property
+    def heightmap(self) -> np.ndarray:
+        """(size, size) little-endian uint16 heights"""
+        layout = self.layout
+        start = layout.heightmap_offset
+        return self._data[start:start + layout.heightmap_bytes].view('<u2').reshape((self.size, self.size))
+
+    @cached_property
+    def layermap(self) -> Optional[np.ndarray]:
+        """(size, size) uint8 material indices, zero-padded if the file is truncated"""
+        layout = self.layout
+        if layout.layermap_bytes < self.size:
+            return None
+        if not layout.is_truncated:
+            return self._map(layout.layermap_offset)
+
+        layermap = np.zeros(layout.map_bytes, dtype=np.uint8)
+        layermap[:layout.layermap_bytes] = self._data[layout.layermap_offset:
+                                                      layout.layermap_offset + layout.layermap_bytes]
+        return layermap.reshape((self.size, self.size))
+
+    @cached_property
+    def hole_mask(self) -> Optional[np.ndarray]:
+        """(size, size) bool mask of hole cells (layermap == 255), None without a layermap"""
+        layermap = self.layermap
+        return None if layermap is None else layermap == HOLE_VALUE
+
+    @cached_property
+    def layer_texture_map(self) -> Optional[np.ndarray]:
+        """(size, size) uint8 layer texture map, if present"""
+        offset = self.layout.layer_texture_map_offset
+        return self._map(offset) if offset is not None else None
+
+    @cached_property
+    def coverage_maps(self) -> List[np.ndarray]:
+        """Up to four (size, size) uint8 coverage maps"""
+        return [self._map(offset) for offset in self.layout.coverage_map_offsets]
+
+    @cached_property
+    def material_names(self) -> List[str]:
+        """Material names embedded at the end of the file"""
+        offset = self.layout.material_table_offset
+        if offset is None:
+            return []
+        names = parse_material_table(self._data[offset:].tobytes())
+        return names if names is not None else []
+
+    def load(self) -> 'TerrainFile':
+        """Decode every section in one sequential read of the file
+
+        Sections are read straight into preallocated arrays in file order, so a
+        full decode costs a single pass and no size-probing re-reads. Afterwards
+        the section properties return the in-memory arrays.
+        """
+        if self.loaded:
+            return self
+
+        layout = self.layout
+        shape = (self.size, self.size)
+
+        heightmap = np.empty(shape, dtype='<u2')
+        layermap = np.zeros(shape, dtype=np.uint8) if layout.layermap_bytes >= self.size else None
+        layer_texture_map = np.empty(shape, dtype=np.uint8) if layout.layer_texture_map_offset is not None else None
+        coverage_maps = [np.empty(shape, dtype=np.uint8) for _ in layout.coverage_map_offsets]
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            header = f.read(HEADER_SIZE)
+            if header[0] != self.version or int.from_bytes(header[1:5], 'little') != self.size:
+                raise ValueError(f"Terrain file changed while reading: {self.path}")
+
+            if _read_into(f, heightmap) != layout.heightmap_bytes:
+                raise ValueError(f"Truncated heightmap: {self.path}")
+
+            if layermap is not None:
+                _read_into(f, layermap)
+            for array in ([layer_texture_map] if layer_texture_map is not None else []) + coverage_maps:
+                _read_into(f, array)
+
+            material_names = []
+            if layout.material_table_offset is not None:
+                # Skip any maps beyond the documented ones without reading them
+                f.seek(self.offset + layout.material_table_offset)
+                material_names = parse_material_table(f.read(self.file_size - layout.material_table_offset)) or []
+
+        self.__dict__.update(
+            heightmap=heightmap,
+            layermap=layermap,
+            layer_texture_map=layer_texture_map,
+            coverage_maps=coverage_maps,
+            material_names=material_names,
+        )
+        self.__dict__.pop('_data', None)
+        self.loaded = True
+        return self
+
+    def validate_materials(self) -> List[str]:
+        """Cross-check the embedded material table against .terrain.json materials
+
+        Returns a list of human readable problems, empty if both agree.
+        """
+        config_materials = self.config.get('materials')
+        embedded = self.material_names
+        if not config_materials or not embedded:
+            return []
+
+        problems = []
+        if len(config_materials) != len(embedded):
+            problems.append(f"Material count mismatch: .terrain.json has {len(config_materials)}, "
+                            f".ter has {len(embedded)}")
+        for index, (expected, actual) in enumerate(zip(config_materials, embedded)):
+            if expected != actual:
+                problems.append(f"Material {index}: .terrain.json '{expected}' != .ter '{actual}'")
+        return problems
+
+    def close(self) -> None:
+        """Drop the memory map and every view decoded from it"""
+        for name in ('heightmap', 'layermap', 'hole_mask', 'layer_texture_map', 'coverage_maps',
+                     'material_names', '_data'):
+            self.__dict__.pop(name, None)
+        self.loaded = False
+
+
+def encode_material_table(names: List[str]) -> bytes:
+    """Encode material names as a count-prefixed table of length-prefixed strings"""
+    table = bytearray(len(names).to_bytes(4, 'little'))
+    for name in names:
+        encoded = name.encode('ascii', errors='replace')
+        if len(encoded) > 255:
+            raise ValueError(f"Material name too long for .ter table: {name}")
+        table.append(len(encoded))
+        table += encoded
+    return bytes(table)
+
+
+def quantize_heightmap(heights: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Quantize heights to little-endian uint16, where `scale` maps to 0xFFFF
+
+    Pass scale=1.0 for normalised 0-1 values (e.g. the displacement image) or
+    the level's heightScale for heights in metres.
+    """
+    quantized = np.multiply(heights, 65535.0 / scale, dtype=np.float32)
+    np.rint(quantized, out=quantized)
+    np.clip(quantized, 0, 65535, out=quantized)
+    return quantized.astype('<u2')
+
+
+def terrain_config(size: int, materials: List[str], datafile: str = "",
+                   version: int = DEFAULT_VERSION) -> Dict[str, Any]:
+    """Build the .terrain.json description matching a written .ter"""
+    return {
+        'binaryFormat': BINARY_FORMAT,
+        'datafile': datafile,
+        'heightMapItemSize': 2,
+        'heightMapSize': size * size,
+        'layerMapItemSize': 1,
+        'layerMapSize': size * size,
+        'materials': list(materials),
+        'size': size,
+        'version': version,
+    }
+
+
+def _square_heightmap(heightmap: np.ndarray) -> np.ndarray:
+    """The heightmap as contiguous little-endian uint16, rejecting anything but a square 2D map"""
+    heightmap = np.ascontiguousarray(heightmap, dtype='<u2')
+    if heightmap.ndim != 2 or heightmap.shape[0] != heightmap.shape[1]:
+        raise ValueError(f"Heightmap must be square, got shape {heightmap.shape}")
+    return heightmap
+
+
+def write_terrain(ter_file: Union[str, Path], heightmap: np.ndarray,
+                  layermap: Optional[np.ndarray] = None,
+                  materials: Optional[List[str]] = None,
+                  layer_texture_map: Optional[np.ndarray] = None,
+                  coverage_maps: Optional[List[np.ndarray]] = None,
+                  version: int = DEFAULT_VERSION) -> int:
+    """Write a .ter file in one buffered pass, returning the bytes written
+
+    The heightmap is written as little-endian uint16 and every map must be
+    (size, size). A missing layermap or layer texture map is written as zeros,
+    matching the binaryFormat that BeamNG records in .terrain.json. The file is
+    written next to the target and moved into place, so a failed export never
+    leaves a half-written terrain behind.
+    """
+    heightmap = _square_heightmap(heightmap)
+    size = heightmap.shape[0]
+
+    def byte_map(array: Optional[np.ndarray], name: str) -> np.ndarray:
+        if array is None:
+            return np.zeros((size, size), dtype=np.uint8)
+        if array.shape != heightmap.shape:
+            raise ValueError(f"{name} shape {array.shape} does not match heightmap {heightmap.shape}")
+        return np.ascontiguousarray(array, dtype=np.uint8)
+
+    sections = [
+        bytes([version]) + size.to_bytes(4, 'little'),
+        heightmap,
+        byte_map(layermap, "Layermap"),
+        byte_map(layer_texture_map, "Layer texture map"),
+    ]
+    sections += [byte_map(cover, "Coverage map") for cover in (coverage_maps or [])[:COVERAGE_MAP_COUNT]]
+    sections.append(encode_material_table(list(materials or [])))
+
+    ter_file = Path(ter_file)
+    temp_file = ter_file.with_name(ter_file.name + '.tmp')
+    written = 0
+    try:
+        with open(temp_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            for section in sections:
+                written += f.write(memoryview(section).cast('B'))
+        os.replace(temp_file, ter_file)
+    except BaseException:
+        if temp_file.exists():
+            temp_file.unlink()
+        raise
+    return written
+
+
+DEFAULT_TILE_SIZE = 256
+TILE_INDEX_SUFFIX = '.tiles.json'
+
+
+def tile_hashes(array: np.ndarray, tile_size: int = DEFAULT_TILE_SIZE) -> List[str]:
+    """Hash a 2D map tile by tile, in row-major tile order"""
+    rows, cols = array.shape
+    hashes = []
+    for r in range(0, rows, tile_size):
+        for c in range(0, cols, tile_size):
+            tile = np.ascontiguousarray(array[r:r + tile_size, c:c + tile_size])
+            hashes.append(hashlib.blake2b(tile, digest_size=16).hexdigest())
+    return hashes
+
+
+def _tile_slices(size: int, tile_size: int):
+    for r in range(0, size, tile_size):
+        for c in range(0, size, tile_size):
+            yield slice(r, r + tile_size), slice(c, c + tile_size)
+
+
+def _tile_index_path(ter_file: Path) -> Path:
+    return ter_file.with_name(ter_file.name + TILE_INDEX_SUFFIX)
+
+
+def _load_tile_index(ter_file: Path, size: int, tile_size: int) -> Optional[Dict[str, Any]]:
+    """Load the tile hashes recorded by the last export, if they still describe the file"""
+    try:
+        with open(_tile_index_path(ter_file), 'r') as f:
+            index = json.load(f)
+        stat = ter_file.stat()
+    except (OSError, ValueError):
+        return None
+
+    if (index.get('size') != size or index.get('tile_size') != tile_size or
+            index.get('file_size') != stat.st_size or index.get('mtime_ns') != stat.st_mtime_ns):
+        return None
+    return index
+
+
+def _save_tile_index(ter_file: Path, size: int, tile_size: int,
+                     height_hashes: List[str], layer_hashes: Optional[List[str]]) -> None:
+    stat = ter_file.stat()
+    index = {
+        'size': size,
+        'tile_size': tile_size,
+        'file_size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'heightmap': height_hashes,
+        'layermap': layer_hashes,
+    }
+    with open(_tile_index_path(ter_file), 'w') as f:
+        json.dump(index, f)
+
+
+def patch_terrain(ter_file: Union[str, Path], heightmap: np.ndarray,
+                  layermap: Optional[np.ndarray] = None,
+                  materials: Optional[List[str]] = None,
+                  tile_size: int = DEFAULT_TILE_SIZE) -> Dict[str, Any]:
+    """Update an existing .ter in place, rewriting only the tiles that changed
+
+    Each heightmap and layermap tile is hashed and compared with the hashes
+    recorded next to the file by the previous export (or, failing that, with
+    hashes of the file on disk). Dirty tiles are written through a writable
+    memory map, so the work is proportional to the edited area. A layermap of
+    None leaves the existing layer data untouched.
+
+    Falls back to an atomic full rewrite with write_terrain() when there is no
+    file yet, the terrain size changed, or the material table changed length.
+    Returns a summary of the work done.
+    """
+    ter_file = Path(ter_file)
+    # Validate everything up front: the in-place path writes tiles as it goes
+    heightmap = _square_heightmap(heightmap)
+    if layermap is not None and layermap.shape != heightmap.shape:
+        raise ValueError(f"Layermap shape {layermap.shape} does not match heightmap {heightmap.shape}")
+    size = heightmap.shape[0]
+    materials = list(materials or [])
+
+    height_hashes = tile_hashes(heightmap, tile_size)
+    layer_hashes = tile_hashes(np.ascontiguousarray(layermap, dtype=np.uint8), tile_size) if layermap is not None else None
+    summary = {'tiles': len(height_hashes), 'dirty_tiles': 0, 'bytes_written': 0, 'full_rewrite': False}
+
+    existing = TerrainFile(ter_file, json_file=False) if ter_file.exists() else None
+    table = encode_material_table(materials)
+    layout = existing.layout if existing else None
+
+    needs_rewrite = (existing is None or existing.size != size or layout.is_truncated or
+                     layout.material_table_offset is None or
+                     layout.file_size - layout.material_table_offset != len(table))
+
+    if needs_rewrite:
+        keep_extras = existing is not None and existing.size == size
+        if keep_extras:
+            # Pull the sections we carry over into memory before the file is replaced
+            existing.load()
+        summary['bytes_written'] = write_terrain(
+            ter_file, heightmap,
+            layermap if layermap is not None else (existing.layermap if keep_extras else None),
+            materials,
+            layer_texture_map=existing.layer_texture_map if keep_extras else None,
+            coverage_maps=existing.coverage_maps if keep_extras else None,
+            version=existing.version if existing else DEFAULT_VERSION,
+        )
+        if existing:
+            existing.close()
+        summary['full_rewrite'] = True
+        summary['dirty_tiles'] = summary['tiles']
+        _save_tile_index(ter_file, size, tile_size, height_hashes, layer_hashes)
+        return summary
+
+    index = _load_tile_index(ter_file, size, tile_size)
+    old_height_hashes = index['heightmap'] if index else tile_hashes(existing.heightmap, tile_size)
+    old_layer_hashes = None
+    if layer_hashes is not None:
+        old_layer_hashes = (index.get('layermap') if index else None) or tile_hashes(existing.layermap, tile_size)
+    existing.close()
+
+    # Invalidate the index first so an interrupted patch is never trusted
+    _tile_index_path(ter_file).unlink(missing_ok=True)
+
+    data = np.memmap(ter_file, dtype=np.uint8, mode='r+')
+    try:
+        disk_heightmap = data[layout.heightmap_offset:layout.layermap_offset].view('<u2').reshape((size, size))
+        disk_layermap = data[layout.layermap_offset:layout.layermap_offset + layout.map_bytes].reshape((size, size))
+
+        for i, (rows, cols) in enumerate(_tile_slices(size, tile_size)):
+            dirty = False
+            if height_hashes[i] != old_height_hashes[i]:
+                disk_heightmap[rows, cols] = heightmap[rows, cols]
+                summary['bytes_written'] += heightmap[rows, cols].nbytes
+                dirty = True
+            if layer_hashes is not None and layer_hashes[i] != old_layer_hashes[i]:
+                disk_layermap[rows, cols] = layermap[rows, cols]
+                summary['bytes_written'] += layermap[rows, cols].size
+                dirty = True
+            summary['dirty_tiles'] += dirty
+
+        table_view = data[layout.material_table_offset:]
+        if table_view.tobytes() != table:
+            table_view[:] = np.frombuffer(table, dtype=np.uint8)
+            summary['bytes_written'] += len(table)
+
+        data.flush()
+    finally:
+        del data
+
+    if layer_hashes is None:
+        layer_hashes = old_layer_hashes
+    _save_tile_index(ter_file, size, tile_size, height_hashes, layer_hashes)
+    return summary
@@ -4,12 +4,14 @@ Contains all import/export operations
 """
 
 from .import_level import ImportBeamNGLevel
+from .import_level_modal import ImportBeamNGLevelModal
 from .export_level import ExportBeamNGLevel
 from .import_decal_roads import ImportBeamNGDecalRoads
 
 # List of operator classes - DecalRoad import is now integrated into main level import
 classes = [
     ImportBeamNGLevel,
+    ImportBeamNGLevelModal,
     ExportBeamNGLevel,
     # ImportBeamNGDecalRoads,  # Keep available but not registered - integrated into main import
 ]
@@ -4,10 +4,18 @@ Handles exporting Blender scene data to BeamNG.drive level format
 """
 
 import bpy
-from bpy.props import StringProperty, BoolProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty
 from bpy.types import Operator
 from bpy_extras.io_utils import ExportHelper
 import os
+import json
+import time
+import numpy as np
+from pathlib import Path
+
+# Import the shared .ter writer
+from ..formats.ter import patch_terrain, quantize_heightmap, terrain_config, write_terrain
+from ..utils.terrain_mesh import sample_mesh_heights
 
 class ExportBeamNGLevel(Operator, ExportHelper):
     """Export BeamNG.drive Level Data"""
@@ -50,6 +58,22 @@ class ExportBeamNGLevel(Operator, ExportHelper):
         default=True,
     )
     
+    terrain_source: EnumProperty(
+        name="Terrain Source",
+        description="Where exported terrain heights are taken from",
+        items=[
+            ('IMAGE', "Displacement Image", "Use the packed displacement image (lossless for Float and 16-bit PNG imports)"),
+            ('MESH', "Evaluated Mesh", "Use the evaluated BeamNG_Terrain geometry"),
+        ],
+        default='IMAGE',
+    )
+    
+    incremental_terrain: BoolProperty(
+        name="Incremental Terrain",
+        description="Only rewrite the terrain tiles that changed since the last export",
+        default=True,
+    )
+    
     level_name: StringProperty(
         name="Level Name",
         description="Name for the exported level",
@@ -110,10 +134,138 @@ class ExportBeamNGLevel(Operator, ExportHelper):
         self.report({'INFO'}, f"Created level directory structure at: {level_path}")
     
     def export_terrain_data(self, level_path):
-        """Export terrain data to .ter files"""
-        self.report({'INFO'}, "Exporting terrain data... (placeholder)")
-        # TODO: Implement terrain export in Phase 6
-        pass
+        """Export terrain data to .ter and .terrain.json files"""
+        terrain_obj = self.find_terrain_object()
+        if terrain_obj is None:
+            self.report({'WARNING'}, "No BeamNG terrain object found, skipping terrain export")
+            return
+        
+        start_time = time.perf_counter()
+        
+        height_scale = float(terrain_obj.get("beamng_height_scale", self.get_modifier_input(terrain_obj, "Height", 200.0)))
+        materials = list(terrain_obj.get("beamng_materials", [])) or ["Grass"]
+        
+        heightmap = None
+        if self.terrain_source == 'IMAGE':
+            heights = self.read_image_channel("BeamNG_Terrain_Displacement.exr")
+            if heights is not None and terrain_obj.get("beamng_terrain_image_format") == 'HALF':
+                # Half floats keep 11 significant bits, so heights above 2048 units lose precision
+                self.report({'WARNING'}, "Displacement image is half float: exported heights are rounded, "
+                                         "import with the Float format or export from the mesh for an exact round trip")
+            if heights is not None:
+                heightmap = quantize_heightmap(heights)
+        if heightmap is None:
+            heights = self.read_evaluated_heights(terrain_obj, height_scale)
+            heightmap = quantize_heightmap(heights, height_scale)
+        
+        layermap = self.read_image_channel("BeamNG_Terrain_Layermap")
+        if layermap is not None:
+            if layermap.shape != heightmap.shape:
+                print(f"⚠️  Layermap {layermap.shape} does not match heightmap {heightmap.shape}, writing zeros")
+                layermap = None
+            else:
+                # 8-bit layermap images hold id/255, float ones the raw id
+                if not bpy.data.images["BeamNG_Terrain_Layermap"].is_float:
+                    layermap = layermap * 255.0
+                layermap = np.clip(np.rint(layermap), 0, 255).astype(np.uint8)
+        
+        # Name the files after the imported source terrain when there is one
+        source_ter = terrain_obj.get("beamng_source_ter")
+        terrain_name = Path(source_ter).stem if source_ter else "theTerrain"
+        ter_path = Path(level_path) / f"{terrain_name}.ter"
+        json_path = Path(level_path) / f"{terrain_name}.terrain.json"
+        
+        if self.incremental_terrain:
+            summary = patch_terrain(ter_path, heightmap, layermap, materials)
+            written = summary['bytes_written']
+            if not summary['full_rewrite']:
+                print(f"🧩 Patched {summary['dirty_tiles']}/{summary['tiles']} terrain tiles in place")
+        else:
+            written = write_terrain(ter_path, heightmap, layermap, materials)
+        
+        config = terrain_config(
+            heightmap.shape[0], materials,
+            datafile=f"/levels/{self.level_name}/{ter_path.name}"
+        )
+        with open(json_path, 'w') as f:
+            json.dump(config, f, indent=2)
+        
+        elapsed = time.perf_counter() - start_time
+        print(f"✅ Exported terrain: {ter_path.name} ({heightmap.shape[0]}x{heightmap.shape[1]}, "
+              f"{written / (1024 * 1024):.1f} MB in {elapsed:.2f}s)")
+        self.report({'INFO'}, f"Exported terrain to: {ter_path}")
+    
+    def find_terrain_object(self):
+        """Find the imported BeamNG terrain object"""
+        for obj in bpy.data.objects:
+            if obj.get("beamng_type") == "Terrain":
+                return obj
+        return bpy.data.objects.get("BeamNG_Terrain")
+    
+    def get_modifier_input(self, obj, socket_name, default):
+        """Read a BeamNG_Terrain modifier input by its interface name"""
+        modifier = obj.modifiers.get("BeamNG_Terrain")
+        if modifier is None or modifier.node_group is None:
+            return default
+        for item in modifier.node_group.interface.items_tree:
+            if getattr(item, 'in_out', None) == 'INPUT' and item.name == socket_name:
+                return modifier.get(item.identifier, getattr(item, 'default_value', default))
+        return default
+    
+    def read_image_channel(self, image_name):
+        """Read the first channel of an image as a (height, width) float32 array"""
+        image = bpy.data.images.get(image_name)
+        if image is None or (not image.has_data and not image.packed_file):
+            return None
+        
+        width, height = image.size
+        channels = image.channels
+        pixels = np.empty(width * height * channels, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        
+        # Image rows were written from heightmap row 0 upwards, so no flip is needed
+        return pixels[::channels].reshape((height, width))
+    
+    def read_evaluated_heights(self, terrain_obj, height_scale):
+        """Sample the evaluated terrain mesh at every heightmap pixel, in metres above the terrain position
+        
+        Pixels sit where the terrain node group samples them, so full grids,
+        LOD tiles, adaptive meshes and holed terrain all export at the right
+        place. Pixels no face lies over (all-hole areas) keep the displacement
+        image height; without one the export is refused rather than writing zeros.
+        """
+        size = int(terrain_obj.get("beamng_terrain_size", self.get_modifier_input(terrain_obj, "Size", 1024)))
+        # The node group samples pixel (x, y) at position + (x, y) * size / N, whatever its Resolution
+        resolution = int(terrain_obj.get("beamng_heightmap_size", size))
+        position = tuple(terrain_obj.get("beamng_terrain_position", self.get_modifier_input(terrain_obj, "Position", (0.0, 0.0, 0.0))))
+        
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        evaluated = terrain_obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get('co', coords)
+            mesh.calc_loop_triangles()
+            triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+            mesh.loop_triangles.foreach_get('vertices', triangles)
+        finally:
+            evaluated.to_mesh_clear()
+        
+        heights, covered = sample_mesh_heights(coords.reshape((-1, 3)), triangles.reshape((-1, 3)), resolution,
+                                               size / resolution, position[:2])
+        heights -= float(position[2])
+        
+        missing = ~covered
+        missing_count = int(np.count_nonzero(missing))
+        if missing_count:
+            fallback = self.read_image_channel("BeamNG_Terrain_Displacement.exr")
+            if fallback is None or fallback.shape != heights.shape:
+                raise ValueError(f"Evaluated terrain mesh leaves {missing_count:,} of {heights.size:,} heightmap pixels "
+                                 f"uncovered; export from the displacement image instead")
+            heights[missing] = fallback[missing] * height_scale
+            print(f"⚠️  {missing_count:,} heightmap pixels have no terrain face, kept their displacement image height")
+        
+        return heights
     
     def export_prefab_objects(self, level_path):
         """Export objects to .prefab files"""
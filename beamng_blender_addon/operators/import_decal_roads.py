@@ -21,6 +21,10 @@ if str(addon_dir) not in sys.path:
 from ..parsers.decal_road_parser import DecalRoadParser, DecalRoadData, MaterialData
 from ..utils.decal_road_material import create_beamng_decal_road_material
 from ..utils.decal_road import decal_road_node_group
+from ..utils.road_curves import ROAD_MODE_ITEMS, create_road_curve_object, create_road_networks, road_point_buffers
+from ..utils.names import DatablockNames
+from ..utils.road_registry import road_registry
+from ..utils.preferences import get_level_index
 
 
 class ImportBeamNGDecalRoads(Operator, ImportHelper):
@@ -70,6 +74,13 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
         default=True,
     )
     
+    road_mode: EnumProperty(
+        name="Road Mode",
+        description="How DecalRoads are represented in the scene",
+        items=ROAD_MODE_ITEMS,
+        default='OBJECTS',
+    )
+    
     def execute(self, context):
         """Execute the import operation"""
         try:
@@ -80,7 +91,7 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
                 return {'CANCELLED'}
             
             # Parse DecalRoad data
-            parser = DecalRoadParser(str(level_path))
+            parser = DecalRoadParser(str(level_path), get_level_index(level_path))
             parser.parse_level()
             
             if not parser.roads:
@@ -142,13 +153,14 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
         roads_to_remove = []
         
         for obj in bpy.data.objects:
-            if (obj.type == 'CURVE' and 
-                obj.get('beamng_type') == 'DecalRoad'):
+            if ((obj.type == 'CURVE' and obj.get('beamng_type') == 'DecalRoad') or
+                (obj.type == 'CURVES' and obj.get('beamng_type') == 'DecalRoadNetwork')):
                 roads_to_remove.append(obj)
         
         # Remove objects
-        for obj in roads_to_remove:
-            bpy.data.objects.remove(obj, do_unlink=True)
+        if roads_to_remove:
+            bpy.data.batch_remove(roads_to_remove)
+        road_registry.mark_stale()
         
         print(f"🗑️  Removed {len(roads_to_remove)} existing DecalRoad objects")
     
@@ -156,6 +168,9 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
         """Import all DecalRoad objects"""
         imported_count = 0
         
+        # Unique datablock names for this import, without probing bpy.data per name
+        self.names = DatablockNames()
+        
         # Create or get Roads collection
         roads_collection = self.get_or_create_collection("DecalRoads")
         
@@ -167,12 +182,26 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
         if self.create_geometry_nodes:
             self.ensure_decal_road_node_group()
         
+        if self.road_mode != 'OBJECTS':
+            # All roads in one or a few network objects, evaluated once each
+            for network_obj in create_road_networks(parser.roads, self.road_mode == 'NETWORK_PER_MATERIAL',
+                                                    self.road_width_scale, names=self.names):
+                roads_collection.objects.link(network_obj)
+                road_registry.add(network_obj)
+            return len(parser.roads)
+        
+        # Convert every road's nodes to spline point data at once
+        co, radius, offsets = road_point_buffers([road_data.nodes for road_data in parser.roads],
+                                                 self.road_width_scale)
+        
         # Import each road
-        for road_data in parser.roads:
+        for index, road_data in enumerate(parser.roads):
             try:
-                road_obj = self.create_road_object(road_data, parser, level_path)
+                start, stop = offsets[index], offsets[index + 1]
+                road_obj = self.create_road_object(road_data, parser, level_path, (co[start:stop], radius[start:stop]))
                 if road_obj:
                     roads_collection.objects.link(road_obj)
+                    road_registry.add(road_obj)
                     imported_count += 1
                     
             except Exception as e:
@@ -186,7 +215,7 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
         if name in bpy.data.collections:
             return bpy.data.collections[name]
         
-        collection = bpy.data.collections.new(name)
+        collection = self.names.new('collections', name)
         bpy.context.scene.collection.children.link(collection)
         return collection
     
@@ -203,7 +232,8 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
             mat = create_beamng_decal_road_material(
                 material_name, 
                 material_data.__dict__ if material_data else None,
-                level_path
+                level_path,
+                names=self.names
             )
             
             print(f"  ✅ Created material: {material_name}")
@@ -214,43 +244,23 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
             decal_road_node_group()
             print("✅ Created BeamNG_DecalRoad geometry node group")
     
-    def create_road_object(self, road_data: DecalRoadData, parser: DecalRoadParser, level_path: Path) -> Optional[bpy.types.Object]:
-        """Create a Blender curve object from DecalRoad data"""
+    def create_road_object(self, road_data: DecalRoadData, parser: DecalRoadParser, level_path: Path,
+                           points=None) -> Optional[bpy.types.Object]:
+        """Create a Blender curve object from DecalRoad data
         
-        # Create curve
-        curve_name = f"DecalRoad_{road_data.persistent_id[:8]}"
-        curve_data = bpy.data.curves.new(curve_name, type='CURVE')
-        curve_data.dimensions = '3D'
-        curve_data.resolution_u = 12 if not self.resample_resolution else 24
+        points is the road's (co, radius) slice of road_point_buffers().
+        """
         
-        # Create spline
-        spline = curve_data.splines.new('POLY')
-        spline.points.add(len(road_data.nodes) - 1)
-        
-        # Set control points
-        for i, node in enumerate(road_data.nodes):
-            x, y, z, width = node
-            spline.points[i].co = (x, y, z, 1.0)
-            
-            # Apply width scaling if enabled
-            if self.road_width_scale:
-                spline.points[i].radius = width
-            else:
-                spline.points[i].radius = 1.0
-        
-        # Create object
-        curve_obj = bpy.data.objects.new(curve_name, curve_data)
-        
-        # Set custom properties
-        curve_obj["beamng_type"] = "DecalRoad"
-        curve_obj["beamng_material"] = road_data.material
-        curve_obj["beamng_persistent_id"] = road_data.persistent_id
-        curve_obj["beamng_texture_length"] = road_data.texture_length
-        curve_obj["beamng_break_angle"] = road_data.break_angle
-        curve_obj["beamng_improved_spline"] = road_data.improved_spline
-        curve_obj["beamng_render_priority"] = road_data.render_priority
-        curve_obj["beamng_start_end_fade"] = road_data.start_end_fade
-        curve_obj["beamng_distance_fade"] = road_data.distance_fade
+        # Create curve; spline points and custom properties are set in bulk
+        curve_name = f"DecalRoad_{road_data.persistent_id[:8]}"
+        co, radius = points if points is not None else (None, None)
+        curve_obj = create_road_curve_object(
+            curve_name, road_data, co, radius,
+            resolution_u=12 if not self.resample_resolution else 24,
+            scale_width=self.road_width_scale,
+            names=self.names,
+        )
+        curve_data = curve_obj.data
         
         # Apply material if available and requested
         if self.import_materials and road_data.material in bpy.data.materials:
@@ -280,6 +290,7 @@ class ImportBeamNGDecalRoads(Operator, ImportHelper):
         layout.prop(self, "import_materials")
         layout.prop(self, "create_geometry_nodes")
         layout.prop(self, "clear_existing")
+        layout.prop(self, "road_mode")
         
         layout.separator()
         layout.label(text="Advanced Options:")
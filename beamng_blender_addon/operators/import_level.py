@@ -4,13 +4,14 @@ Handles importing BeamNG.drive level data into Blender
 """
 
 import bpy
-from bpy.props import StringProperty, BoolProperty, CollectionProperty
+from bpy.props import StringProperty, BoolProperty, CollectionProperty, EnumProperty, IntProperty, FloatProperty
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
 import os
 import sys
-import struct
 import json
+import tempfile
+import zipfile
 import numpy as np
 import bmesh
 from pathlib import Path
@@ -20,227 +21,135 @@ addon_dir = Path(__file__).parent.parent
 if str(addon_dir) not in sys.path:
     sys.path.append(str(addon_dir))
 
+# Import the shared .ter reader and compact image encoder
+from ..formats.ter import HOLE_VALUE
+from ..formats.png import write_grayscale_png
+from ..formats.exr import write_exr
 # Import BeamNG terrain node group
-from ..utils.terrain_node_group import terrain_node_group
+from ..utils.terrain_node_group import terrain_node_group, terrain_tiles_node_group
+from ..utils.terrain_mesh import create_adaptive_terrain_mesh
+from ..utils.terrain_lod import TILES_COLLECTION, MIN_TILE_RESOLUTION, set_modifier_input, update_terrain_lod
 # Import terrain material function
 from ..utils.terrain_material import terrain_material_node_group
+from ..utils.preferences import get_import_cache, get_level_index
+from ..utils.import_pipeline import ImportPipeline, run_steps, single_step
+from ..utils.names import DatablockNames
+from ..utils.import_cache import CACHED_TEXTURE_ROLES, TERRAIN_IMAGE_NAMES, cached_source_terrain_stats, terrain_entry_metadata, terrain_key_files
 # Import DecalRoad utilities
 from ..parsers.decal_road_parser import DecalRoadParser, DecalRoadData, MaterialData
-from ..utils.decal_road_material import create_beamng_decal_road_material
+from ..parsers.level_index import LevelIndex
+from ..parsers.terrain_preset import DEFAULT_HEIGHT_SCALE, TerrainPreset
+from ..utils.decal_road_material import create_beamng_decal_road_material, resolve_material_textures
 from ..utils.decal_road import decal_road_node_group
+from ..utils.road_curves import ROAD_HASH_PROPERTY, ROAD_MODE_ITEMS, create_road_curve_object, create_road_networks, road_point_buffers, update_road_curve_object
+from ..utils.road_registry import road_registry
+
+DISPLACEMENT_IMAGE = TERRAIN_IMAGE_NAMES['displacement']
+LAYERMAP_IMAGE = TERRAIN_IMAGE_NAMES['layermap']
+HOLES_IMAGE = TERRAIN_IMAGE_NAMES['holes']
+
+def write_half_displacement_exr(path, heightmap):
+    """Single-channel half EXR of the heightmap normalised to 0-1"""
+    write_exr(path, heightmap, 'HALF', 'ZIP', scale=1.0 / 65535.0)
+
+# Compact terrain image format -> (file suffix, writer) of its single-channel displacement file
+IMAGE_ENCODERS = {
+    'HALF': ('.exr', write_half_displacement_exr),
+    'PNG16': ('.png', write_grayscale_png),
+}
 
 class BeamNGTerrainParser:
-    """Integrated BeamNG terrain parser for the addon - SOURCE OF TRUTH from ter_parser.py"""
+    """BeamNG terrain parser for the addon - decoding lives in formats.ter, this adds level presets"""
     
-    def __init__(self, ter_file: str, json_file: str):
+    def __init__(self, ter_file: str, json_file: str, index: LevelIndex = None):
+        # Paths are level paths; inside a level zip they point into the archive
         self.ter_file = Path(ter_file)
-        self.json_file = Path(json_file)
+        self.json_file = Path(json_file) if json_file else None
         self.level_directory = self.ter_file.parent
-        
-        # Load JSON configuration
-        with open(self.json_file, 'r') as f:
-            self.config = json.load(f)
+        self.index = index if index is not None else LevelIndex.load(self.level_directory)
+        self.terrain = self.index.source.terrain_file(self.ter_file, self.json_file)
         
         # Extract parameters
-        self.version = self.config['version']
-        self.size = self.config['size']
-        self.heightmap_size = self.config['heightMapSize']
-        self.heightmap_item_size = self.config['heightMapItemSize']
-        self.layermap_size = self.config['layerMapSize']
-        self.layermap_item_size = self.config['layerMapItemSize']
-        self.materials = self.config['materials']
-        
-        # 🆕 Detect height scale from terrain preset files
+        self.config = self.terrain.config
+        self.version = self.terrain.version
+        self.size = self.terrain.size
+        self.materials = self.terrain.materials
+        
+        # 🆕 Detect height scale and position from the terrain preset
+        self.preset = self.load_preset()
         self.height_scale = self.detect_height_scale()
         self.terrain_position = self.detect_terrain_position()
         
-        print("🏞️  BeamNG Terrain Parser")
-        print(f"📁 Terrain: {self.ter_file.name}")
-        print(f"📊 Dimensions: {self.size}x{self.size}")
-        print(f"🎭 Materials: {len(self.materials)}")
-        print(f"⛰️  Height Scale: {self.height_scale}")
-        if self.terrain_position:
-            print(f"📍 Position: {self.terrain_position}")
-        print("✅ Using offset 5 (after header), all data: little-endian")
+        print(f"🏞️  BeamNG Terrain: {self.ter_file.name} ({self.size}x{self.size}, "
+              f"{len(self.materials)} materials, height scale {self.height_scale})")
+    
+    def load_preset(self):
+        """Load the level's terrain preset (*terrainPreset.json) once, shared by every detection"""
+        preset_file = self.index.first('presets', top_level=True)
+        if not preset_file:
+            print("⚠️  No terrain preset files found")
+            return None
+        
+        try:
+            preset = TerrainPreset.load(preset_file, self.index.source)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error reading terrain preset {preset_file.name}: {e}")
+            return None
+        
+        print(f"📄 Found terrain preset: {preset_file.name}")
+        return preset
     
     def detect_height_scale(self):
         """Detect height scale from terrain preset files - Task 0.2.2"""
-        try:
-            # Look for terrain preset files in level directory
-            # Pattern: *terrainPreset.json or *TerrainPreset.json
-            preset_files = []
-            for pattern in ['*terrainPreset.json', '*TerrainPreset.json', '*terrainpreset.json']:
-                preset_files.extend(self.level_directory.glob(pattern))
-            
-            if not preset_files:
-                print("⚠️  No terrain preset files found, using default height scale: 200")
-                return 200.0  # Default fallback
-            
-            # Use the first preset file found
-            preset_file = preset_files[0]
-            print(f"📄 Found terrain preset: {preset_file.name}")
-            
-            with open(preset_file, 'r') as f:
-                preset_data = json.load(f)
-            
-            height_scale = preset_data.get('heightScale', 200.0)
-            print(f"✅ Detected height scale: {height_scale}")
-            return float(height_scale)
-            
-        except Exception as e:
-            print(f"❌ Error detecting height scale: {e}")
-            print("⚠️  Using default height scale: 200")
-            return 200.0
+        if self.preset is None:
+            print(f"⚠️  Using default height scale: {DEFAULT_HEIGHT_SCALE:g}")
+            return DEFAULT_HEIGHT_SCALE
+        
+        print(f"✅ Detected height scale: {self.preset.height_scale}")
+        return self.preset.height_scale
     
     def detect_terrain_position(self):
         """Detect terrain position from terrain preset files"""
-        try:
-            # Look for terrain preset files
-            preset_files = []
-            for pattern in ['*terrainPreset.json', '*TerrainPreset.json', '*terrainpreset.json']:
-                preset_files.extend(self.level_directory.glob(pattern))
-            
-            if not preset_files:
-                return None
-            
-            preset_file = preset_files[0]
-            with open(preset_file, 'r') as f:
-                preset_data = json.load(f)
-            
-            pos_data = preset_data.get('pos', {})
-            if pos_data:
-                position = {
-                    'x': pos_data.get('x', 0),
-                    'y': pos_data.get('y', 0), 
-                    'z': pos_data.get('z', 0)
-                }
-                print(f"✅ Detected terrain position: {position}")
-                return position
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error detecting terrain position: {e}")
+        if self.preset is None or self.preset.position is None:
             return None
+        
+        print(f"✅ Detected terrain position: {self.preset.position}")
+        return dict(self.preset.position)
     
     def parse_terrain(self):
-        """Parse the terrain file using CORRECTED offset and encoding"""
+        """Decode every terrain section in one sequential pass over the .ter"""
+        self.terrain.load()
+        
+        # Cross-check the embedded material table against .terrain.json
+        for problem in self.terrain.validate_materials():
+            print(f"⚠️  {problem}")
         
-        with open(self.ter_file, 'rb') as f:
-            # Read header (little-endian)
-            version = struct.unpack('B', f.read(1))[0]
-            size = struct.unpack('<I', f.read(4))[0]
-            
-            # Verify header
-            if version != self.version or size != self.size:
-                raise ValueError(f"Header mismatch: got version={version}, size={size}")
-            
-            # FIXED: Data starts at offset 5 (immediately after header)
-            data_start = 5
-            print(f"📍 Using CORRECTED data offset: {data_start} (0x{data_start:x})")
-            
-            # Read heightmap with LITTLE-ENDIAN encoding
-            f.seek(data_start)
-            heightmap_bytes = self.heightmap_size * self.heightmap_item_size
-            heightmap_data = f.read(heightmap_bytes)
-            
-            if len(heightmap_data) != heightmap_bytes:
-                print(f"⚠️  Warning: Expected {heightmap_bytes} bytes, got {len(heightmap_data)}")
-            
-            # Parse as 16-bit LITTLE-ENDIAN (CORRECTED)
-            num_heights = len(heightmap_data) // 2
-            heights = struct.unpack(f'<{num_heights}H', heightmap_data)  # <H = little-endian
-            
-            # Reshape to 2D
-            heightmap = np.array(heights, dtype=np.uint16).reshape((self.size, self.size))
-            
-            # Calculate layer map position
-            layermap_start = data_start + heightmap_bytes
-            layermap = None
-            
-            try:
-                f.seek(layermap_start)
-                
-                # Calculate how much layermap data is actually available
-                remaining_file_bytes = len(f.read())  # Read to end to get remaining size
-                f.seek(layermap_start)  # Seek back
-                
-                expected_layermap_bytes = self.layermap_size * self.layermap_item_size
-                available_layermap_bytes = min(expected_layermap_bytes, remaining_file_bytes)
-                
-                print("📊 Layermap info:")
-                print(f"   Expected: {expected_layermap_bytes:,} bytes")
-                print(f"   Available: {available_layermap_bytes:,} bytes")
-                
-                if available_layermap_bytes > 0:
-                    layermap_data = f.read(available_layermap_bytes)
-                    layers = struct.unpack(f'{len(layermap_data)}B', layermap_data)
-                    
-                    # Calculate how many complete rows we have
-                    pixels_available = len(layers)
-                    complete_rows = pixels_available // self.size
-                    remaining_pixels = pixels_available % self.size
-                    
-                    print(f"   Pixels available: {pixels_available:,}")
-                    print(f"   Complete rows: {complete_rows}")
-                    print(f"   Remaining pixels: {remaining_pixels}")
-                    
-                    if complete_rows > 0:
-                        # Create layermap with available data, pad with zeros if needed
-                        if pixels_available == self.layermap_size:
-                            # Perfect match
-                            layermap = np.array(layers, dtype=np.uint8).reshape((self.size, self.size))
-                            print(f"✅ Complete layer map loaded: {layermap.shape}")
-                        else:
-                            # Partial data - pad with zeros or truncate
-                            if pixels_available < self.layermap_size:
-                                # Pad with zeros
-                                padded_layers = list(layers) + [0] * (self.layermap_size - pixels_available)
-                                layermap = np.array(padded_layers, dtype=np.uint8).reshape((self.size, self.size))
-                                print(f"⚠️  Partial layer map loaded and padded: {layermap.shape}")
-                            else:
-                                # Truncate to expected size
-                                truncated_layers = layers[:self.layermap_size]
-                                layermap = np.array(truncated_layers, dtype=np.uint8).reshape((self.size, self.size))
-                                print(f"⚠️  Layer map loaded and truncated: {layermap.shape}")
-                    else:
-                        print("❌ Not enough data for even one complete row")
-                        layermap = None
-                else:
-                    print("❌ No layermap data available")
-                    layermap = None
-                    
-            except Exception as e:
-                print(f"❌ Could not read layer map: {e}")
-                layermap = None
-            
-            return {
-                'header': {
-                    'version': version,
-                    'size': size,
-                    'data_start': data_start,
-                    'encoding': 'all_little_endian'  # CORRECTED encoding description
-                },
-                'heightmap': heightmap,
-                'layermap': layermap,
-                'materials': self.materials,
-                'config': self.config,
-                'height_scale': self.height_scale,  # 🆕 Auto-detected height scale
-                'terrain_position': self.terrain_position  # 🆕 Auto-detected position
-            }
-    
-    def get_terrain_stats(self, heightmap: np.ndarray):
-        """Calculate terrain statistics"""
         return {
-            'shape': heightmap.shape,
-            'min_height': int(np.min(heightmap)),
-            'max_height': int(np.max(heightmap)),
-            'mean_height': float(np.mean(heightmap)),
-            'std_height': float(np.std(heightmap)),
-            'median_height': float(np.median(heightmap)),
-            'unique_values': len(np.unique(heightmap)),
-            'zero_count': int(np.sum(heightmap == 0)),
-            'zero_percentage': float(np.sum(heightmap == 0) / heightmap.size * 100)
+            'header': {
+                'version': self.version,
+                'size': self.size,
+                'data_start': self.terrain.layout.heightmap_offset,
+                'encoding': 'all_little_endian'
+            },
+            'terrain': self.terrain,
+            'ter_file': self.ter_file,
+            'json_file': self.json_file,
+            'heightmap': self.terrain.heightmap,
+            'layermap': self.terrain.layermap,
+            'hole_mask': self.terrain.hole_mask,
+            'layer_texture_map': self.terrain.layer_texture_map,
+            'coverage_maps': self.terrain.coverage_maps,
+            'material_names': self.terrain.material_names,
+            'materials': self.materials,
+            'config': self.config,
+            'preset': self.preset,
+            'height_scale': self.height_scale,  # 🆕 Auto-detected height scale
+            'terrain_position': self.terrain_position  # 🆕 Auto-detected position
         }
+    
+    def get_terrain_stats(self, heightmap: np.ndarray, cache=None):
+        """Height statistics from one chunked histogram pass, kept in the import cache"""
+        return cached_source_terrain_stats(cache, self.index.source, self.ter_file, heightmap)
 
 class ImportBeamNGLevel(Operator, ImportHelper):
     """Import BeamNG.drive Level Data"""
@@ -253,7 +162,7 @@ class ImportBeamNGLevel(Operator, ImportHelper):
     # File browser properties
     filename_ext = ""
     filter_glob: StringProperty(
-        default="*.ter;*.prefab;*.json",
+        default="*.ter;*.prefab;*.json;*.zip",
         options={'HIDDEN'},
         maxlen=255,
     )
@@ -265,6 +174,46 @@ class ImportBeamNGLevel(Operator, ImportHelper):
         default=True,
     )
     
+    terrain_image_format: EnumProperty(
+        name="Terrain Image Format",
+        description="How the terrain images are encoded; compact formats shrink the packed images and load an 8-bit layermap, "
+                    "but Blender still holds the heightmap as a 32-bit float buffer in memory and on the GPU",
+        items=[
+            ('FLOAT', "Float RGBA", "32-bit float RGBA EXR heightmap and layermap"),
+            ('HALF', "Half Float", "Single-channel half-float EXR heightmap, 8-bit layermap"),
+            ('PNG16', "16-bit PNG", "Lossless single-channel 16-bit PNG heightmap as used by BeamNG, 8-bit layermap"),
+        ],
+        default='FLOAT',
+    )
+    
+    terrain_mode: EnumProperty(
+        name="Terrain Mode",
+        description="How the terrain geometry is built",
+        items=[
+            ('SINGLE', "Single Grid", "One full resolution grid for the whole terrain"),
+            ('TILED', "Tiled LOD", "Split the terrain into tiles whose resolution follows the viewer"),
+            ('ADAPTIVE', "Adaptive Mesh", "Static mesh with fewer triangles on flat ground, refined until the per-vertex height error is under Max Error"),
+        ],
+        default='SINGLE',
+    )
+    
+    terrain_max_error: FloatProperty(
+        name="Max Error",
+        description="Per-vertex RTIN height error threshold of the adaptive terrain mesh; the surface between vertices can deviate somewhat more",
+        default=0.1,
+        min=0.0,
+        soft_max=5.0,
+        unit='LENGTH',
+    )
+    
+    terrain_tile_count: IntProperty(
+        name="Tiles Per Side",
+        description="Number of terrain tiles along each side in Tiled LOD mode",
+        default=8,
+        min=2,
+        max=64,
+    )
+    
     import_objects: BoolProperty(
         name="Import Objects",
         description="Import prefab objects and static meshes",
@@ -289,42 +238,41 @@ class ImportBeamNGLevel(Operator, ImportHelper):
         default=True,
     )
     
+    road_mode: EnumProperty(
+        name="Road Mode",
+        description="How DecalRoads are represented in the scene",
+        items=ROAD_MODE_ITEMS,
+        default='OBJECTS',
+    )
+    
+    sync_roads: BoolProperty(
+        name="Sync Existing Roads",
+        description="Update road objects whose nodes or properties changed in the level, instead of skipping every existing road. Separate Objects mode only: roads inside road network objects are never synced",
+        default=False,
+    )
+    
+    remove_missing_roads: BoolProperty(
+        name="Remove Deleted Roads",
+        description="When syncing, remove separate road objects of this level whose road no longer exists. Road network objects are left alone",
+        default=False,
+    )
+    
     def execute(self, context):
         """Execute the import operation"""
         try:
-            # Get the selected file/directory path
-            filepath = self.filepath
-            directory = os.path.dirname(filepath)
-            
-            # Check if this is a BeamNG level directory
-            if not self.is_beamng_level(directory):
-                self.report({'ERROR'}, "Selected path is not a valid BeamNG level directory")
+            directory = self.open_selected_level()
+            if directory is None:
                 return {'CANCELLED'}
             
-            # Start import process
-            self.report({'INFO'}, f"Starting BeamNG level import from: {directory}")
-            
-            # Import terrain if enabled
-            if self.import_terrain:
-                result = self.import_terrain_data(directory)
-                if result == {'CANCELLED'}:
-                    return {'CANCELLED'}
-            
-            # Import objects if enabled
-            if self.import_objects:
-                self.import_prefab_objects(directory)
-            
-            # Import materials if enabled
-            if self.import_materials:
-                self.import_material_data(directory)
-            
-            # Import lighting if enabled
-            if self.import_lighting:
-                self.import_lighting_data(directory)
-            
-            # Import DecalRoads if enabled
-            if self.import_decal_roads:
-                self.import_decal_roads_data(directory)
+            # Terrain decoding and road/material parsing run concurrently;
+            # each stage's datablocks are created here, in the usual order
+            with ImportPipeline() as pipeline:
+                for name, prepare, steps, discard in self.import_stages(directory, pipeline):
+                    pipeline.add(name, prepare, lambda prepared, steps=steps: run_steps(steps(prepared)), discard)
+                
+                for stage, result in pipeline.run():
+                    if stage == "terrain" and result == {'CANCELLED'}:
+                        return {'CANCELLED'}
             
             self.report({'INFO'}, "BeamNG level import completed successfully")
             return {'FINISHED'}
@@ -333,63 +281,136 @@ class ImportBeamNGLevel(Operator, ImportHelper):
             self.report({'ERROR'}, f"Import failed: {str(e)}")
             return {'CANCELLED'}
     
+    def open_selected_level(self):
+        """Index the selected level directory or zip; returns its root, or None after reporting an error"""
+        # Get the selected file/directory path; a level zip is imported without extracting it
+        filepath = self.filepath
+        level_path = filepath if os.path.isfile(filepath) and zipfile.is_zipfile(filepath) else os.path.dirname(filepath)
+        
+        # One walk of the level serves every import stage
+        self.level_index = get_level_index(level_path)
+        directory = str(self.level_index.root)
+        
+        # Check if this is a BeamNG level directory
+        if not self.is_beamng_level(directory):
+            self.report({'ERROR'}, "Selected path is not a valid BeamNG level directory")
+            return None
+        
+        # Start import process
+        self.report({'INFO'}, f"Starting BeamNG level import from: {directory}")
+        return directory
+    
+    def import_stages(self, directory, pipeline):
+        """The enabled import stages as (name, prepare, steps, discard)
+        
+        prepare runs on a pipeline worker (None if the stage is bpy-only),
+        steps(prepared) is a generator creating the datablocks on the main
+        thread, and discard(result) cleans up a prepared result that is never used.
+        """
+        # Settings are read here, never from pipeline workers
+        cache = get_import_cache()
+        self._names = DatablockNames()
+        image_format = self.terrain_image_format
+        
+        stages = []
+        if self.import_terrain:
+            stages.append(("terrain", lambda: self.prepare_terrain(cache, image_format),
+                           lambda prepared: self.terrain_import_steps(directory, prepared),
+                           self.discard_prepared_terrain))
+        if self.import_objects:
+            stages.append(("objects", None, lambda prepared: single_step(self.import_prefab_objects, directory), None))
+        if self.import_materials:
+            stages.append(("materials", None, lambda prepared: single_step(self.import_material_data, directory), None))
+        if self.import_lighting:
+            stages.append(("lighting", None, lambda prepared: single_step(self.import_lighting_data, directory), None))
+        if self.import_decal_roads:
+            # Materials are a separate top-level pipeline task, submitted before every stage, so the
+            # road stage worker that waits for them never waits on a task still queued behind it
+            road_parser = DecalRoadParser(directory, self.level_index)
+            materials_future = pipeline.executor.submit(road_parser.parse_materials)
+            stages.append(("decal_roads", lambda: self.prepare_decal_roads(directory, materials_future, road_parser),
+                           lambda prepared: self.decal_road_import_steps(directory, prepared), None))
+        return stages
+    
+    def datablock_names(self):
+        """The unique-name allocator shared by this import's stages"""
+        if getattr(self, '_names', None) is None:
+            self._names = DatablockNames()
+        return self._names
+    
     def is_beamng_level(self, directory):
-        """Check if directory contains BeamNG level data"""
-        # Look for key BeamNG level files
-        required_files = ['info.json', 'mainLevel.lua']
-        for filename in required_files:
-            if os.path.exists(os.path.join(directory, filename)):
-                return True
-        
-        # Check for .ter files (terrain data)
-        for file in os.listdir(directory):
-            if file.endswith('.ter'):
-                return True
-        
-        return False
-    
-    def import_terrain_data(self, directory):
-        """Import terrain data using EXR displacement mapping"""
+        """Check if directory contains BeamNG level data (info.json, mainLevel.lua or a .ter)"""
+        return self.level_index.is_level()
+    
+    def prepare_terrain(self, cache, image_format):
+        """Find, hash and decode the terrain without touching bpy - runs on an import pipeline worker
+        
+        Returns None if the level has no .ter/.terrain.json pair.
+        """
+        # Find .ter, .terrain.json and terrain preset files in the level root
+        key_files = terrain_key_files(self.level_index)
+        if not key_files:
+            return None
+        ter_file, json_file = key_files[:2]
+        
+        # Reuse a cached import of the same .ter/.terrain.json/preset when available
+        source = self.level_index.source
+        cache_key = cache.key_for(*key_files, variant=image_format, source=source) if cache else None
+        cache_entry = cache.get(cache_key) if cache else None
+        
+        prepared = {'ter_file': ter_file, 'cache': cache, 'cache_key': cache_key, 'cache_entry': cache_entry}
+        if not cache_entry:
+            prepared['terrain_data'] = self.decode_terrain(ter_file, json_file, image_format, cache)
+        return prepared
+    
+    def discard_prepared_terrain(self, terrain):
+        """Remove the temporary PNGs of a prepared terrain that will not be imported"""
+        if terrain and 'terrain_data' in terrain:
+            self.remove_encoded_images(terrain['terrain_data'].get('encoded_images', {}))
+    
+    def import_terrain_data(self, directory, prepared=None):
+        """Import terrain data using EXR displacement mapping
+        
+        prepared returns the result of prepare_terrain() computed on a worker;
+        without it the terrain is prepared here.
+        """
+        return run_steps(self.terrain_import_steps(directory, prepared))
+    
+    def terrain_import_steps(self, directory, prepared=None):
+        """import_terrain_data as a generator yielding the stage's progress (0-1) between steps"""
         try:
-            # Find .ter and .terrain.json files
-            ter_file = None
-            json_file = None
-            
-            for file in os.listdir(directory):
-                if file.endswith('.ter'):
-                    ter_file = os.path.join(directory, file)
-                elif file.endswith('.terrain.json'):
-                    json_file = os.path.join(directory, file)
+            if prepared is None:
+                terrain = self.prepare_terrain(get_import_cache(), self.terrain_image_format)
+            else:
+                terrain = prepared()
             
-            if not ter_file or not json_file:
+            if terrain is None:
                 self.report({'ERROR'}, "Could not find required .ter and .terrain.json files")
                 return {'CANCELLED'}
             
-            self.report({'INFO'}, f"Parsing terrain files: {os.path.basename(ter_file)}")
+            cache = terrain['cache']
+            ter_file = terrain['ter_file']
+            if terrain['cache_entry']:
+                self.report({'INFO'}, f"Loading cached terrain: {os.path.basename(ter_file)}")
+                terrain_data, textures = self.load_cached_terrain(cache, terrain['cache_entry'])
+            else:
+                self.report({'INFO'}, f"Parsed terrain files: {os.path.basename(ter_file)}")
+                terrain_data = terrain['terrain_data']
+                textures = self.create_terrain_textures(terrain_data)
+                if cache:
+                    self.store_cached_terrain(cache, terrain['cache_key'], terrain_data, textures)
+            yield 0.5
             
-            # Parse terrain data
-            parser = BeamNGTerrainParser(ter_file, json_file)
-            terrain_data = parser.parse_terrain()
             # Add level directory to terrain data for texture loading
             terrain_data['level_directory'] = directory
-            heightmap = terrain_data['heightmap']
-            layermap = terrain_data['layermap']
-            
-            # Create EXR displacement texture
-            self.report({'INFO'}, "Creating 16-bit EXR displacement texture...")
-            displacement_texture = self.create_displacement_texture(heightmap)
-            
-            # Create layermap texture if available
-            layermap_texture = None
-            if layermap is not None:
-                self.report({'INFO'}, "Creating layermap texture...")
-                layermap_texture = self.create_layermap_texture(layermap, terrain_data['materials'])
+            displacement_texture, layermap_texture, hole_texture = textures
             
             # Create terrain mesh with BeamNG node group
             self.report({'INFO'}, "Creating terrain mesh with BeamNG node group...")
             terrain_obj = self.create_terrain_with_node_group(
-                displacement_texture, layermap_texture, terrain_data
+                displacement_texture, layermap_texture, terrain_data, hole_texture
             )
+            yield 0.9
             
             # Adjust camera clip planes for large terrain
             self.adjust_camera_clip_planes()
@@ -407,27 +428,217 @@ class ImportBeamNGLevel(Operator, ImportHelper):
             self.report({'ERROR'}, f"Terrain import failed: {str(e)}")
             return {'CANCELLED'}
     
-    def create_displacement_texture(self, heightmap):
-        """Create a 16-bit EXR texture for displacement mapping"""
+    def decode_terrain(self, ter_file, json_file, image_format, cache=None):
+        """Parse the .ter, compute its statistics and pre-encode the texture files - no bpy"""
+        parser = BeamNGTerrainParser(ter_file, json_file, self.level_index)
+        terrain_data = parser.parse_terrain()
         
-        print("🏔️  Converting heightmap to texture...")
-        print(f"   Input shape: {heightmap.shape}")
-        print(f"   Value range: {heightmap.min()} - {heightmap.max()}")
+        terrain_data['stats'] = parser.get_terrain_stats(terrain_data['heightmap'], cache)
+        print(f"📊 Heights {terrain_data['stats']['min_height']}-{terrain_data['stats']['max_height']}, "
+              f"{terrain_data['stats']['zero_percentage']:.1f}% at zero")
         
-        # Normalize heightmap to 0-1 range for displacement (matching npy_to_exr.py)
-        heightmap_normalized = heightmap.astype(np.float32) / 65535.0
+        terrain_data['encoded_images'] = self.encode_terrain_images(terrain_data, image_format)
+        return terrain_data
+    
+    def encode_terrain_images(self, terrain_data, image_format):
+        """Write the image files the chosen image format needs to temporary files
+        
+        Returns {image name: temporary path}; load_packed_image picks them up
+        instead of encoding on the main thread.
+        """
+        arrays = {}
+        if image_format in IMAGE_ENCODERS:
+            arrays[DISPLACEMENT_IMAGE] = (terrain_data['heightmap'], IMAGE_ENCODERS[image_format])
+        if terrain_data['layermap'] is not None and image_format != 'FLOAT':
+            arrays[LAYERMAP_IMAGE] = (np.asarray(terrain_data['layermap'], dtype=np.uint8), IMAGE_ENCODERS['PNG16'])
+        hole_mask = terrain_data['hole_mask']
+        if hole_mask is not None and hole_mask.any():
+            arrays[HOLES_IMAGE] = (np.multiply(hole_mask, 255, dtype=np.uint8), IMAGE_ENCODERS['PNG16'])
+        
+        encoded = {}
+        try:
+            for image_name, (array, (suffix, writer)) in arrays.items():
+                fd, temp_path = tempfile.mkstemp(suffix=suffix)
+                os.close(fd)
+                encoded[image_name] = temp_path
+                writer(temp_path, array)
+        except Exception:
+            self.remove_encoded_images(encoded)
+            raise
+        return encoded
+    
+    def remove_encoded_images(self, encoded):
+        for temp_path in encoded.values():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        encoded.clear()
+    
+    def create_terrain_textures(self, terrain_data):
+        """Convert decoded terrain data into displacement, layermap and hole textures"""
+        self.encoded_images = terrain_data.pop('encoded_images', {})
+        try:
+            return self.build_terrain_textures(terrain_data)
+        finally:
+            self.remove_encoded_images(self.encoded_images)
+    
+    def build_terrain_textures(self, terrain_data):
+        """Create the Blender images for decoded terrain data"""
+        heightmap = terrain_data['heightmap']
+        layermap = terrain_data['layermap']
+        
+        # One RGBA scratch buffer is shared by the float RGBA textures
+        pixel_buffer = None
+        if self.terrain_image_format == 'FLOAT':
+            pixel_buffer = self.allocate_pixel_buffer(heightmap.shape)
+        
+        # Create EXR displacement texture
+        self.report({'INFO'}, "Creating 16-bit EXR displacement texture...")
+        displacement_texture = self.create_displacement_texture(heightmap, pixel_buffer)
+        
+        # Create layermap texture if available
+        layermap_texture = None
+        if layermap is not None:
+            self.report({'INFO'}, "Creating layermap texture...")
+            layermap_texture = self.create_layermap_texture(layermap, terrain_data['materials'], pixel_buffer)
+        
+        # Release the scratch buffer before building geometry
+        del pixel_buffer
+        
+        # Terrain holes (layermap 255) are cut from the mesh
+        hole_texture = None
+        hole_mask = terrain_data['hole_mask']
+        if hole_mask is not None and hole_mask.any():
+            hole_texture = self.create_hole_mask_texture(hole_mask)
+        
+        return displacement_texture, layermap_texture, hole_texture
+    
+    def store_cached_terrain(self, cache, cache_key, terrain_data, textures):
+        """Save the decoded arrays, packed texture files and metadata as an import cache entry"""
+        pending = cache.begin()
+        try:
+            np.save(pending / "heightmap.npy", terrain_data['heightmap'])
+            if terrain_data['layermap'] is not None:
+                np.save(pending / "layermap.npy", terrain_data['layermap'])
+            
+            # Packed images already hold the encoded EXR/PNG bytes
+            images = {}
+            for role, image in zip(CACHED_TEXTURE_ROLES, textures):
+                if image is None or image.packed_file is None:
+                    continue
+                filename = role + self.packed_image_suffix(role)
+                (pending / filename).write_bytes(image.packed_file.data)
+                images[role] = {'file': filename, 'name': image.name}
+            
+            cache.commit(cache_key, pending, terrain_entry_metadata(terrain_data, images))
+            print(f"💾 Cached terrain import: {cache_key}")
+        except Exception as e:
+            cache.abort(pending)
+            print(f"⚠️  Could not cache terrain import: {e}")
+    
+    def packed_image_suffix(self, role):
+        """File suffix of the encoding a terrain texture role is packed with in the current image format"""
+        if role == 'displacement':
+            return IMAGE_ENCODERS[self.terrain_image_format][0] if self.terrain_image_format in IMAGE_ENCODERS else '.exr'
+        if role == 'layermap' and self.terrain_image_format == 'FLOAT':
+            return '.exr'
+        return '.png'
+    
+    def load_cached_terrain(self, cache, cache_entry):
+        """Rebuild terrain data and textures from an import cache entry without touching the .ter"""
+        metadata = cache.metadata(cache_entry)
+        
+        heightmap = np.load(cache_entry / "heightmap.npy", mmap_mode='r')
+        layermap_path = cache_entry / "layermap.npy"
+        layermap = np.load(layermap_path, mmap_mode='r') if layermap_path.exists() else None
+        
+        textures = []
+        for role in CACHED_TEXTURE_ROLES:
+            image_info = metadata['images'].get(role)
+            textures.append(self.load_cached_image(cache_entry / image_info['file'], image_info['name'])
+                            if image_info else None)
+        
+        preset = self.load_cached_preset(metadata.get('preset_file'))
+        terrain_data = {
+            'header': metadata['header'],
+            # Header, config and materials come from the entry; the .ter itself is never opened on a hit
+            'terrain': None,
+            'ter_file': Path(metadata['ter_file']),
+            'json_file': Path(metadata['json_file']) if metadata['json_file'] else None,
+            'heightmap': heightmap,
+            'layermap': layermap,
+            'hole_mask': layermap == HOLE_VALUE if textures[2] is not None else None,
+            'material_names': metadata['material_names'],
+            'materials': metadata['materials'],
+            'config': metadata['config'],
+            'preset': preset,
+            # The preset is part of the cache key; still prefer its current values over the entry's
+            'height_scale': preset.height_scale if preset else metadata['height_scale'],
+            'terrain_position': (dict(preset.position) if preset.position is not None else None) if preset
+                                else metadata['terrain_position'],
+            'stats': metadata['stats'],
+        }
+        print(f"✅ Loaded terrain from import cache: {cache_entry.name}")
+        return terrain_data, tuple(textures)
+    
+    def load_cached_preset(self, preset_file):
+        """The memoised terrain preset recorded in a cache entry, if it still exists"""
+        if not preset_file:
+            return None
+        try:
+            return TerrainPreset.load(preset_file, self.level_index.source)
+        except (OSError, ValueError):
+            return None
+    
+    def load_cached_image(self, path, image_name):
+        """Load a cached texture file as a packed non-colour image"""
+        if image_name in bpy.data.images:
+            bpy.data.images.remove(bpy.data.images[image_name])
         
-        print(f"   Normalized range: {heightmap_normalized.min():.1f} - {heightmap_normalized.max():.1f}")
+        image = bpy.data.images.load(str(path), check_existing=False)
+        image.name = image_name
+        image.colorspace_settings.name = 'Non-Color'
+        image.pack()
+        return image
+    
+    def allocate_pixel_buffer(self, shape):
+        """Allocate a flat float32 RGBA buffer for uploading (height, width) maps"""
+        height, width = shape
+        return np.empty(height * width * 4, dtype=np.float32)
+    
+    def fill_pixel_buffer(self, pixel_buffer, values, scale=1.0):
+        """Write a single-channel map into an RGBA buffer as R=G=B=value*scale, A=1
+        
+        Everything is written in place - no normalised copy, no (h, w, 4)
+        temporary and no flatten() copy.
+        """
+        rgba = pixel_buffer.reshape(values.shape + (4,))
+        np.multiply(values, scale, out=rgba[:, :, 0], casting='unsafe')
+        rgba[:, :, 1] = rgba[:, :, 0]
+        rgba[:, :, 2] = rgba[:, :, 0]
+        rgba[:, :, 3] = 1.0
+        return pixel_buffer
+    
+    def create_displacement_texture(self, heightmap, pixel_buffer=None):
+        """Create a 16-bit EXR texture for displacement mapping"""
+        
+        height, width = heightmap.shape
+        print(f"🏔️  Converting heightmap to texture ({width}x{height})...")
         
         # Create Blender image
-        image_name = "BeamNG_Terrain_Displacement.exr"
+        image_name = DISPLACEMENT_IMAGE
         
         # Remove existing image if it exists
         if image_name in bpy.data.images:
             bpy.data.images.remove(bpy.data.images[image_name])
         
+        # Single-channel 16-bit PNG or half EXR, both sampled as 0-1 like the float EXR.
+        # The encoded file is loaded directly instead of uploading an RGBA float buffer.
+        if self.terrain_image_format in IMAGE_ENCODERS:
+            displacement_image = self.load_packed_image(image_name, heightmap, IMAGE_ENCODERS[self.terrain_image_format])
+            print(f"✅ Created {self.terrain_image_format} displacement texture: {image_name} ({width}x{height})")
+            return displacement_image
+        
         # Create new image
-        height, width = heightmap_normalized.shape
         displacement_image = bpy.data.images.new(
             name=image_name,
             width=width,
@@ -436,45 +647,43 @@ class ImportBeamNGLevel(Operator, ImportHelper):
             float_buffer=True  # Use float buffer for 16-bit precision
         )
         
-        # Convert heightmap to RGBA format for Blender (R=height, G=height, B=height, A=1)
-        rgba_data = np.zeros((height, width, 4), dtype=np.float32)
-        rgba_data[:, :, 0] = heightmap_normalized  # Red channel
-        rgba_data[:, :, 1] = heightmap_normalized  # Green channel  
-        rgba_data[:, :, 2] = heightmap_normalized  # Blue channel
-        rgba_data[:, :, 3] = 1.0  # Alpha channel
+        # Normalize heightmap to 0-1 range straight into the RGBA buffer (matching npy_to_exr.py)
+        if pixel_buffer is None:
+            pixel_buffer = self.allocate_pixel_buffer(heightmap.shape)
+        self.fill_pixel_buffer(pixel_buffer, heightmap, 1.0 / 65535.0)
         
-        # Flatten for Blender (Blender expects flattened RGBA array)
-        displacement_image.pixels = rgba_data.flatten()
+        # Bulk upload - avoids per-element assignment through image.pixels
+        displacement_image.pixels.foreach_set(pixel_buffer)
         
-        # Update image
+        # Pack as float EXR - format must be set before packing
+        displacement_image.file_format = 'OPEN_EXR'
         displacement_image.update()
         displacement_image.pack()
         
-        # Save as EXR file
-        displacement_image.file_format = 'OPEN_EXR'
-        
         print(f"✅ Created displacement texture: {image_name} ({width}x{height})")
-        print(f"   Size: {width}x{height}")
-        print(f"   Value range: {heightmap_normalized.min():.1f} - {heightmap_normalized.max():.1f}")
         return displacement_image
     
-    def create_layermap_texture(self, layermap, materials):
+    def create_layermap_texture(self, layermap, materials, pixel_buffer=None):
         """Create a texture for the layermap (material indices)"""
         
-        print("🎨 Converting layermap to texture...")
-        print(f"   Input shape: {layermap.shape}")
-        print(f"   Value range: {layermap.min()} - {layermap.max()}")
-        print(f"   Unique materials: {len(np.unique(layermap))}")
+        height, width = layermap.shape
+        print(f"🎨 Converting layermap to texture ({width}x{height})...")
         
         # Create Blender image
-        image_name = "BeamNG_Terrain_Layermap"
+        image_name = LAYERMAP_IMAGE
         
         # Remove existing image if it exists
         if image_name in bpy.data.images:
             bpy.data.images.remove(bpy.data.images[image_name])
         
+        # Compact modes store material IDs as an 8-bit non-colour image (sampled as id/255)
+        if self.terrain_image_format != 'FLOAT':
+            layermap_image = self.load_packed_image(image_name, np.asarray(layermap, dtype=np.uint8))
+            print(f"✅ Created 8-bit layermap texture: {image_name} ({width}x{height})")
+            self.print_material_mapping(layermap, materials)
+            return layermap_image
+        
         # Create new image
-        height, width = layermap.shape
         layermap_image = bpy.data.images.new(
             name=image_name,
             width=width,
@@ -484,49 +693,73 @@ class ImportBeamNGLevel(Operator, ImportHelper):
         )
         
         # DO NOT normalize layermap - keep raw material ID values (matching npy_to_exr.py)
-        layermap_normalized = layermap.astype(np.float32)
-        if layermap.max() == 0:
-            print("⚠️  WARNING: Layermap is all zeros")
+        if pixel_buffer is None:
+            pixel_buffer = self.allocate_pixel_buffer(layermap.shape)
+        self.fill_pixel_buffer(pixel_buffer, layermap)
         
-        # Convert layermap to RGBA format for Blender (R=G=B=material_id, A=1)
-        rgba_data = np.zeros((height, width, 4), dtype=np.float32)
-        rgba_data[:, :, 0] = layermap_normalized  # Red channel
-        rgba_data[:, :, 1] = layermap_normalized  # Green channel  
-        rgba_data[:, :, 2] = layermap_normalized  # Blue channel
-        rgba_data[:, :, 3] = 1.0  # Alpha channel
-        
-        # Keep it simple - just flatten the RGBA data directly (like npy_to_exr.py)
-        pixel_data = rgba_data.flatten()
-        
-        # Set pixels to Blender image
-        layermap_image.pixels = pixel_data
-        
-        # Force update and pack the image
-        layermap_image.update()
-        layermap_image.pack()
+        # Bulk upload into the Blender image
+        layermap_image.pixels.foreach_set(pixel_buffer)
         
         # Set colorspace to Non-Color for data textures
         layermap_image.colorspace_settings.name = 'Non-Color'
         
-        # Save as EXR file
+        # Pack as EXR - format must be set before packing, like the displacement texture
         layermap_image.file_format = 'OPEN_EXR'
-        
-        # Force another update after format change
         layermap_image.update()
+        layermap_image.pack()
                 
         print(f"✅ Created layermap texture: {image_name} ({width}x{height})")
+        self.print_material_mapping(layermap, materials)
+        
+        return layermap_image
+    
+    def create_hole_mask_texture(self, hole_mask):
+        """Create an 8-bit mask texture with one white pixel per terrain hole cell"""
+        image_name = HOLES_IMAGE
+        if image_name in bpy.data.images:
+            bpy.data.images.remove(bpy.data.images[image_name])
         
-        # Print material mapping (like in npy_to_exr.py)
-        unique_values = np.unique(layermap)
+        hole_image = self.load_packed_image(image_name, np.multiply(hole_mask, 255, dtype=np.uint8))
+        print(f"🕳️  Terrain holes: {int(np.count_nonzero(hole_mask)):,} cells")
+        return hole_image
+    
+    def load_packed_image(self, image_name, array, encoder=None):
+        """Encode a single-channel image file, load it as a packed non-colour image and drop the file
+        
+        encoder is a (suffix, writer) pair from IMAGE_ENCODERS, 8/16-bit PNG by
+        default. A file already encoded by a pipeline worker is used as is.
+        """
+        suffix, writer = encoder or IMAGE_ENCODERS['PNG16']
+        temp_path = getattr(self, 'encoded_images', {}).pop(image_name, None)
+        if temp_path is None:
+            fd, temp_path = tempfile.mkstemp(suffix=suffix)
+            os.close(fd)
+        else:
+            array = None
+        try:
+            if array is not None:
+                writer(temp_path, array)
+            image = bpy.data.images.load(temp_path)
+            image.name = image_name
+            image.colorspace_settings.name = 'Non-Color'
+            image.pack()
+        finally:
+            os.remove(temp_path)
+        return image
+    
+    def print_material_mapping(self, layermap, materials):
+        """Print the materials used by the layermap (like in npy_to_exr.py)"""
+        # bincount avoids sorting the map
+        used_ids = np.flatnonzero(np.bincount(layermap.reshape(-1), minlength=256))
+        if used_ids.tolist() == [0]:
+            print("⚠️  WARNING: Layermap is all zeros")
         print("   Material mapping:")
-        for mat_id in unique_values[:10]:  # Show first 10
+        for mat_id in used_ids[:10]:  # Show first 10
             if mat_id < len(materials):
                 material_name = materials[mat_id]
                 print(f"     ID {mat_id} → {material_name}")
-        
-        return layermap_image
     
-    def create_terrain_with_node_group(self, displacement_texture, layermap_texture, terrain_data):
+    def create_terrain_with_node_group(self, displacement_texture, layermap_texture, terrain_data, hole_texture=None):
         """Create terrain mesh using BeamNG geometry node group with auto-detected settings"""
         
         # Get terrain dimensions and settings
@@ -551,6 +784,14 @@ class ImportBeamNGLevel(Operator, ImportHelper):
         terrain_obj = bpy.context.active_object
         terrain_obj.name = "BeamNG_Terrain"
         
+        # Remember the source terrain so it can be exported back to .ter
+        terrain_obj["beamng_type"] = "Terrain"
+        terrain_obj["beamng_terrain_size"] = terrain_size
+        terrain_obj["beamng_height_scale"] = displacement_strength
+        terrain_obj["beamng_materials"] = list(terrain_data['materials'])
+        if 'ter_file' in terrain_data:
+            terrain_obj["beamng_source_ter"] = str(terrain_data['ter_file'])
+        
         # Prepare terrain position (convert to tuple if available)
         terrain_pos = (0.0, 0.0, 0.0)
         if terrain_position:
@@ -559,6 +800,9 @@ class ImportBeamNGLevel(Operator, ImportHelper):
                 terrain_position.get('y', 0.0),
                 terrain_position.get('z', 0.0)
             )
+        terrain_obj["beamng_terrain_position"] = terrain_pos
+        terrain_obj["beamng_heightmap_size"] = terrain_data['heightmap'].shape[0]
+        terrain_obj["beamng_terrain_image_format"] = self.terrain_image_format
         
         # Create advanced terrain material with textures
         material_name = "BeamNG_Terrain_Material"
@@ -567,32 +811,34 @@ class ImportBeamNGLevel(Operator, ImportHelper):
         # Get level directory from terrain data
         level_dir = Path(terrain_data.get('level_directory', ''))
         terrain_textures_dir = level_dir / "art" / "terrains"
+        source = self.level_index.source
         
         # Look for common terrain texture patterns
         texture_ao_path = None
         texture_base_path = None  
         texture_roughness_path = None
         
-        if terrain_textures_dir.exists():
-            # Find texture files - prioritize terrain_base textures first
-            texture_patterns = {
-                'ao': ['t_terrain_base_ao.png', 't_terrain_base02_ao.png'],
-                'base': ['t_terrain_base_b.png', 't_terrain_base02_b.png'],
-                'roughness': ['t_terrain_base_r.png', 't_terrain_base02_r.png']
-            }
-            
-            for tex_type, patterns in texture_patterns.items():
-                for pattern in patterns:
-                    tex_path = terrain_textures_dir / pattern
-                    if tex_path.exists():
-                        if tex_type == 'ao':
-                            texture_ao_path = str(tex_path)
-                        elif tex_type == 'base':
-                            texture_base_path = str(tex_path)
-                        elif tex_type == 'roughness':
-                            texture_roughness_path = str(tex_path)
-                        print(f"📁 Found terrain texture ({tex_type}): {pattern}")
-                        break
+        # Find texture files - prioritize terrain_base textures first
+        texture_patterns = {
+            'ao': ['t_terrain_base_ao.png', 't_terrain_base02_ao.png'],
+            'base': ['t_terrain_base_b.png', 't_terrain_base02_b.png'],
+            'roughness': ['t_terrain_base_r.png', 't_terrain_base02_r.png']
+        }
+        
+        for tex_type, patterns in texture_patterns.items():
+            for pattern in patterns:
+                tex_path = terrain_textures_dir / pattern
+                if source.exists(tex_path):
+                    # Zipped textures are extracted one at a time, only when used
+                    tex_path = source.local_path(tex_path)
+                    if tex_type == 'ao':
+                        texture_ao_path = str(tex_path)
+                    elif tex_type == 'base':
+                        texture_base_path = str(tex_path)
+                    elif tex_type == 'roughness':
+                        texture_roughness_path = str(tex_path)
+                    print(f"📁 Found terrain texture ({tex_type}): {pattern}")
+                    break
         
         # Create terrain material with found textures
         terrain_material = terrain_material_node_group(
@@ -626,9 +872,22 @@ class ImportBeamNGLevel(Operator, ImportHelper):
             position=terrain_pos,
             size=terrain_size,
             resolution=vertex_resolution,
-            height=displacement_strength
+            height=displacement_strength,
+            hole_image=hole_texture
         )
         
+        # Tiled mode: the tiles carry the terrain node group, BeamNG_Terrain merges them
+        if self.terrain_mode == 'TILED':
+            self.create_terrain_tiles(terrain_obj, node_group, terrain_material, terrain_size,
+                                      vertex_resolution, terrain_pos)
+            return terrain_obj
+        
+        # Adaptive mode: a static RTIN mesh replaces the node group grid
+        if self.terrain_mode == 'ADAPTIVE':
+            self.create_adaptive_terrain(terrain_obj, terrain_data, terrain_material, terrain_size,
+                                         displacement_strength, terrain_pos)
+            return terrain_obj
+        
         # Add geometry nodes modifier
         geo_nodes_mod = terrain_obj.modifiers.new(name="BeamNG_Terrain", type='NODES')
         geo_nodes_mod.node_group = node_group
@@ -650,6 +909,71 @@ class ImportBeamNGLevel(Operator, ImportHelper):
         
         return terrain_obj
     
+    def create_terrain_tiles(self, terrain_obj, node_group, terrain_material, terrain_size, vertex_resolution, terrain_pos):
+        """Split the terrain into N x N tile objects sharing one node group and displacement image"""
+        tile_count = max(1, min(self.terrain_tile_count, vertex_resolution))
+        tile_size = terrain_size / tile_count
+        base_resolution = max(vertex_resolution // tile_count, 1)
+        
+        tiles_collection = self.get_or_create_collection(TILES_COLLECTION)
+        for old_tile in list(tiles_collection.objects):
+            bpy.data.objects.remove(old_tile, do_unlink=True)
+        
+        for tile_y in range(tile_count):
+            for tile_x in range(tile_count):
+                tile_name = f"BeamNG_TerrainTile_{tile_x:02d}_{tile_y:02d}"
+                tile_mesh = bpy.data.meshes.new(tile_name)
+                tile_mesh.materials.append(terrain_material)
+                tile_obj = bpy.data.objects.new(tile_name, tile_mesh)
+                
+                # LOD inputs read by utils.terrain_lod
+                tile_obj["beamng_type"] = "TerrainTile"
+                tile_obj["beamng_tile_center"] = (
+                    terrain_pos[0] + (tile_x + 0.5) * tile_size,
+                    terrain_pos[1] + (tile_y + 0.5) * tile_size,
+                    terrain_pos[2]
+                )
+                tile_obj["beamng_tile_base_resolution"] = base_resolution
+                tile_obj["beamng_tile_lod_distance"] = tile_size
+                
+                modifier = tile_obj.modifiers.new(name="BeamNG_Terrain", type='NODES')
+                modifier.node_group = node_group
+                set_modifier_input(modifier, "Tile Count", tile_count)
+                set_modifier_input(modifier, "Tile X", tile_x)
+                set_modifier_input(modifier, "Tile Y", tile_y)
+                # Start coarse, the LOD update below refines tiles near the viewer
+                set_modifier_input(modifier, "Resolution", min(MIN_TILE_RESOLUTION, base_resolution))
+                
+                tiles_collection.objects.link(tile_obj)
+        
+        # BeamNG_Terrain becomes a bounds-only proxy of the merged tiles, so DecalRoads can still raycast it
+        proxy_mod = terrain_obj.modifiers.new(name="BeamNG_TerrainTiles", type='NODES')
+        proxy_mod.node_group = terrain_tiles_node_group(tiles_collection)
+        terrain_obj.display_type = 'BOUNDS'
+        terrain_obj.hide_render = True
+        
+        update_terrain_lod()
+        
+        print(f"✅ Created {tile_count}x{tile_count} terrain tiles ({base_resolution}x{base_resolution} max each)")
+    
+    def create_adaptive_terrain(self, terrain_obj, terrain_data, terrain_material, terrain_size, height_scale, terrain_pos):
+        """Replace the terrain plane with an adaptive mesh built straight from the heightmap"""
+        mesh = create_adaptive_terrain_mesh(
+            name="BeamNG_Terrain",
+            heightmap=terrain_data['heightmap'],
+            layermap=terrain_data.get('layermap'),
+            size=terrain_size,
+            height_scale=height_scale,
+            position=terrain_pos,
+            max_error=self.terrain_max_error,
+            hole_mask=terrain_data.get('hole_mask')
+        )
+        mesh.materials.append(terrain_material)
+        
+        plane_mesh = terrain_obj.data
+        terrain_obj.data = mesh
+        bpy.data.meshes.remove(plane_mesh)
+    
     def adjust_camera_clip_planes(self):
         """Adjust camera clip planes to handle large terrain better"""
         
@@ -778,14 +1102,37 @@ class ImportBeamNGLevel(Operator, ImportHelper):
         # TODO: Implement lighting import in Phase 5
         pass
     
-    def import_decal_roads_data(self, directory):
-        """Import DecalRoad objects from level data"""
+    def prepare_decal_roads(self, directory, materials_future=None, parser=None):
+        """Parse road and material JSON and resolve the road textures - no bpy, runs on a pipeline worker
+        
+        materials_future is the parser's parse_materials() submitted by import_stages.
+        """
+        if parser is None:
+            parser = DecalRoadParser(directory, self.level_index)
+        parser.parse_level(materials_future)
+        
+        used_materials = [parser.get_material(name) for name in parser.get_unique_materials()]
+        texture_files = resolve_material_textures(
+            [material.__dict__ for material in used_materials if material],
+            Path(directory), self.level_index.source
+        )
+        return parser, texture_files
+    
+    def import_decal_roads_data(self, directory, prepared=None):
+        """Import DecalRoad objects from level data
+        
+        prepared returns the result of prepare_decal_roads() computed on a
+        worker; without it the level is parsed here.
+        """
+        return run_steps(self.decal_road_import_steps(directory, prepared))
+    
+    def decal_road_import_steps(self, directory, prepared=None):
+        """import_decal_roads_data as a generator yielding the stage's progress (0-1) before each road"""
         try:
             self.report({'INFO'}, "Importing DecalRoad objects...")
             
             # Parse DecalRoad data
-            parser = DecalRoadParser(directory)
-            parser.parse_level()
+            parser, texture_files = prepared() if prepared else self.prepare_decal_roads(directory)
             
             roads_data = parser.get_roads_data()
             if not roads_data:
@@ -795,48 +1142,85 @@ class ImportBeamNGLevel(Operator, ImportHelper):
             # Create or get DecalRoads collection
             roads_collection = self.get_or_create_collection("DecalRoads")
             
-            # Get existing road persistent IDs to avoid duplicates
-            existing_road_ids = set()
-            for obj in bpy.data.objects:
-                if obj.get('beamng_type') == 'DecalRoad':
-                    existing_id = obj.get('beamng_persistent_id')
-                    if existing_id:
-                        existing_road_ids.add(existing_id)
+            # Existing road persistent IDs, from the scene registry, to avoid duplicates
+            existing_road_ids = road_registry
             
             print(f"🔍 Found {len(existing_road_ids)} existing DecalRoad objects")
             
             # Create materials if materials import is enabled
             if self.import_materials:
-                self.create_decal_road_materials(parser, directory)
+                self.create_decal_road_materials(parser, directory, texture_files)
+                yield 0.1
             
             # Create geometry node group
             self.ensure_decal_road_node_group()
             
+            if self.road_mode != 'OBJECTS':
+                # All roads in one or a few network objects, evaluated once each
+                new_roads = [road_data for road_data in roads_data if road_data.persistent_id not in existing_road_ids]
+                yield 0.5
+                network_objects = create_road_networks(new_roads, per_material=self.road_mode == 'NETWORK_PER_MATERIAL',
+                                                       names=self.datablock_names())
+                for network_obj in network_objects:
+                    roads_collection.objects.link(network_obj)
+                    road_registry.add(network_obj)
+                
+                self.report({'INFO'}, f"Imported {len(new_roads)} DecalRoads into {len(network_objects)} road network objects"
+                            f", skipped {len(roads_data) - len(new_roads)} duplicates")
+                if self.sync_roads:
+                    # Networks carry no per-road hashes, so there is nothing to compare changed roads against
+                    self.report({'WARNING'}, "Sync Existing Roads only works in Separate Objects road mode, "
+                                             "existing roads were not updated or removed")
+                return
+            
+            # Convert every road's nodes to spline point data at once
+            co, radius, offsets = road_point_buffers([road_data.nodes for road_data in roads_data])
+            
             # Import each road
             imported_count = 0
             skipped_count = 0
-            for road_data in roads_data:
+            updated_count = 0
+            for index, road_data in enumerate(roads_data):
+                yield 0.1 + 0.9 * index / len(roads_data)
                 try:
-                    # Skip if road already exists
+                    # Existing roads are skipped, or rebuilt in place when syncing and their content changed
                     if road_data.persistent_id in existing_road_ids:
+                        # Roads held by a road network object cannot be synced one by one and are skipped
+                        existing_obj = road_registry.get(road_data.persistent_id)
+                        if self.sync_roads and (existing_obj is None or existing_obj.get('beamng_type') == 'DecalRoad'):
+                            if self.sync_decal_road_object(road_data, (co[offsets[index]:offsets[index + 1]],
+                                                                       radius[offsets[index]:offsets[index + 1]])):
+                                updated_count += 1
+                            continue
                         print(f"⏭️  Skipping duplicate road: {road_data.persistent_id[:8]}")
                         skipped_count += 1
                         continue
                     
-                    road_obj = self.create_decal_road_object(road_data, parser, directory)
+                    start, stop = offsets[index], offsets[index + 1]
+                    road_obj = self.create_decal_road_object(road_data, parser, directory,
+                                                             (co[start:stop], radius[start:stop]))
                     if road_obj:
                         roads_collection.objects.link(road_obj)
+                        road_registry.add(road_obj)
                         imported_count += 1
                         
                 except Exception as e:
                     print(f"❌ Failed to import road {road_data.persistent_id}: {e}")
                     continue
             
+            removed_count = 0
+            if self.sync_roads and self.remove_missing_roads:
+                removed_count = self.remove_deleted_decal_roads(parser)
+            
             # Report results
             stats = parser.get_stats()
             message = f"Imported {imported_count} DecalRoad objects ({stats['unique_materials_used']} unique materials)"
             if skipped_count > 0:
                 message += f", skipped {skipped_count} duplicates"
+            if self.sync_roads:
+                message += f", updated {updated_count} changed roads"
+            if removed_count > 0:
+                message += f", removed {removed_count} deleted roads"
             self.report({'INFO'}, message)
             
         except Exception as e:
@@ -848,12 +1232,12 @@ class ImportBeamNGLevel(Operator, ImportHelper):
         if name in bpy.data.collections:
             return bpy.data.collections[name]
         
-        collection = bpy.data.collections.new(name)
+        collection = self.datablock_names().new('collections', name)
         bpy.context.scene.collection.children.link(collection)
         return collection
     
-    def create_decal_road_materials(self, parser: DecalRoadParser, level_path: str):
-        """Create materials for all roads"""
+    def create_decal_road_materials(self, parser: DecalRoadParser, level_path: str, texture_files=None):
+        """Create materials for all roads; texture_files are texture lookups done by prepare_decal_roads"""
         unique_materials = parser.get_unique_materials()
         
         print(f"🎨 Creating {len(unique_materials)} DecalRoad materials...")
@@ -865,7 +1249,10 @@ class ImportBeamNGLevel(Operator, ImportHelper):
             mat = create_beamng_decal_road_material(
                 material_name, 
                 material_data.__dict__ if material_data else None,
-                Path(level_path)
+                Path(level_path),
+                parser.index.source,
+                texture_files,
+                self.datablock_names()
             )
             
             print(f"  ✅ Created material: {material_name}")
@@ -876,62 +1263,73 @@ class ImportBeamNGLevel(Operator, ImportHelper):
             decal_road_node_group()
             print("✅ Created BeamNG_DecalRoad geometry node group")
     
-    def create_decal_road_object(self, road_data: DecalRoadData, parser: DecalRoadParser, level_path: str) -> bpy.types.Object:
-        """Create a Blender curve object from DecalRoad data"""
+    def create_decal_road_object(self, road_data: DecalRoadData, parser: DecalRoadParser, level_path: str,
+                                 points=None) -> bpy.types.Object:
+        """Create a Blender curve object from DecalRoad data
         
-        # Create curve with unique name
-        curve_name = f"DecalRoad_{road_data.persistent_id[:8]}"
+        points is the road's (co, radius) slice of road_point_buffers(), so
+        the stage converts all node arrays at once.
+        """
         
-        # Ensure unique curve data name
-        curve_data_name = curve_name
-        counter = 1
-        while curve_data_name in bpy.data.curves:
-            curve_data_name = f"{curve_name}.{counter:03d}"
-            counter += 1
-            
-        curve_data = bpy.data.curves.new(curve_data_name, type='CURVE')
-        curve_data.dimensions = '3D'
-        curve_data.resolution_u = 12
-        
-        # Create spline
-        spline = curve_data.splines.new('POLY')
-        spline.points.add(len(road_data.nodes) - 1)
-        
-        # Set control points
-        for i, node in enumerate(road_data.nodes):
-            x, y, z, width = node
-            spline.points[i].co = (x, y, z, 1.0)
-            spline.points[i].radius = width
-        
-        # Create object with unique name
-        object_name = curve_name
-        counter = 1
-        while object_name in bpy.data.objects:
-            object_name = f"{curve_name}.{counter:03d}"
-            counter += 1
-            
-        curve_obj = bpy.data.objects.new(object_name, curve_data)
-        
-        # Set custom properties
-        curve_obj["beamng_type"] = "DecalRoad"
-        curve_obj["beamng_material"] = road_data.material
-        curve_obj["beamng_persistent_id"] = road_data.persistent_id
-        curve_obj["beamng_texture_length"] = road_data.texture_length
-        curve_obj["beamng_break_angle"] = road_data.break_angle
-        curve_obj["beamng_improved_spline"] = road_data.improved_spline
-        curve_obj["beamng_render_priority"] = road_data.render_priority
-        curve_obj["beamng_start_end_fade"] = road_data.start_end_fade
-        curve_obj["beamng_distance_fade"] = road_data.distance_fade
+        # Spline points and custom properties are set in bulk; names are allocated without probing bpy.data
+        curve_name = f"DecalRoad_{road_data.persistent_id[:8]}"
+        co, radius = points if points is not None else (None, None)
+        curve_obj = create_road_curve_object(curve_name, road_data, co, radius, names=self.datablock_names(),
+                                             properties={'beamng_level': self.level_index.root.name})
+        self.setup_decal_road_object(curve_obj, road_data)
+        return curve_obj
+    
+    def sync_decal_road_object(self, road_data: DecalRoadData, points=None) -> bool:
+        """Rebuild the existing object of a road in place if its content hash changed; True if it was updated
+        
+        Roads held by a road network object are left alone.
+        """
+        curve_obj = road_registry.get(road_data.persistent_id)
+        if curve_obj is None or curve_obj.get('beamng_type') != 'DecalRoad':
+            return False
+        if curve_obj.get(ROAD_HASH_PROPERTY) == road_data.content_hash():
+            return False
+        
+        co, radius = points if points is not None else (None, None)
+        update_road_curve_object(curve_obj, road_data, co, radius)
+        self.setup_decal_road_object(curve_obj, road_data)
+        print(f"🔄 Updated changed road: {road_data.persistent_id[:8]}")
+        return True
+    
+    def remove_deleted_decal_roads(self, parser: DecalRoadParser) -> int:
+        """Remove this level's road objects whose road is no longer in the level; returns how many"""
+        level_name = self.level_index.root.name
+        deleted = []
+        for persistent_id in road_registry:
+            if persistent_id in parser.roads_by_id:
+                continue
+            obj = road_registry.get(persistent_id)
+            if obj is not None and obj.get('beamng_type') == 'DecalRoad' and obj.get('beamng_level') == level_name:
+                deleted.append(obj)
+        
+        if deleted:
+            curves = [obj.data for obj in deleted]
+            bpy.data.batch_remove(deleted + curves)
+            road_registry.mark_stale()
+            print(f"🗑️  Removed {len(deleted)} roads deleted from the level")
+        return len(deleted)
+    
+    def setup_decal_road_object(self, curve_obj: bpy.types.Object, road_data: DecalRoadData):
+        """Material and geometry nodes of a new or updated road object"""
+        curve_data = curve_obj.data
         
         # Apply material if available and requested
+        curve_data.materials.clear()
         if self.import_materials and road_data.material in bpy.data.materials:
             material = bpy.data.materials[road_data.material]
             curve_data.materials.append(material)
         
         # Apply geometry nodes
         if "BeamNG_DecalRoad" in bpy.data.node_groups:
-            modifier = curve_obj.modifiers.new(name="DecalRoad_GeometryNodes", type='NODES')
-            modifier.node_group = bpy.data.node_groups["BeamNG_DecalRoad"]
+            modifier = curve_obj.modifiers.get("DecalRoad_GeometryNodes")
+            if modifier is None:
+                modifier = curve_obj.modifiers.new(name="DecalRoad_GeometryNodes", type='NODES')
+                modifier.node_group = bpy.data.node_groups["BeamNG_DecalRoad"]
             
             # Set geometry node modifier inputs using socket indices
             # Based on the node group interface: Socket 5 = Material, Socket 6 = Texture Length
@@ -947,8 +1345,6 @@ class ImportBeamNGLevel(Operator, ImportHelper):
                     modifier["Socket_5"] = bpy.data.materials[road_data.material]
                 except Exception as e:
                     print(f"⚠️  Could not set material {road_data.material} for {curve_obj.name}: {e}")
-        
-        return curve_obj
 
 def register():
     bpy.utils.register_class(ImportBeamNGLevel)
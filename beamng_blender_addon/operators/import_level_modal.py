@@ -0,0 +1,168 @@
+"""
+BeamNG Level Import Operator (modal)
+Runs the level import without blocking the UI: parsing happens on pipeline
+workers, datablocks are created in short time slices on a timer, and Esc
+cancels the import and removes everything it created
+"""
+
+import time
+
+import bpy
+
+from .import_level import ImportBeamNGLevel
+from ..utils.import_pipeline import ImportPipeline
+from ..utils.road_registry import road_registry
+
+
+TIMER_INTERVAL = 0.05  # seconds between modal updates
+TIME_SLICE = 0.04  # main thread budget per update, in seconds
+PROGRESS_STEPS = 1000
+
+# bpy.data collections whose new datablocks are removed when an import is cancelled
+ROLLBACK_COLLECTIONS = (
+    'objects', 'collections', 'meshes', 'curves', 'hair_curves', 'materials',
+    'node_groups', 'images', 'textures',
+)
+
+
+def snapshot_datablocks():
+    """The datablocks that exist right now, per bpy.data collection"""
+    return {name: set(getattr(bpy.data, name)) for name in ROLLBACK_COLLECTIONS}
+
+
+def remove_new_datablocks(snapshot):
+    """Remove every datablock created since snapshot; returns how many were removed"""
+    new_ids = []
+    for name in ROLLBACK_COLLECTIONS:
+        existing = snapshot[name]
+        new_ids.extend(datablock for datablock in getattr(bpy.data, name) if datablock not in existing)
+    if new_ids:
+        bpy.data.batch_remove(new_ids)
+    return len(new_ids)
+
+
+class ImportBeamNGLevelModal(ImportBeamNGLevel):
+    """Import BeamNG.drive Level Data in the background (Esc to cancel)"""
+
+    bl_idname = "import_scene.beamng_level_modal"
+    bl_label = "Import BeamNG Level (Background)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        """Start the pipeline and hand over to modal()"""
+        try:
+            directory = self.open_selected_level()
+        except Exception as e:
+            self.report({'ERROR'}, f"Import failed: {str(e)}")
+            return {'CANCELLED'}
+        if directory is None:
+            return {'CANCELLED'}
+
+        self._snapshot = snapshot_datablocks()
+        self._pipeline = ImportPipeline()
+        for name, prepare, steps, discard in self.import_stages(directory, self._pipeline):
+            self._pipeline.add(name, prepare, steps, discard)
+
+        self._stage_index = 0
+        self._steps = None
+        self._stage_progress = 0.0
+        self._start_time = time.perf_counter()
+
+        wm = context.window_manager
+        wm.progress_begin(0, PROGRESS_STEPS)
+        self._timer = wm.event_timer_add(TIMER_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        self.set_status(context, "Starting import...")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.abort_import(context)
+            self.report({'WARNING'}, "BeamNG level import cancelled")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        try:
+            finished = self.run_time_slice(context)
+        except Exception as e:
+            self.abort_import(context)
+            self.report({'ERROR'}, f"Import failed: {str(e)}")
+            return {'CANCELLED'}
+
+        if finished == {'CANCELLED'}:
+            self.abort_import(context)
+            return {'CANCELLED'}
+        if finished:
+            self.end_import(context)
+            self._pipeline.shutdown()
+            elapsed = time.perf_counter() - self._start_time
+            self.report({'INFO'}, f"BeamNG level import completed successfully ({elapsed:.1f}s)")
+            return {'FINISHED'}
+        return {'RUNNING_MODAL'}
+
+    def run_time_slice(self, context):
+        """Advance the current stage until the time slice is used up
+
+        Returns True when every stage is done, {'CANCELLED'} if the terrain
+        stage failed and False while work remains.
+        """
+        stages = self._pipeline.stages
+        deadline = time.perf_counter() + TIME_SLICE
+        while time.perf_counter() < deadline:
+            if self._stage_index == len(stages):
+                return True
+            name, future, steps = stages[self._stage_index]
+
+            if self._steps is None:
+                # Never block the UI waiting for a worker
+                if future is not None and not future.done():
+                    self.set_status(context, f"Reading {name.replace('_', ' ')}...")
+                    break
+                self._steps = steps(future.result if future is not None else lambda: None)
+                self.set_status(context, f"Creating {name.replace('_', ' ')}...")
+
+            try:
+                self._stage_progress = next(self._steps)
+            except StopIteration as stop:
+                self._steps = None
+                self._stage_index += 1
+                self._stage_progress = 0.0
+                if name == "terrain" and stop.value == {'CANCELLED'}:
+                    return {'CANCELLED'}
+
+        done = (self._stage_index + self._stage_progress) / max(len(stages), 1)
+        context.window_manager.progress_update(int(done * PROGRESS_STEPS))
+        return False
+
+    def set_status(self, context, text):
+        """Show import progress in the status bar"""
+        stages = self._pipeline.stages
+        context.workspace.status_text_set(
+            f"BeamNG import ({min(self._stage_index + 1, len(stages))}/{len(stages)}): {text}  Esc to cancel"
+        )
+
+    def end_import(self, context):
+        """Remove the timer, progress indicator and status text"""
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+    def abort_import(self, context):
+        """Stop the workers and remove every datablock this import created"""
+        if self._steps is not None:
+            self._steps.close()
+            self._steps = None
+        self._pipeline.cancel()
+        self.end_import(context)
+        removed = remove_new_datablocks(self._snapshot)
+        road_registry.mark_stale()
+        print(f"🧹 Import cancelled - removed {removed} partially imported datablocks")
+
+    def cancel(self, context):
+        """Called by Blender when the modal operator is stopped externally"""
+        self.abort_import(context)
@@ -4,8 +4,16 @@ Contains parsers for various BeamNG data formats
 """
 
 from .decal_road_parser import DecalRoadParser, DecalRoadData, MaterialData
+from .level_index import LevelIndex
+from .vfs import DirectorySource, ZipSource, open_level
+from .terrain_preset import TerrainPreset
 
 __all__ = [
+    'LevelIndex',
+    'DirectorySource',
+    'ZipSource',
+    'open_level',
+    'TerrainPreset',
     'DecalRoadParser',
     'DecalRoadData', 
     'MaterialData'
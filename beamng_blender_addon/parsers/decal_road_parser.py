@@ -3,10 +3,69 @@ BeamNG DecalRoad Parser
 Handles parsing DecalRoad objects and their materials from BeamNG level data
 """
 
+import hashlib
+import itertools
 import json
 import os
+import re
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from .level_index import LevelIndex
+
+
+# Lines without this are skipped before any JSON decoding
+DECAL_ROAD_MARKER = '"DecalRoad"'
+NODES_PATTERN = re.compile(r'"nodes"\s*:\s*\[')
+NODE_COMPONENTS = 4  # x, y, z, width
+
+# Road fields besides the nodes that end up in Blender, and so in the content hash
+HASHED_ATTRIBUTES = (
+    'material', 'texture_length', 'break_angle', 'improved_spline',
+    'render_priority', 'start_end_fade', 'distance_fade',
+)
+
+
+def _decode_nodes(text: str) -> Optional[np.ndarray]:
+    """Decode '[x,y,z,w],[x,y,z,w],...' straight to float32, or None if it is not plain numbers"""
+    if not text.strip():
+        return np.empty((0, NODE_COMPONENTS), dtype=np.float32)
+    
+    flat = text.replace('[', ' ').replace(']', ' ')
+    try:
+        values = np.fromstring(flat, dtype=np.float32, sep=',')
+    except ValueError:  # non-numeric data, on NumPy versions that raise rather than stop early
+        return None
+    if values.size != flat.count(',') + 1 or values.size % NODE_COMPONENTS:
+        return None
+    return values.reshape(-1, NODE_COMPONENTS)
+
+
+def decode_road_line(line: str) -> Optional[Dict[str, Any]]:
+    """Decode one items.level.json line if it can be a DecalRoad, else None
+    
+    The node array - almost all of a road line - is cut out and parsed with
+    NumPy, so json only decodes the few remaining fields. Lines the fast path
+    cannot handle fall back to a plain json.loads.
+    """
+    if DECAL_ROAD_MARKER not in line:
+        return None
+    
+    match = NODES_PATTERN.search(line)
+    if match:
+        # Nodes hold only numbers, so the first ']]' closes the array
+        start = match.end()
+        end = start if line.startswith(']', start) else line.find(']]', start) + 1
+        nodes = _decode_nodes(line[start:end]) if end > 0 else None
+        if nodes is not None:
+            item = json.loads(line[:match.start()] + '"nodes":[]' + line[end + 1:])
+            item['nodes'] = nodes
+            return item
+    
+    return json.loads(line)
 
 
 class DecalRoadData:
@@ -17,7 +76,8 @@ class DecalRoadData:
         self.persistent_id = road_dict.get('persistentId', '')
         self.parent = road_dict.get('__parent', '')
         self.position = road_dict.get('position', [0, 0, 0])
-        self.nodes = road_dict.get('nodes', [])
+        # Compact (n, 4) float32 buffer of x, y, z, width
+        self.nodes = np.asarray(road_dict.get('nodes', []), dtype=np.float32)
         self.material = road_dict.get('material', '')
         self.texture_length = road_dict.get('textureLength', 20.0)
         self.break_angle = road_dict.get('breakAngle', 1.0)
@@ -27,11 +87,24 @@ class DecalRoadData:
         self.distance_fade = road_dict.get('distanceFade', [300, 50])
         
         # Validate that we have minimum required data
-        if not self.nodes or len(self.nodes) < 2:
+        if self.nodes.ndim != 2 or self.nodes.shape[1] != NODE_COMPONENTS:
+            raise ValueError(f"DecalRoad {self.persistent_id} has malformed nodes: shape {self.nodes.shape}")
+        
+        if len(self.nodes) < 2:
             raise ValueError(f"DecalRoad {self.persistent_id} has insufficient nodes: {len(self.nodes)}")
         
         if not self.material:
             raise ValueError(f"DecalRoad {self.persistent_id} has no material assigned")
+        
+        self._content_hash: Optional[str] = None
+    
+    def content_hash(self) -> str:
+        """Digest of the nodes and imported properties, to spot roads changed since the last import"""
+        if self._content_hash is None:
+            digest = hashlib.blake2b(np.ascontiguousarray(self.nodes).tobytes(), digest_size=16)
+            digest.update(json.dumps([getattr(self, name) for name in HASHED_ATTRIBUTES], default=str).encode('utf-8'))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
 
 
 class MaterialData:
@@ -73,34 +146,46 @@ class MaterialData:
 class DecalRoadParser:
     """Parser for BeamNG DecalRoad data"""
     
-    def __init__(self, level_path: str):
+    def __init__(self, level_path: str, index: Optional[LevelIndex] = None):
         self.level_path = Path(level_path)
         self.roads: List[DecalRoadData] = []
         self.materials: Dict[str, MaterialData] = {}
+        
+        # Indexes kept in step with self.roads while parsing
+        self.roads_by_id: Dict[str, DecalRoadData] = {}
+        self.roads_by_material: Dict[str, List[DecalRoadData]] = {}
+        self.duplicate_count = 0
         self._processed_files: set = set()  # Track processed files to avoid duplicates
         
-        if not self.level_path.exists():
+        if index is None and not self.level_path.exists():
             raise FileNotFoundError(f"Level path does not exist: {level_path}")
+        
+        # The index also carries the level source, so zipped levels are read in place
+        self.index = index if index is not None else LevelIndex.load(self.level_path)
+        self.level_path = self.index.root
     
-    def parse_level(self) -> None:
-        """Parse the entire level for DecalRoad data"""
+    def parse_level(self, materials_future: Optional[Future] = None) -> None:
+        """Parse the entire level for DecalRoad data
+        
+        materials_future is parse_materials() already submitted to an executor
+        by the caller, so material files are parsed while the road files are
+        parsed here (the two share no state). It must be submitted from the
+        top level, not from a worker of the same pool, or waiting on it can
+        deadlock a full pool. Without it materials are parsed after the roads.
+        """
         print(f"🛣️  Parsing DecalRoad data from: {self.level_path}")
         
-        # Parse roads
+        # Parse roads; duplicates are dropped as they are found
         roads_parsed = self._parse_roads()
-        
-        # Deduplicate roads after parsing all files
-        original_count = len(self.roads)
-        self._deduplicate_roads()
         final_count = len(self.roads)
         
-        if original_count != final_count:
-            print(f"🔄 Deduplicated {original_count - final_count} duplicate roads")
+        if self.duplicate_count:
+            print(f"🔄 Deduplicated {self.duplicate_count} duplicate roads")
         
         print(f"✅ Found {final_count} unique DecalRoad objects")
         
         # Parse materials
-        materials_parsed = self._parse_materials()
+        materials_parsed = materials_future.result() if materials_future else self.parse_materials()
         print(f"✅ Found {materials_parsed} materials")
         
         # Validate that all road materials exist
@@ -110,26 +195,18 @@ class DecalRoadParser:
         """Parse DecalRoad objects from level files"""
         roads_count = 0
         
-        # Look for road item files
-        road_patterns = [
-            "main/MissionGroup/roads/items.level.json",
-            "main/MissionGroup/*/roads/items.level.json",
-            "**/roads/items.level.json",
-            "**/*roads*.json"
-        ]
-        
-        for pattern in road_patterns:
-            for road_file in self.level_path.glob(pattern):
-                # Skip if we've already processed this file
-                file_key = str(road_file.resolve())
-                if file_key in self._processed_files:
-                    continue
-                
-                try:
-                    roads_count += self._parse_road_file(road_file)
-                    self._processed_files.add(file_key)
-                except Exception as e:
-                    print(f"❌ Error parsing road file {road_file}: {e}")
+        # Road item files come from the level index, MissionGroup roads first
+        for road_file in self.index.road_files():
+            # Skip if we've already processed this file
+            file_key = str(road_file)
+            if file_key in self._processed_files:
+                continue
+            
+            try:
+                roads_count += self._parse_road_file(road_file)
+                self._processed_files.add(file_key)
+            except Exception as e:
+                print(f"❌ Error parsing road file {road_file}: {e}")
         
         return roads_count
     
@@ -140,41 +217,10 @@ class DecalRoadParser:
         print(f"📁 Parsing road file: {road_file.relative_to(self.level_path)}")
         
         try:
-            with open(road_file, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                
-                # Handle different JSON formats
-                if content.startswith('['):
-                    # JSON array format
-                    data = json.loads(content)
-                    for item in data:
-                        if self._is_decal_road(item):
-                            try:
-                                road = DecalRoadData(item)
-                                self.roads.append(road)
-                                roads_found += 1
-                            except ValueError as e:
-                                print(f"⚠️  Skipping invalid road: {e}")
-                
-                else:
-                    # Line-by-line JSON format
-                    for line_num, line in enumerate(content.split('\n'), 1):
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        try:
-                            item = json.loads(line)
-                            if self._is_decal_road(item):
-                                try:
-                                    road = DecalRoadData(item)
-                                    self.roads.append(road)
-                                    roads_found += 1
-                                except ValueError as e:
-                                    print(f"⚠️  Skipping invalid road on line {line_num}: {e}")
-                        except json.JSONDecodeError:
-                            # Skip invalid JSON lines
-                            continue
+            # Roads already added from another file are counted as duplicates, not found here
+            for road in self.iter_road_file(road_file):
+                if self._add_road(road):
+                    roads_found += 1
         
         except Exception as e:
             print(f"❌ Error reading road file {road_file}: {e}")
@@ -185,23 +231,64 @@ class DecalRoadParser:
         
         return roads_found
     
-    def _parse_materials(self) -> int:
+    def iter_road_file(self, road_file: Path) -> Iterator[DecalRoadData]:
+        """Yield the DecalRoads of one road file as they are read
+        
+        Newline-delimited files are streamed line by line and lines that
+        cannot hold a DecalRoad are skipped without decoding them.
+        """
+        with self.index.source.open_text(road_file) as f:
+            # Handle different JSON formats
+            first_line = ''
+            line_num = 0
+            for line_num, first_line in enumerate(f, 1):
+                if first_line.strip():
+                    break
+            
+            if first_line.lstrip().startswith('['):
+                # JSON array format
+                yield from self._roads_from_items(json.loads(first_line + f.read()))
+                return
+            
+            # Line-by-line JSON format
+            yield from self._roads_from_lines(itertools.chain([first_line], f), line_num)
+    
+    def _roads_from_items(self, data: List[Any]) -> Iterator[DecalRoadData]:
+        for item in data:
+            if self._is_decal_road(item):
+                try:
+                    yield DecalRoadData(item)
+                except ValueError as e:
+                    print(f"⚠️  Skipping invalid road: {e}")
+    
+    def _roads_from_lines(self, lines: Iterable[str], first_line_num: int) -> Iterator[DecalRoadData]:
+        for line_num, line in enumerate(lines, first_line_num):
+            try:
+                item = decode_road_line(line)
+                if item is not None and self._is_decal_road(item):
+                    try:
+                        yield DecalRoadData(item)
+                    except ValueError as e:
+                        print(f"⚠️  Skipping invalid road on line {line_num}: {e}")
+            except json.JSONDecodeError:
+                # Skip invalid JSON lines
+                continue
+    
+    def iter_roads(self) -> Iterator[DecalRoadData]:
+        """Yield every DecalRoad of the level lazily, file by file (no deduplication)"""
+        for road_file in self.index.road_files():
+            yield from self.iter_road_file(road_file)
+    
+    def parse_materials(self) -> int:
         """Parse material definitions from level files"""
         materials_count = 0
         
-        # Look for material files
-        material_patterns = [
-            "art/road/*.materials.json",
-            "art/**/*.materials.json", 
-            "**/*.materials.json"
-        ]
-        
-        for pattern in material_patterns:
-            for material_file in self.level_path.glob(pattern):
-                try:
-                    materials_count += self._parse_material_file(material_file)
-                except Exception as e:
-                    print(f"❌ Error parsing material file {material_file}: {e}")
+        # Every *.materials.json in the level, each parsed once
+        for material_file in self.index.files('materials'):
+            try:
+                materials_count += self._parse_material_file(material_file)
+            except Exception as e:
+                print(f"❌ Error parsing material file {material_file}: {e}")
         
         return materials_count
     
@@ -212,7 +299,7 @@ class DecalRoadParser:
         print(f"📁 Parsing material file: {material_file.relative_to(self.level_path)}")
         
         try:
-            with open(material_file, 'r', encoding='utf-8') as f:
+            with self.index.source.open_text(material_file) as f:
                 data = json.load(f)
                 
                 if isinstance(data, dict):
@@ -241,25 +328,24 @@ class DecalRoadParser:
                 'nodes' in item and
                 len(item.get('nodes', [])) >= 2)
     
-    def _deduplicate_roads(self) -> None:
-        """Remove duplicate roads based on persistent ID"""
-        unique_roads = []
-        seen_ids = set()
-        
-        for road in self.roads:
-            if road.persistent_id not in seen_ids:
-                unique_roads.append(road)
-                seen_ids.add(road.persistent_id)
-        
-        self.roads = unique_roads
+    def _add_road(self, road: DecalRoadData) -> bool:
+        """Add a road and index it; False if a road with its persistent ID was already added"""
+        if road.persistent_id in self.roads_by_id:
+            self.duplicate_count += 1
+            return False
+        
+        self.roads.append(road)
+        self.roads_by_id[road.persistent_id] = road
+        self.roads_by_material.setdefault(road.material, []).append(road)
+        return True
     
     def _validate_road_materials(self) -> None:
         """Validate that all road materials exist"""
         missing_materials = set()
         
-        for road in self.roads:
-            if road.material not in self.materials:
-                missing_materials.add(road.material)
+        for material_name in self.roads_by_material:
+            if material_name not in self.materials:
+                missing_materials.add(material_name)
         
         if missing_materials:
             print(f"⚠️  Warning: {len(missing_materials)} road materials not found:")
@@ -268,14 +354,11 @@ class DecalRoadParser:
     
     def get_road_by_id(self, persistent_id: str) -> Optional[DecalRoadData]:
         """Get a road by its persistent ID"""
-        for road in self.roads:
-            if road.persistent_id == persistent_id:
-                return road
-        return None
+        return self.roads_by_id.get(persistent_id)
     
     def get_roads_by_material(self, material_name: str) -> List[DecalRoadData]:
         """Get all roads using a specific material"""
-        return [road for road in self.roads if road.material == material_name]
+        return list(self.roads_by_material.get(material_name, []))
     
     def get_material(self, material_name: str) -> Optional[MaterialData]:
         """Get material data by name"""
@@ -283,7 +366,7 @@ class DecalRoadParser:
     
     def get_unique_materials(self) -> List[str]:
         """Get list of unique material names used by roads"""
-        return list(set(road.material for road in self.roads))
+        return list(self.roads_by_material)
     
     def get_roads_data(self) -> List[DecalRoadData]:
         """Get all parsed road data"""
@@ -295,8 +378,7 @@ class DecalRoadParser:
         material_usage = {}
         
         for material in unique_materials:
-            roads_using = len(self.get_roads_by_material(material))
-            material_usage[material] = roads_using
+            material_usage[material] = len(self.roads_by_material[material])
         
         return {
             'total_roads': len(self.roads),
@@ -0,0 +1,178 @@
+"""
+BeamNG Level Index
+Classifies every file of a level directory (or level zip) by role in a single
+walk, so import stages query one index instead of running their own recursive globs
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .vfs import LevelSource, DirectorySource, ZipSource, open_level
+
+
+INDEX_VERSION = 2
+TEXTURE_EXTENSIONS = ('.png', '.dds', '.jpg', '.jpeg', '.tga', '.exr')
+LEVEL_MARKERS = ('info.json', 'mainlevel.lua')
+# Textures Blender loads from a level zip are extracted here, under the cache directory
+ZIP_EXTRACT_DIR = 'zip_extract'
+
+# Roles reported by LevelIndex.files()
+ROLES = (
+    'level_info',   # info.json / mainLevel.lua
+    'terrain',      # *.ter
+    'terrain_config',  # *.terrain.json
+    'presets',      # *terrainPreset.json
+    'materials',    # *.materials.json
+    'road_items',   # roads/items.level.json and *roads*.json
+    'prefabs',      # *.prefab / *.prefab.json
+    'forest',       # *.forest4.json / *.forest.json
+    'textures',     # image files
+)
+
+
+def classify(name: str, parent: str) -> Optional[str]:
+    """Return the role of a file from its name and parent directory name, or None"""
+    lower = name.lower()
+    if lower in LEVEL_MARKERS:
+        return 'level_info'
+    if lower.endswith('.ter'):
+        return 'terrain'
+    if lower.endswith('.terrain.json'):
+        return 'terrain_config'
+    if lower.endswith('terrainpreset.json'):
+        return 'presets'
+    if lower.endswith('.materials.json'):
+        return 'materials'
+    if (lower == 'items.level.json' and parent.lower() == 'roads') or \
+            ('roads' in name and lower.endswith('.json')):
+        return 'road_items'
+    if lower.endswith(('.prefab', '.prefab.json')):
+        return 'prefabs'
+    if lower.endswith(('.forest4.json', '.forest.json')):
+        return 'forest'
+    if lower.endswith(TEXTURE_EXTENSIONS):
+        return 'textures'
+    return None
+
+
+class LevelIndex:
+    """Role -> relative file paths for one level source, plus the directory mtimes it was built from"""
+
+    # Indexes already loaded in this session, keyed by resolved level directory or zip path
+    _memo: Dict[str, 'LevelIndex'] = {}
+
+    def __init__(self, source: LevelSource, files: Dict[str, List[str]], directories: Dict[str, int]):
+        self.source = source
+        self.root = source.root
+        self._files = files
+        self.directories = directories
+
+    @classmethod
+    def build(cls, source: Union[LevelSource, str, Path]) -> 'LevelIndex':
+        """Walk the level once (os.scandir, or the zip central directory) and classify every file"""
+        if not isinstance(source, (DirectorySource, ZipSource)):
+            source = open_level(source)
+        files = {role: [] for role in ROLES}
+        scanned, directories = source.scan()
+        for path, parent in scanned:
+            role = classify(path.rpartition('/')[2], parent)
+            if role:
+                files[role].append(path)
+
+        for paths in files.values():
+            paths.sort()
+        return cls(source, files, directories)
+
+    @classmethod
+    def load(cls, root: Union[LevelSource, str, Path], cache_dir: Union[str, Path, None] = None) -> 'LevelIndex':
+        """Return an up-to-date index, reusing the session memo or the persisted copy when unchanged
+
+        Only the directories are stat'ed to validate a cached index; any added,
+        removed or renamed file changes its directory mtime and triggers a rebuild.
+        Zipped levels are validated by the zip's own mtime.
+        """
+        if isinstance(root, (DirectorySource, ZipSource)):
+            source, key = root, str(root.path)
+        else:
+            source, key = None, str(Path(root).resolve())
+
+        index = cls._memo.get(key)
+        if index is None:
+            extract_dir = Path(cache_dir) / ZIP_EXTRACT_DIR if cache_dir is not None else None
+            source = source or open_level(key, extract_dir=extract_dir)
+            if cache_dir is not None:
+                index = cls.read(cls.cache_path(Path(key), cache_dir), source)
+
+        if index is None or not index.is_current():
+            index = cls.build(source or index.source)
+            print(f"🗂️  Indexed level: {index.summary()}")
+            if cache_dir is not None:
+                index.save(cls.cache_path(Path(key), cache_dir))
+
+        cls._memo[key] = index
+        return index
+
+    @staticmethod
+    def cache_path(root: Path, cache_dir: Union[str, Path]) -> Path:
+        digest = hashlib.blake2b(str(root).encode('utf-8'), digest_size=8).hexdigest()
+        return Path(cache_dir) / f"level_index_{root.name}_{digest}.json"
+
+    @classmethod
+    def read(cls, path: Path, source: LevelSource) -> Optional['LevelIndex']:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != INDEX_VERSION or data.get('root') != str(source.root):
+            return None
+        return cls(source, data['files'], data['directories'])
+
+    def save(self, path: Path) -> bool:
+        """Persist the index; returns False if the cache directory is not writable"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'root': str(self.root),
+                    'directories': self.directories,
+                    'files': self._files,
+                }, f)
+        except OSError:
+            return False
+        return True
+
+    def is_current(self) -> bool:
+        """True if no directory of the level changed since the index was built"""
+        return self.source.is_current(self.directories)
+
+    def files(self, role: str, top_level: bool = False) -> List[Path]:
+        """Absolute paths of every file with the given role, optionally only those directly in the level root"""
+        paths = self._files.get(role, [])
+        if top_level:
+            paths = [path for path in paths if '/' not in path]
+        return [self.root / path for path in paths]
+
+    def first(self, role: str, top_level: bool = False) -> Optional[Path]:
+        paths = self.files(role, top_level)
+        return paths[0] if paths else None
+
+    def road_files(self) -> List[Path]:
+        """Road item files, MissionGroup roads/items.level.json first like the old glob order"""
+        def priority(path: str):
+            parts = path.split('/')
+            is_items = parts[-1].lower() == 'items.level.json'
+            in_mission = parts[0].lower() == 'main' and len(parts) > 1 and parts[1].lower() == 'missiongroup'
+            return (not is_items, not in_mission, len(parts), path)
+        return [self.root / path for path in sorted(self._files.get('road_items', []), key=priority)]
+
+    def is_level(self) -> bool:
+        """A BeamNG level has an info.json / mainLevel.lua or a .ter in its root"""
+        return bool(self.files('level_info', top_level=True) or self.files('terrain', top_level=True))
+
+    def summary(self) -> str:
+        counts = ', '.join(f"{len(paths)} {role}" for role, paths in self._files.items() if paths)
+        return f"{self.root.name} ({len(self.directories)} directories: {counts or 'no level files'})"
@@ -0,0 +1,114 @@
+"""
+BeamNG Terrain Preset Parser
+Reads *terrainPreset.json once and exposes height scale, position, square size,
+source maps and material layers; instances are memoised by path and mtime
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+DEFAULT_HEIGHT_SCALE = 200.0
+DEFAULT_SQUARE_SIZE = 1.0
+
+# Opacity maps are exported as <level>_layerMap_<index>_<material>.png
+OPACITY_MAP_PATTERN = re.compile(r'layerMap_(\d+)_(.+)\.[^.]+$', re.IGNORECASE)
+
+
+class TerrainPreset:
+    """Parsed terrain preset for one level"""
+
+    # Loaded presets, keyed by resolved path -> (mtime_ns, preset)
+    _memo: Dict[str, Tuple[int, 'TerrainPreset']] = {}
+
+    def __init__(self, path: Union[str, Path], data: Dict[str, Any], source=None):
+        self.path = Path(path)
+        self.level_directory = self.path.parent
+        self.data = data
+        self.source = source
+
+        self.height_scale = float(data.get('heightScale', DEFAULT_HEIGHT_SCALE))
+        self.square_size = float(data.get('squareSize', DEFAULT_SQUARE_SIZE))
+        self.position = self._parse_position(data.get('pos'))
+        self.height_map_path = data.get('heightMapPath')
+        self.hole_map_path = data.get('holeMapPath')
+        self.opacity_maps: List[str] = list(data.get('opacityMaps', []))
+        self.material_layers = self._parse_material_layers(self.opacity_maps)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], source=None) -> 'TerrainPreset':
+        """Load a preset, reusing the parsed copy while the file's mtime is unchanged
+
+        source is an optional level source (see parsers.vfs) for presets inside a level zip.
+        Raises OSError if the file cannot be read and ValueError if it is not valid JSON.
+        """
+        if source is None:
+            path = Path(path).resolve()
+            mtime_ns = path.stat().st_mtime_ns
+        else:
+            path = Path(path)
+            mtime_ns = source.mtime_ns(path)
+        cached = cls._memo.get(str(path))
+        if cached and cached[0] == mtime_ns:
+            if source is not None:
+                cached[1].source = source
+            return cached[1]
+
+        if source is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            data = source.read_json(path)
+        if not isinstance(data, dict):
+            raise ValueError(f"Terrain preset is not a JSON object: {path}")
+
+        preset = cls(path, data, source)
+        cls._memo[str(path)] = (mtime_ns, preset)
+        return preset
+
+    @staticmethod
+    def _parse_position(pos: Any) -> Optional[Dict[str, float]]:
+        if isinstance(pos, dict) and pos:
+            return {axis: float(pos.get(axis, 0)) for axis in ('x', 'y', 'z')}
+        if isinstance(pos, (list, tuple)) and len(pos) >= 3:
+            return {'x': float(pos[0]), 'y': float(pos[1]), 'z': float(pos[2])}
+        return None
+
+    @staticmethod
+    def _parse_material_layers(opacity_maps: List[str]) -> List[Dict[str, Any]]:
+        """Material layer definitions (index, material, opacity map) from the opacity map names"""
+        layers = []
+        for opacity_map in opacity_maps:
+            match = OPACITY_MAP_PATTERN.search(opacity_map)
+            if match:
+                layers.append({
+                    'index': int(match.group(1)),
+                    'material': match.group(2),
+                    'opacity_map': opacity_map,
+                })
+        layers.sort(key=lambda layer: layer['index'])
+        return layers
+
+    def resolve(self, game_path: Optional[str]) -> Optional[Path]:
+        """Map a game path such as /levels/<name>/art/x.png to a file in the level directory"""
+        if not game_path:
+            return None
+        parts = Path(game_path.replace('\\', '/')).parts
+        lowered = [part.lower() for part in parts]
+        if 'levels' in lowered:
+            start = lowered.index('levels') + 2  # skip "levels/<level name>"
+            parts = parts[start:]
+        else:
+            parts = [part for part in parts if part not in ('/', '\\')]
+        return self.level_directory.joinpath(*parts) if parts else None
+
+    def exists(self, path: Path) -> bool:
+        """Whether a level path exists, looked up through the level source for zipped levels"""
+        return self.source.exists(path) if self.source is not None else path.is_file()
+
+    def opacity_map_files(self) -> List[Path]:
+        """Level paths of the opacity maps that exist in the level (members of the zip for zipped levels)"""
+        files = [self.resolve(opacity_map) for opacity_map in self.opacity_maps]
+        return [path for path in files if path is not None and self.exists(path)]
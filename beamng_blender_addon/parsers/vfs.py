@@ -0,0 +1,231 @@
+"""
+BeamNG Level Sources
+A small virtual filesystem under the parsers: a level is either a directory
+or a level zip read straight from its central directory, without extraction
+"""
+
+import io
+import json
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Dict, List, Optional, TextIO, Tuple, Union
+
+from ..formats.ter import TerrainFile
+
+
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+LEVEL_MARKERS = ('info.json', 'mainlevel.lua')
+
+PathLike = Union[str, Path]
+
+
+class DirectorySource:
+    """A level unpacked on disk"""
+
+    def __init__(self, directory: PathLike):
+        self.path = Path(directory).resolve()
+        self.root = self.path
+
+    def scan(self) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+        """Walk the level once with os.scandir
+
+        Returns ([(relative path, parent directory name)], {relative directory: mtime_ns}).
+        """
+        files = []
+        directories = {}
+        pending = ['']
+        while pending:
+            relative = pending.pop()
+            directory = self.root / relative if relative else self.root
+            try:
+                directories[relative] = directory.stat().st_mtime_ns
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+
+            for entry in entries:
+                path = f"{relative}/{entry.name}" if relative else entry.name
+                if entry.is_dir():
+                    pending.append(path)
+                else:
+                    files.append((path, directory.name))
+        return files, directories
+
+    def is_current(self, directories: Dict[str, int]) -> bool:
+        """True if no directory changed since scan(); file edits do not change directory mtimes"""
+        for relative, mtime_ns in directories.items():
+            try:
+                if (self.root / relative).stat().st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def exists(self, path: PathLike) -> bool:
+        return Path(path).is_file()
+
+    def open(self, path: PathLike) -> BinaryIO:
+        return open(path, 'rb')
+
+    def open_text(self, path: PathLike) -> TextIO:
+        return open(path, 'r', encoding='utf-8')
+
+    def read_json(self, path: PathLike) -> Any:
+        with self.open_text(path) as f:
+            return json.load(f)
+
+    def mtime_ns(self, path: PathLike) -> int:
+        return os.stat(path).st_mtime_ns
+
+    def fingerprint(self, path: PathLike) -> Optional[str]:
+        """A cheap content identity for caching, or None to let the caller hash the file itself"""
+        return None
+
+    def local_path(self, path: PathLike) -> Path:
+        """A real file Blender can load"""
+        return Path(path)
+
+    def terrain_file(self, ter_file: PathLike, json_file: Optional[PathLike] = None) -> TerrainFile:
+        return TerrainFile(ter_file, json_file)
+
+
+class ZipSource:
+    """A level read from a zip without extracting it
+
+    Only the central directory is read up front. Stored members are memory
+    mapped in place, deflated ones are decompressed in streaming chunks, and
+    files Blender must load from disk are extracted one by one on demand.
+    """
+
+    def __init__(self, zip_path: PathLike, level: Optional[str] = None, extract_dir: Optional[PathLike] = None):
+        self.path = Path(zip_path).resolve()
+        self.zip = zipfile.ZipFile(self.path)
+        self.prefix = self._find_prefix(level)
+        self.root = self.path / self.prefix if self.prefix else self.path
+        self.extract_dir = Path(extract_dir) if extract_dir else Path(tempfile.gettempdir()) / "beamng_zip_cache"
+
+        self.members: Dict[str, zipfile.ZipInfo] = {}
+        for info in self.zip.infolist():
+            if not info.is_dir() and info.filename.startswith(self.prefix):
+                self.members[info.filename[len(self.prefix):]] = info
+
+    def _find_prefix(self, level: Optional[str]) -> str:
+        """Directory inside the zip holding the level, e.g. levels/<name>/"""
+        if level:
+            return f"levels/{level}/"
+        candidates = []
+        for name in self.zip.namelist():
+            member = PurePosixPath(name)
+            if member.name.lower() in LEVEL_MARKERS or member.suffix.lower() == '.ter':
+                candidates.append(member.parent)
+        if not candidates:
+            return ""
+        parent = min(candidates, key=lambda candidate: (len(candidate.parts), str(candidate)))
+        return "" if str(parent) == '.' else f"{parent}/"
+
+    def relative(self, path: PathLike) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            path = path.relative_to(self.root)
+        return path.as_posix()
+
+    def info(self, path: PathLike) -> zipfile.ZipInfo:
+        try:
+            return self.members[self.relative(path)]
+        except KeyError:
+            raise FileNotFoundError(f"{path} is not in {self.path.name}") from None
+
+    def scan(self) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+        files = [(name, PurePosixPath(name).parent.name or self.root.name) for name in sorted(self.members)]
+        return files, {'': self.path.stat().st_mtime_ns}
+
+    def is_current(self, directories: Dict[str, int]) -> bool:
+        try:
+            return self.path.stat().st_mtime_ns == directories.get('')
+        except OSError:
+            return False
+
+    def exists(self, path: PathLike) -> bool:
+        try:
+            return self.relative(path) in self.members
+        except ValueError:
+            return False
+
+    def open(self, path: PathLike) -> BinaryIO:
+        """Stream a member; deflated data is decompressed chunk by chunk as it is read"""
+        return self.zip.open(self.info(path))
+
+    def open_text(self, path: PathLike) -> TextIO:
+        return io.TextIOWrapper(self.open(path), encoding='utf-8')
+
+    def read_json(self, path: PathLike) -> Any:
+        with self.open_text(path) as f:
+            return json.load(f)
+
+    def mtime_ns(self, path: PathLike) -> int:
+        self.info(path)
+        return self.path.stat().st_mtime_ns
+
+    def fingerprint(self, path: PathLike) -> Optional[str]:
+        """Size and CRC from the central directory - identifies the content without reading it"""
+        info = self.info(path)
+        return f"zip:{info.file_size}:{info.CRC:08x}"
+
+    def member_range(self, path: PathLike) -> Optional[Tuple[Path, int, int]]:
+        """(zip path, data offset, size) of a stored member, or None if it is compressed"""
+        info = self.info(path)
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(info.header_offset)
+            header = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+        name_length, extra_length = header[9], header[10]
+        return self.path, info.header_offset + LOCAL_HEADER.size + name_length + extra_length, info.file_size
+
+    def local_path(self, path: PathLike) -> Path:
+        """Extract a single member (streaming, cached by CRC) so Blender can load it"""
+        info = self.info(path)
+        target = self.extract_dir / f"{self.path.stem}_{info.CRC:08x}_{PurePosixPath(info.filename).name}"
+        if target.exists() and target.stat().st_size == info.file_size:
+            return target
+
+        self.extract_dir.mkdir(parents=True, exist_ok=True)
+        pending = target.with_name(target.name + '.part')
+        with self.zip.open(info) as src, open(pending, 'wb') as dst:
+            shutil.copyfileobj(src, dst, EXTRACT_CHUNK_SIZE)
+        os.replace(pending, target)
+        return target
+
+    def terrain_file(self, ter_file: PathLike, json_file: Optional[PathLike] = None) -> TerrainFile:
+        """Open a .ter in place when it is stored, otherwise from a streamed extraction"""
+        if json_file is None:
+            sibling = Path(ter_file).with_suffix('.terrain.json')
+            json_file = sibling if self.exists(sibling) else None
+        config = self.read_json(json_file) if json_file else {}
+
+        member = self.member_range(ter_file)
+        if member:
+            container, offset, length = member
+            return TerrainFile(container, offset=offset, length=length, config=config)
+        return TerrainFile(self.local_path(ter_file), config=config)
+
+    def close(self) -> None:
+        self.zip.close()
+
+
+LevelSource = Union[DirectorySource, ZipSource]
+
+
+def open_level(path: PathLike, extract_dir: Optional[PathLike] = None) -> LevelSource:
+    """Open a level directory or level zip"""
+    path = Path(path)
+    if path.is_dir():
+        return DirectorySource(path)
+    if path.is_file() and zipfile.is_zipfile(path):
+        return ZipSource(path, extract_dir=extract_dir)
+    raise FileNotFoundError(f"Not a level directory or zip: {path}")
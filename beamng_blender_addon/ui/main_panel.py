@@ -33,6 +33,8 @@ class BeamNGMainPanel(Panel):
         
         row = box.row()
         row.operator("import_scene.beamng_level", text="Import BeamNG Level", icon='FILEBROWSER')
+        row = box.row()
+        row.operator("import_scene.beamng_level_modal", text="Import in Background", icon='SORTTIME')
         
         # Quick info about imports
         col = box.column(align=True)
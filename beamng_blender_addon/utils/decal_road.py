@@ -628,3 +628,41 @@ def decal_road_node_group():
     return group
 
 
+
+
+#initialize beamng_decalroadnetwork node group
+#BeamNG_DecalRoad with per-spline inputs, evaluated once for a whole road network object
+def decal_road_network_node_group():
+    base = bpy.data.node_groups.get("BeamNG_DecalRoad") or decal_road_node_group()
+    group = base.copy()
+    group.name = "BeamNG_DecalRoadNetwork"
+    nodes = group.nodes
+
+    #Spline Length instead of Curve Length, which sums all splines
+    curve_length = nodes["Curve Length"]
+    spline_length = nodes.new("GeometryNodeSplineLength")
+    spline_length.name = "Spline Length"
+    spline_length.location = curve_length.location
+    group.links.new(spline_length.outputs[0], nodes["Store Named Attribute.002"].inputs[3])
+    nodes.remove(curve_length)
+
+    #Texture length from the per-spline attribute
+    group_input_004 = nodes["Group Input.004"]
+    texture_length = nodes.new("GeometryNodeInputNamedAttribute")
+    texture_length.name = "Texture Length"
+    texture_length.data_type = 'FLOAT'
+    texture_length.inputs[0].default_value = "texture_length"
+    texture_length.location = group_input_004.location
+    group.links.new(texture_length.outputs[0], nodes["Math.001"].inputs[1])
+    nodes.remove(group_input_004)
+
+    #Materials come from material_index, which Curve to Mesh carries over to the faces
+    group.links.new(nodes["Join Geometry.001"].outputs[0], nodes["Group Output.001"].inputs[0])
+    nodes.remove(nodes["Set Material"])
+    nodes.remove(nodes["Group Input.003"])
+
+    for item in list(group.interface.items_tree):
+        if item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.name in ("Material", "Texture Length"):
+            group.interface.remove(item)
+
+    return group
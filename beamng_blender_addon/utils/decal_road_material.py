@@ -1,33 +1,46 @@
 import bpy
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 
 # mat = bpy.data.materials.new(name = "tread_marks_damaged_02")
 # mat.use_nodes = True
 
-def load_or_create_texture(image_path: str, level_path: Path) -> Optional[bpy.types.Image]:
-    """Load or create a texture image from BeamNG path"""
+# BeamNG material stage texture keys -> image nodes of the DecalRoad material
+TEXTURE_MAPPINGS = {
+    'ambientOcclusionMap': 'Image Texture',      # AO
+    'baseColorMap': 'Image Texture.001',         # Color/Diffuse
+    'normalMap': 'Image Texture.002',            # Normal
+    'opacityMap': 'Image Texture.003',           # Opacity
+    'roughnessMap': 'Image Texture.004',         # Roughness
+    'detailNormalMap': 'Image Texture.005'       # Detail Normal
+}
+
+def beamng_texture_path(image_path: str, level_path: Path) -> Optional[Path]:
+    """Convert a BeamNG texture path to a path in the level"""
     if not image_path:
         return None
     
-    # Convert BeamNG path to filesystem path
     # BeamNG paths start with /levels/levelname/... 
     if image_path.startswith('/levels/'):
         parts = image_path.split('/')
         if len(parts) >= 3:
             # Remove /levels/levelname and use remaining path
             relative_path = '/'.join(parts[3:])
-            full_path = level_path / relative_path
-        else:
-            return None
-    else:
-        # Relative path
-        full_path = level_path / image_path.lstrip('/')
+            return level_path / relative_path
+        return None
     
-    # Check if image already loaded
-    image_name = full_path.name
-    if image_name in bpy.data.images:
-        return bpy.data.images[image_name]
+    # Relative path
+    return level_path / image_path.lstrip('/')
+
+def resolve_texture_file(image_path: str, level_path: Path, level_source=None) -> Optional[Path]:
+    """Find the file behind a BeamNG texture path, trying the usual extensions
+
+    Returns a local file Blender can load (zipped textures are extracted), or
+    None. Uses no bpy, so it can run on an import pipeline worker.
+    """
+    full_path = beamng_texture_path(image_path, level_path)
+    if full_path is None:
+        return None
     
     # List of extensions to try in order of preference
     # BeamNG commonly uses DDS, PNG, JPG, TGA formats
@@ -46,33 +59,82 @@ def load_or_create_texture(image_path: str, level_path: Path) -> Optional[bpy.ty
         if ext and ext not in unique_extensions:
             unique_extensions.append(ext)
     
-    # Try loading with different extensions
     for extension in unique_extensions:
         try_path = full_path.with_suffix(extension)
-        
-        if try_path.exists():
-            try:
-                image = bpy.data.images.load(str(try_path))
-                print(f"✅ Loaded texture: {try_path.name} (tried extension: {extension})")
-                return image
-            except Exception as e:
-                print(f"❌ Failed to load texture {try_path}: {e}")
-                continue
+        if file_exists(try_path, level_source):
+            return local_file(try_path, level_source)
     
     # If no extensions worked, try without extension (for extensionless files)
     no_ext_path = full_path.with_suffix('')
-    if no_ext_path.exists():
-        try:
-            image = bpy.data.images.load(str(no_ext_path))
-            print(f"✅ Loaded texture: {no_ext_path.name} (no extension)")
-            return image
-        except Exception as e:
-            print(f"❌ Failed to load texture {no_ext_path}: {e}")
+    if file_exists(no_ext_path, level_source):
+        return local_file(no_ext_path, level_source)
+    return None
+
+def resolve_material_textures(materials: Iterable[Dict[str, Any]], level_path: Path, level_source=None) -> Dict[str, Optional[Path]]:
+    """Resolve every texture referenced by the given materials: BeamNG path -> local file or None"""
+    resolved = {}
+    for material_data in materials:
+        primary_stage = get_primary_stage(material_data)
+        if not primary_stage:
+            continue
+        for beamng_key in TEXTURE_MAPPINGS:
+            texture_path = primary_stage.get(beamng_key)
+            if texture_path and texture_path not in resolved:
+                resolved[texture_path] = resolve_texture_file(texture_path, level_path, level_source)
+    return resolved
+
+def load_or_create_texture(image_path: str, level_path: Path, level_source=None,
+                           resolved_files: Optional[Dict[str, Optional[Path]]] = None, names=None) -> Optional[bpy.types.Image]:
+    """Load or create a texture image from BeamNG path
+
+    level_source is an optional parsers.vfs level source; textures inside a
+    level zip are extracted individually when they are first loaded.
+    resolved_files holds lookups already done by resolve_material_textures.
+    names is the import's utils.names.DatablockNames, told about loaded images.
+    """
+    full_path = beamng_texture_path(image_path, level_path)
+    if full_path is None:
+        return None
+    
+    # Check if image already loaded
+    image_name = full_path.name
+    if image_name in bpy.data.images:
+        return bpy.data.images[image_name]
+    
+    if resolved_files is not None and image_path in resolved_files:
+        texture_file = resolved_files[image_path]
+    else:
+        texture_file = resolve_texture_file(image_path, level_path, level_source)
+    
+    if texture_file is None:
+        print(f"⚠️  Texture not found with any extension: {full_path.stem}")
+        return None
     
-    print(f"⚠️  Texture not found with any extension: {full_path.stem}")
+    try:
+        image = bpy.data.images.load(str(texture_file))
+        if names is not None:
+            names['images'].claim(image.name)
+        print(f"✅ Loaded texture: {texture_file.name}")
+        return image
+    except Exception as e:
+        print(f"❌ Failed to load texture {texture_file}: {e}")
+        return None
+
+def file_exists(path: Path, level_source=None) -> bool:
+    return level_source.exists(path) if level_source is not None else path.exists()
+
+def local_file(path: Path, level_source=None) -> Path:
+    return level_source.local_path(path) if level_source is not None else path
+
+def get_primary_stage(material_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The first non-null stage of a material"""
+    for stage in material_data.get('stages', []):
+        if stage and any(v is not None for v in stage.values()):
+            return stage
     return None
 
-def create_beamng_decal_road_material(material_name: str, material_data: Optional[Dict[str, Any]] = None, level_path: Optional[Path] = None) -> bpy.types.Material:
+def create_beamng_decal_road_material(material_name: str, material_data: Optional[Dict[str, Any]] = None, level_path: Optional[Path] = None, level_source=None,
+                                      resolved_files: Optional[Dict[str, Optional[Path]]] = None, names=None) -> bpy.types.Material:
     """Create a BeamNG decal road material from material data"""
     
     # Create or get existing material
@@ -81,7 +143,7 @@ def create_beamng_decal_road_material(material_name: str, material_data: Optiona
         # Clear existing nodes to rebuild
         mat.node_tree.nodes.clear()
     else:
-        mat = bpy.data.materials.new(name=material_name)
+        mat = names.new('materials', material_name) if names is not None else bpy.data.materials.new(name=material_name)
         mat.use_nodes = True
         mat.node_tree.nodes.clear()
     
@@ -90,21 +152,16 @@ def create_beamng_decal_road_material(material_name: str, material_data: Optiona
     
     # If we have material data, configure the material accordingly
     if material_data and level_path:
-        configure_material_from_beamng_data(mat, material_data, level_path)
+        configure_material_from_beamng_data(mat, material_data, level_path, level_source, resolved_files, names)
     
     return mat
 
-def configure_material_from_beamng_data(mat: bpy.types.Material, material_data: Dict[str, Any], level_path: Path):
+def configure_material_from_beamng_data(mat: bpy.types.Material, material_data: Dict[str, Any], level_path: Path, level_source=None,
+                                        resolved_files: Optional[Dict[str, Optional[Path]]] = None, names=None):
     """Configure material nodes based on BeamNG material data"""
     
     # Get the primary stage (first non-null stage)
-    primary_stage = None
-    stages = material_data.get('stages', [])
-    
-    for stage in stages:
-        if stage and any(v is not None for v in stage.values()):
-            primary_stage = stage
-            break
+    primary_stage = get_primary_stage(material_data)
     
     if not primary_stage:
         print(f"⚠️  No valid material stage found for {mat.name}")
@@ -143,19 +200,10 @@ def configure_material_from_beamng_data(mat: bpy.types.Material, material_data:
         detail_scale_node.inputs[1].default_value = (*detail_scale, 0.0)
     
     # Load textures
-    texture_mappings = {
-        'ambientOcclusionMap': 'Image Texture',      # AO
-        'baseColorMap': 'Image Texture.001',         # Color/Diffuse
-        'normalMap': 'Image Texture.002',            # Normal
-        'opacityMap': 'Image Texture.003',           # Opacity
-        'roughnessMap': 'Image Texture.004',         # Roughness
-        'detailNormalMap': 'Image Texture.005'       # Detail Normal
-    }
-    
-    for beamng_key, node_name in texture_mappings.items():
+    for beamng_key, node_name in TEXTURE_MAPPINGS.items():
         texture_path = primary_stage.get(beamng_key)
         if texture_path and node_name in nodes:
-            image = load_or_create_texture(texture_path, level_path)
+            image = load_or_create_texture(texture_path, level_path, level_source, resolved_files, names)
             if image:
                 nodes[node_name].image = image
     
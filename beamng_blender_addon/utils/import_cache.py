@@ -0,0 +1,210 @@
+"""
+Import cache for BeamNG Blender addon
+Keeps decoded terrain textures, arrays and metadata on disk so an unchanged
+level re-imports without parsing or converting anything
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from ..formats.stats import terrain_stats
+
+
+CACHE_FORMAT_VERSION = 1
+META_FILE = "meta.json"
+SAMPLE_BLOCK_SIZE = 64 * 1024
+SAMPLE_BLOCK_COUNT = 64
+
+# Texture files kept per terrain entry, in the order the importer uses them
+CACHED_TEXTURE_ROLES = ("displacement", "layermap", "holes")
+
+# Blender image name of each cached texture role
+TERRAIN_IMAGE_NAMES = {
+    'displacement': "BeamNG_Terrain_Displacement.exr",
+    'layermap': "BeamNG_Terrain_Layermap",
+    'holes': "BeamNG_Terrain_Holes.png",
+}
+
+
+def fast_file_hash(path: Union[str, Path], hasher) -> None:
+    """Feed size, mtime and evenly spaced sample blocks of a file into hasher
+
+    Small files are hashed completely; large ones are sampled so the cost
+    stays constant regardless of the terrain size.
+    """
+    stat = os.stat(path)
+    hasher.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, 'rb') as f:
+        if stat.st_size <= SAMPLE_BLOCK_SIZE * SAMPLE_BLOCK_COUNT:
+            hasher.update(f.read())
+            return
+        stride = (stat.st_size - SAMPLE_BLOCK_SIZE) // (SAMPLE_BLOCK_COUNT - 1)
+        for index in range(SAMPLE_BLOCK_COUNT):
+            f.seek(index * stride)
+            hasher.update(f.read(SAMPLE_BLOCK_SIZE))
+
+
+def terrain_entry_metadata(terrain_data: Dict[str, Any], images: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    """meta.json of a terrain entry, shared by the importer and the batch converter
+
+    images maps a texture role to {'file': file name in the entry, 'name': Blender image name}.
+    """
+    return {
+        'ter_file': str(terrain_data['ter_file']),
+        'json_file': str(terrain_data['json_file']) if terrain_data['json_file'] else None,
+        'header': terrain_data['header'],
+        'config': terrain_data['config'],
+        'materials': list(terrain_data['materials']),
+        'material_names': list(terrain_data['material_names']),
+        'height_scale': terrain_data['height_scale'],
+        'terrain_position': terrain_data['terrain_position'],
+        'preset_file': str(terrain_data['preset'].path) if terrain_data.get('preset') else None,
+        'stats': terrain_data['stats'],
+        'images': images,
+    }
+
+
+def terrain_key_files(index) -> List[Path]:
+    """The level files a terrain entry depends on: .ter, .terrain.json and, when present, the
+    terrain preset (its heightScale and pos are stored in the entry); empty without a terrain
+
+    Shared by the importer and the batch converter so both compute the same keys.
+    """
+    ter_file = index.first('terrain', top_level=True)
+    json_file = index.first('terrain_config', top_level=True)
+    if not ter_file or not json_file:
+        return []
+    preset_file = index.first('presets', top_level=True)
+    return [ter_file, json_file] + ([preset_file] if preset_file else [])
+
+
+class ImportCache:
+    """Directory of cache entries, one sub-directory per key, evicted least recently used first"""
+
+    def __init__(self, root: Union[str, Path], max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def key_for(self, *paths: Union[str, Path], variant: str = "", source=None) -> str:
+        """Cache key from the content of the source files plus a variant such as the image format
+
+        A level source (see parsers.vfs) may supply a fingerprint instead, e.g.
+        the CRC of a zip member, so zipped files are never read just to be hashed.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"v{CACHE_FORMAT_VERSION}:{variant}".encode())
+        for path in paths:
+            fingerprint = source.fingerprint(path) if source is not None else None
+            if fingerprint is not None:
+                hasher.update(fingerprint.encode())
+            else:
+                fast_file_hash(path, hasher)
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the entry directory for key and mark it as recently used, or None"""
+        entry = self.root / key
+        meta_path = entry / META_FILE
+        if not meta_path.is_file():
+            return None
+        os.utime(meta_path)
+        return entry
+
+    def metadata(self, entry: Path) -> Dict[str, Any]:
+        with open(entry / META_FILE, 'r') as f:
+            return json.load(f)
+
+    def begin(self) -> Path:
+        """Create a scratch directory to assemble a new entry in"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(prefix=".pending-", dir=self.root))
+
+    def commit(self, key: str, pending: Path, metadata: Dict[str, Any]) -> Path:
+        """Publish an assembled entry atomically, then evict old entries over the size budget"""
+        metadata = dict(metadata, created=time.time())
+        with open(pending / META_FILE, 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+        entry = self.root / key
+        if entry.exists():
+            shutil.rmtree(entry, ignore_errors=True)
+        os.replace(pending, entry)
+
+        self.evict(keep=key)
+        return entry
+
+    def abort(self, pending: Path) -> None:
+        shutil.rmtree(pending, ignore_errors=True)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Every complete entry with its size in bytes and last use time"""
+        entries = []
+        if not self.root.is_dir():
+            return entries
+        for item in os.scandir(self.root):
+            meta_path = os.path.join(item.path, META_FILE)
+            if not item.is_dir() or not os.path.isfile(meta_path):
+                continue
+            size = sum(f.stat().st_size for f in os.scandir(item.path) if f.is_file())
+            entries.append({'key': item.name, 'path': Path(item.path), 'bytes': size,
+                            'last_used': os.stat(meta_path).st_mtime})
+        return entries
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove least recently used entries until the cache fits max_bytes; returns bytes freed"""
+        entries = sorted(self.entries(), key=lambda entry: entry['last_used'])
+        total = sum(entry['bytes'] for entry in entries)
+        freed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry['key'] == keep:
+                continue
+            shutil.rmtree(entry['path'], ignore_errors=True)
+            total -= entry['bytes']
+            freed += entry['bytes']
+        return freed
+
+    def clear(self) -> None:
+        for entry in self.entries():
+            shutil.rmtree(entry['path'], ignore_errors=True)
+
+
+def cached_source_terrain_stats(cache: Optional[ImportCache], source, ter_file: Union[str, Path],
+                                heightmap: np.ndarray) -> Dict[str, Any]:
+    """Height statistics of a level's .ter, kept as a small entry in the import cache
+
+    The key is the .ter's level path (the member name inside a level zip)
+    plus the source fingerprint, so each terrain of a zip gets its own entry
+    and editing one member leaves the others valid. Nothing is written next
+    to the level. Without a cache the statistics are computed every time.
+    """
+    if cache is None:
+        return terrain_stats(heightmap)
+
+    key = cache.key_for(ter_file, variant=f"stats:{Path(ter_file).as_posix()}", source=source)
+    entry = cache.get(key)
+    if entry:
+        try:
+            stats = cache.metadata(entry)['stats']
+            stats['shape'] = tuple(stats['shape'])
+            return stats
+        except (OSError, ValueError, KeyError):
+            pass
+
+    stats = terrain_stats(heightmap)
+    pending = cache.begin()
+    try:
+        cache.commit(key, pending, {'stats': stats})
+    except OSError as e:
+        cache.abort(pending)
+        print(f"⚠️  Could not cache terrain statistics: {e}")
+    return stats
@@ -0,0 +1,114 @@
+"""
+Staged import pipeline for BeamNG Blender addon
+The bpy-free part of every import stage (file I/O, JSON parsing, NumPy decoding)
+runs concurrently on worker threads; datablock creation stays on Blender's main
+thread, stage by stage, as soon as each stage's data is ready
+"""
+
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Tuple
+
+
+MAX_WORKERS = 8
+
+
+def _nothing() -> None:
+    return None
+
+
+def run_steps(steps: Generator[float, None, Any]) -> Any:
+    """Run a stage's steps generator to the end and return its result"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def single_step(function: Callable[..., Any], *args: Any) -> Generator[float, None, Any]:
+    """A steps generator for a stage that runs in one go"""
+    return function(*args)
+    yield  # makes this a generator
+
+
+class ImportPipeline:
+    """Named stages: prepare(), submitted to a thread pool, then create(prepared) on the caller's thread
+
+    Threads rather than processes: the prepared data (memory-mapped terrain
+    sections, parsers, level sources) would have to be pickled across process
+    boundaries, while NumPy, zlib and file reads release the GIL anyway.
+
+    create() receives a callable returning the prepared value, which re-raises
+    any worker exception, so each stage keeps its own error handling.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or min(MAX_WORKERS, (os.cpu_count() or 1) + 2),
+            thread_name_prefix="beamng_import",
+        )
+        self.stages: List[Tuple[str, Optional[Future], Callable[[Callable[[], Any]], Any]]] = []
+        self.timings: Dict[str, float] = {}
+        self.discards: Dict[str, Callable[[Any], None]] = {}
+        self.start_time = time.perf_counter()
+
+    def __enter__(self) -> 'ImportPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
+    def add(self, name: str, prepare: Optional[Callable[[], Any]],
+            create: Callable[[Callable[[], Any]], Any],
+            discard: Optional[Callable[[Any], None]] = None) -> Optional[Future]:
+        """Start preparing a stage in the background; create runs later in run()
+
+        prepare may be None for stages that only touch bpy. discard cleans up
+        a prepared result that cancel() leaves unused, e.g. temporary files.
+        """
+        future = self.executor.submit(self._timed, name, prepare) if prepare is not None else None
+        self.stages.append((name, future, create))
+        if discard is not None:
+            self.discards[name] = discard
+        return future
+
+    def _timed(self, name: str, prepare: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return prepare()
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def run(self) -> Iterator[Tuple[str, Any]]:
+        """Create the stages in the order they were added, yielding (name, create result)
+
+        Stop iterating to skip the remaining stages; leaving the with block
+        cancels their pending preparation.
+        """
+        for name, future, create in self.stages:
+            result = create(future.result if future is not None else _nothing)
+            yield name, result
+
+        total = time.perf_counter() - self.start_time
+        prepared = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+        print(f"⏱️  Import pipeline: {total:.2f}s total (prepared in parallel: {prepared or 'nothing'})")
+
+    def cancel(self) -> None:
+        """Stop without waiting: drop stages that have not started and discard running ones when they finish
+
+        discard must tolerate results whose create step already consumed them.
+        """
+        for name, future, _ in self.stages:
+            discard = self.discards.get(name)
+            if future is None or future.cancel() or discard is None:
+                continue
+            future.add_done_callback(
+                lambda done, discard=discard: discard(done.result()) if done.exception() is None else None
+            )
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Cancel stages that have not started and wait for running ones, so no worker outlives the import"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
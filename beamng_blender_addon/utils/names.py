@@ -0,0 +1,83 @@
+"""
+Datablock name allocation for BeamNG Blender addon
+Hands out unique names in O(1) instead of probing bpy.data with a growing
+".001", ".002", ... loop for every new datablock
+"""
+
+from typing import Any, Dict, Iterable, Set
+
+import bpy
+
+
+MAX_NAME_BYTES = 63  # Blender truncates longer ID names
+
+
+def _truncate(name: str, max_bytes: int) -> str:
+    """Cut name to max_bytes of UTF-8 without splitting a character"""
+    return name.encode('utf-8')[:max_bytes].decode('utf-8', 'ignore')
+
+
+class NameAllocator:
+    """Unique names within one bpy.data collection, seeded once from the names it already holds
+
+    Names follow Blender's own scheme: the base name if it is free, else
+    base.001, base.002, ... Each base remembers the next suffix to try, so
+    repeated clashes on the same prefix stay O(1) per name.
+    """
+
+    def __init__(self, existing_names: Iterable[str] = ()):
+        self.used: Set[str] = set(existing_names)
+        self.next_suffix: Dict[str, int] = {}
+
+    def allocate(self, base: str) -> str:
+        """Reserve and return a free name derived from base"""
+        base = _truncate(base, MAX_NAME_BYTES)
+        if base not in self.used:
+            self.used.add(base)
+            return base
+
+        suffix = self.next_suffix.get(base, 1)
+        while True:
+            tail = f".{suffix:03d}"
+            name = _truncate(base, MAX_NAME_BYTES - len(tail)) + tail
+            suffix += 1
+            if name not in self.used:
+                break
+        self.next_suffix[base] = suffix
+        self.used.add(name)
+        return name
+
+    def claim(self, name: str) -> None:
+        """Record a name Blender chose itself, e.g. for a loaded image"""
+        self.used.add(name)
+
+    def release(self, name: str) -> None:
+        """Make the name of a removed datablock available again"""
+        self.used.discard(name)
+
+
+class DatablockNames:
+    """One NameAllocator per bpy.data collection, shared by every stage of an import
+
+    Allocators are seeded lazily, the first time a collection is used, so
+    an import pays one pass over each collection it actually adds to.
+    """
+
+    def __init__(self):
+        self.allocators: Dict[str, NameAllocator] = {}
+
+    def __getitem__(self, collection: str) -> NameAllocator:
+        allocator = self.allocators.get(collection)
+        if allocator is None:
+            allocator = NameAllocator(getattr(bpy.data, collection).keys())
+            self.allocators[collection] = allocator
+        return allocator
+
+    def allocate(self, collection: str, base: str) -> str:
+        return self[collection].allocate(base)
+
+    def new(self, collection: str, base: str, *args: Any, **kwargs: Any) -> Any:
+        """bpy.data.<collection>.new() with a freshly allocated name"""
+        datablock = getattr(bpy.data, collection).new(self.allocate(collection, base), *args, **kwargs)
+        self[collection].claim(datablock.name)
+        return datablock
@@ -0,0 +1,86 @@
+"""
+Addon preferences for BeamNG Blender addon
+Persistent settings that apply across blend files, such as the import cache
+"""
+
+import os
+
+import bpy
+from bpy.props import StringProperty, BoolProperty, IntProperty
+from bpy.types import AddonPreferences
+
+from .import_cache import ImportCache
+from ..parsers.level_index import LevelIndex
+
+
+ADDON_PACKAGE = __package__.rpartition('.')[0]
+
+
+class BeamNGAddonPreferences(AddonPreferences):
+    bl_idname = ADDON_PACKAGE
+
+    use_import_cache: BoolProperty(
+        name="Use Import Cache",
+        description="Reuse decoded terrain textures when re-importing an unchanged level",
+        default=True,
+    )
+
+    import_cache_dir: StringProperty(
+        name="Cache Directory",
+        description="Where cached terrain imports are stored (empty = Blender user data directory)",
+        subtype='DIR_PATH',
+        default="",
+    )
+
+    import_cache_size_mb: IntProperty(
+        name="Cache Size (MB)",
+        description="Least recently used entries are removed once the cache exceeds this size",
+        default=4096,
+        min=64,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "use_import_cache")
+        col = layout.column()
+        col.enabled = self.use_import_cache
+        col.prop(self, "import_cache_dir")
+        col.prop(self, "import_cache_size_mb")
+
+
+def get_preferences():
+    """The addon preferences, or None if the addon is not registered"""
+    addon = bpy.context.preferences.addons.get(ADDON_PACKAGE)
+    return addon.preferences if addon else None
+
+
+def get_cache_dir():
+    """The configured cache directory, or None if caching is disabled"""
+    preferences = get_preferences()
+    if preferences is None or not preferences.use_import_cache:
+        return None
+
+    if preferences.import_cache_dir:
+        return bpy.path.abspath(preferences.import_cache_dir)
+    return os.path.join(bpy.utils.user_resource('DATAFILES'), "beamng_import_cache")
+
+
+def get_import_cache():
+    """The configured ImportCache, or None if caching is disabled"""
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    return ImportCache(cache_dir, get_preferences().import_cache_size_mb * 1024 * 1024)
+
+
+def get_level_index(directory):
+    """The LevelIndex of a level directory or zip, persisted in the cache directory when caching is enabled"""
+    return LevelIndex.load(directory, get_cache_dir())
+
+
+def register():
+    bpy.utils.register_class(BeamNGAddonPreferences)
+
+
+def unregister():
+    bpy.utils.unregister_class(BeamNGAddonPreferences)
@@ -0,0 +1,200 @@
+"""
+DecalRoad curve builder for BeamNG Blender addon
+Fills road splines from the parser's float32 node buffers with foreach_set
+instead of assigning every control point through RNA
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import bpy
+
+from .decal_road import decal_road_network_node_group
+from .names import DatablockNames
+
+
+# Custom property -> DecalRoadData attribute, set on every road object
+ROAD_PROPERTIES = {
+    'beamng_material': 'material',
+    'beamng_persistent_id': 'persistent_id',
+    'beamng_texture_length': 'texture_length',
+    'beamng_break_angle': 'break_angle',
+    'beamng_improved_spline': 'improved_spline',
+    'beamng_render_priority': 'render_priority',
+    'beamng_start_end_fade': 'start_end_fade',
+    'beamng_distance_fade': 'distance_fade',
+}
+
+# Content hash of the road data an object was last built from, see DecalRoadData.content_hash
+ROAD_HASH_PROPERTY = 'beamng_road_hash'
+
+
+def road_properties(road) -> Dict[str, Any]:
+    """The beamng_* custom properties of a road object"""
+    properties = {'beamng_type': 'DecalRoad'}
+    for name, attribute in ROAD_PROPERTIES.items():
+        properties[name] = getattr(road, attribute)
+    properties[ROAD_HASH_PROPERTY] = road.content_hash()
+    return properties
+
+
+def road_point_buffers(node_arrays: Sequence[np.ndarray], scale_width: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert the (n, 4) node arrays of many roads to spline point data in one pass
+
+    Returns (co, radius, offsets): homogeneous (x, y, z, 1) coordinates and
+    radii for all points, and offsets where road i spans offsets[i]:offsets[i + 1].
+    """
+    offsets = np.zeros(len(node_arrays) + 1, dtype=np.int64)
+    np.cumsum([len(nodes) for nodes in node_arrays], out=offsets[1:])
+
+    nodes = np.concatenate(node_arrays) if len(node_arrays) else np.empty((0, 4), dtype=np.float32)
+    co = np.ones((len(nodes), 4), dtype=np.float32)
+    co[:, :3] = nodes[:, :3]
+    radius = nodes[:, 3].copy() if scale_width else np.ones(len(nodes), dtype=np.float32)
+    return co, radius, offsets
+
+
+def fill_curve_splines(curve_data: bpy.types.Curve, co: np.ndarray, radius: np.ndarray,
+                       offsets: np.ndarray) -> List[bpy.types.Spline]:
+    """Add one POLY spline per offsets range to curve_data and fill its points in bulk"""
+    splines = []
+    for start, stop in zip(offsets[:-1], offsets[1:]):
+        spline = curve_data.splines.new('POLY')
+        spline.points.add(int(stop - start) - 1)
+        spline.points.foreach_set('co', co[start:stop].ravel())
+        spline.points.foreach_set('radius', radius[start:stop])
+        splines.append(spline)
+    return splines
+
+
+def _new_datablock(names: Optional[DatablockNames], collection: str, name: str, *args: Any, **kwargs: Any) -> Any:
+    if names is None:
+        return getattr(bpy.data, collection).new(name, *args, **kwargs)
+    return names.new(collection, name, *args, **kwargs)
+
+
+def create_road_curve_object(name: str, road, co: Optional[np.ndarray] = None, radius: Optional[np.ndarray] = None,
+                             resolution_u: int = 12, scale_width: bool = True,
+                             names: Optional[DatablockNames] = None,
+                             properties: Optional[Dict[str, Any]] = None) -> bpy.types.Object:
+    """Create a curve object for one road with its points and custom properties set in bulk
+
+    co and radius are the road's slice of road_point_buffers(); without them
+    they are computed from road.nodes. names allocates unique datablock names
+    and properties are extra custom properties, e.g. the source level.
+    """
+    if co is None or radius is None:
+        co, radius, _ = road_point_buffers([road.nodes], scale_width)
+
+    curve_data = _new_datablock(names, 'curves', name, type='CURVE')
+    curve_data.dimensions = '3D'
+    curve_data.resolution_u = resolution_u
+    fill_curve_splines(curve_data, co, radius, np.array([0, len(co)]))
+
+    curve_obj = _new_datablock(names, 'objects', name, curve_data)
+    curve_obj.id_properties_ensure().update(dict(road_properties(road), **(properties or {})))
+    return curve_obj
+
+
+def update_road_curve_object(curve_obj: bpy.types.Object, road, co: Optional[np.ndarray] = None,
+                             radius: Optional[np.ndarray] = None, scale_width: bool = True) -> None:
+    """Rebuild an existing road object's spline and custom properties in place from changed road data"""
+    if co is None or radius is None:
+        co, radius, _ = road_point_buffers([road.nodes], scale_width)
+
+    curve_data = curve_obj.data
+    curve_data.splines.clear()
+    fill_curve_splines(curve_data, co, radius, np.array([0, len(co)]))
+    curve_obj.id_properties_ensure().update(road_properties(road))
+
+
+# Per-spline attributes of a road network object (curve domain)
+NETWORK_ATTRIBUTES = {
+    'texture_length': ('FLOAT', 'texture_length'),
+    'render_priority': ('INT', 'render_priority'),
+}
+NETWORK_ROAD_INDEX = 'road_index'
+NETWORK_NODE_GROUP = "BeamNG_DecalRoadNetwork"
+
+# Road import modes shared by the importers
+ROAD_MODE_ITEMS = [
+    ('OBJECTS', "Separate Objects", "One curve object with its own geometry nodes modifier per road"),
+    ('NETWORK', "Road Network", "All roads as splines of one curves object, evaluated once (not updated by road sync)"),
+    ('NETWORK_PER_MATERIAL', "Network per Material", "One road network object per road material (not updated by road sync)"),
+]
+CURVE_TYPE_POLY = 1
+
+
+def _set_attribute(curves: bpy.types.Curves, name: str, data_type: str, domain: str, values: np.ndarray) -> None:
+    attribute = curves.attributes.get(name) or curves.attributes.new(name, data_type, domain)
+    attribute.data.foreach_set('value', values)
+
+
+def create_road_network_object(name: str, roads: Sequence, co: np.ndarray, radius: np.ndarray,
+                               offsets: np.ndarray, names: Optional[DatablockNames] = None) -> bpy.types.Object:
+    """Create one curves object holding every road as a spline
+
+    Splines carry material_index, texture_length, render_priority and
+    road_index attributes; road_index points into the object's
+    beamng_persistent_ids, so the ID survives splines being deleted or
+    reordered. co, radius and offsets come from road_point_buffers(roads).
+    """
+    curves = _new_datablock(names, 'hair_curves', name)
+    curves.add_curves(np.diff(offsets).tolist())
+    curves.position_data.foreach_set('vector', np.ascontiguousarray(co[:, :3]).ravel())
+    _set_attribute(curves, 'radius', 'FLOAT', 'POINT', radius)
+    _set_attribute(curves, 'curve_type', 'INT8', 'CURVE', np.full(len(roads), CURVE_TYPE_POLY, dtype=np.int8))
+
+    # Material slots in first-use order, indexed per spline
+    material_names = list(dict.fromkeys(road.material for road in roads))
+    for material_name in material_names:
+        curves.materials.append(bpy.data.materials.get(material_name))
+    slot = {material_name: index for index, material_name in enumerate(material_names)}
+    _set_attribute(curves, 'material_index', 'INT', 'CURVE',
+                   np.array([slot[road.material] for road in roads], dtype=np.int32))
+
+    for attribute_name, (data_type, attribute) in NETWORK_ATTRIBUTES.items():
+        dtype = np.float32 if data_type == 'FLOAT' else np.int32
+        _set_attribute(curves, attribute_name, data_type, 'CURVE',
+                       np.array([getattr(road, attribute) for road in roads], dtype=dtype))
+    _set_attribute(curves, NETWORK_ROAD_INDEX, 'INT', 'CURVE', np.arange(len(roads), dtype=np.int32))
+
+    network_obj = _new_datablock(names, 'objects', name, curves)
+    network_obj.id_properties_ensure().update({
+        'beamng_type': 'DecalRoadNetwork',
+        'beamng_persistent_ids': [road.persistent_id for road in roads],
+        'beamng_materials': material_names,
+    })
+    return network_obj
+
+
+def create_road_networks(roads: Sequence, per_material: bool = False, scale_width: bool = True,
+                         name: str = "DecalRoadNetwork", names: Optional[DatablockNames] = None) -> List[bpy.types.Object]:
+    """Road network objects for all roads, or one per material, each with the network node group applied"""
+    groups: Dict[Optional[str], list] = {}
+    for road in roads:
+        groups.setdefault(road.material if per_material else None, []).append(road)
+
+    if NETWORK_NODE_GROUP not in bpy.data.node_groups:
+        decal_road_network_node_group()
+
+    network_objects = []
+    for material_name, group_roads in groups.items():
+        co, radius, offsets = road_point_buffers([road.nodes for road in group_roads], scale_width)
+        network_obj = create_road_network_object(f"{name}_{material_name}" if material_name else name,
+                                                 group_roads, co, radius, offsets, names)
+        modifier = network_obj.modifiers.new(name="DecalRoad_GeometryNodes", type='NODES')
+        modifier.node_group = bpy.data.node_groups[NETWORK_NODE_GROUP]
+        network_objects.append(network_obj)
+    return network_objects
+
+
+def road_object_ids(obj: bpy.types.Object) -> List[str]:
+    """Persistent IDs of the roads an object holds: one for a road, all of them for a network"""
+    if obj.get('beamng_type') == 'DecalRoad':
+        persistent_id = obj.get('beamng_persistent_id')
+        return [persistent_id] if persistent_id else []
+    if obj.get('beamng_type') == 'DecalRoadNetwork':
+        return list(obj.get('beamng_persistent_ids', []))
+    return []
@@ -0,0 +1,111 @@
+"""
+DecalRoad registry for BeamNG Blender addon
+Maps road persistent IDs to the scene objects holding them, so importers
+dedupe and look roads up without walking bpy.data.objects every time
+"""
+
+from typing import Dict, Iterator, Optional
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .road_curves import road_object_ids
+
+
+class RoadRegistry:
+    """Persistent ID -> road or road network object, rebuilt lazily
+
+    Importers add their objects as they create them. Handlers mark the
+    registry stale when objects may have disappeared behind its back (file
+    load, undo/redo, objects deleted), and the next lookup rebuilds it with
+    a single pass over bpy.data.objects.
+    """
+
+    def __init__(self):
+        self.objects: Dict[str, bpy.types.Object] = {}
+        self.stale = True
+        self.object_count = -1
+
+    def mark_stale(self) -> None:
+        self.stale = True
+
+    def rebuild(self) -> None:
+        self.objects = {}
+        for obj in bpy.data.objects:
+            for persistent_id in road_object_ids(obj):
+                self.objects.setdefault(persistent_id, obj)
+        self.object_count = len(bpy.data.objects)
+        self.stale = False
+
+    def ensure(self) -> 'RoadRegistry':
+        """Rebuild if stale; returns self for chaining"""
+        if self.stale:
+            self.rebuild()
+        return self
+
+    def add(self, obj: bpy.types.Object) -> None:
+        """Register an object an importer just created"""
+        for persistent_id in road_object_ids(obj):
+            self.objects.setdefault(persistent_id, obj)
+        self.object_count = len(bpy.data.objects)
+
+    def get(self, persistent_id: str) -> Optional[bpy.types.Object]:
+        """The object holding the road, or None"""
+        obj = self.ensure().objects.get(persistent_id)
+        if obj is None:
+            return None
+        try:
+            if persistent_id in road_object_ids(obj):
+                return obj
+        except ReferenceError:  # removed since the registry was built
+            pass
+        self.rebuild()
+        return self.objects.get(persistent_id)
+
+    def __contains__(self, persistent_id: str) -> bool:
+        return persistent_id in self.ensure().objects
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ensure().objects)
+
+    def __len__(self) -> int:
+        return len(self.ensure().objects)
+
+
+road_registry = RoadRegistry()
+
+
+@persistent
+def _registry_stale_handler(*args) -> None:
+    road_registry.mark_stale()
+
+
+@persistent
+def _registry_depsgraph_handler(scene, depsgraph) -> None:
+    # Adding or deleting objects changes the count; edits to existing ones do not matter
+    if depsgraph.id_type_updated('OBJECT') and len(bpy.data.objects) != road_registry.object_count:
+        road_registry.mark_stale()
+
+
+STALE_HANDLERS = ('load_post', 'undo_post', 'redo_post')
+
+
+def register():
+    """Install the handlers that keep the road registry in step with the scene"""
+    for name in STALE_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if _registry_stale_handler not in handlers:
+            handlers.append(_registry_stale_handler)
+    if _registry_depsgraph_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_registry_depsgraph_handler)
+    road_registry.mark_stale()
+
+
+def unregister():
+    """Remove the road registry handlers"""
+    for name in STALE_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if _registry_stale_handler in handlers:
+            handlers.remove(_registry_stale_handler)
+    if _registry_depsgraph_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_registry_depsgraph_handler)
@@ -0,0 +1,95 @@
+"""
+Terrain tile LOD for BeamNG Blender addon
+Drives the resolution of chunked terrain tiles from their distance to the viewer
+"""
+
+import math
+
+import bpy
+from mathutils import Vector
+
+
+TILES_COLLECTION = "BeamNG_TerrainTiles"
+LOD_UPDATE_INTERVAL = 0.5  # seconds between LOD checks
+MIN_TILE_RESOLUTION = 8
+
+
+def find_modifier_input(modifier, socket_name):
+    """Find the identifier of a geometry nodes modifier input by its interface name"""
+    if modifier.node_group is None:
+        return None
+    for item in modifier.node_group.interface.items_tree:
+        if getattr(item, 'in_out', None) == 'INPUT' and item.name == socket_name:
+            return item.identifier
+    return None
+
+
+def set_modifier_input(modifier, socket_name, value):
+    """Set a geometry nodes modifier input by name, returning True if it changed"""
+    identifier = find_modifier_input(modifier, socket_name)
+    if identifier is None or modifier.get(identifier) == value:
+        return False
+    modifier[identifier] = value
+    return True
+
+
+def get_viewer_location():
+    """Location of the first 3D viewport's view, falling back to the scene camera"""
+    window_manager = bpy.context.window_manager
+    if window_manager:
+        for window in window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    region_3d = area.spaces.active.region_3d
+                    if region_3d:
+                        return region_3d.view_matrix.inverted().translation
+
+    camera = bpy.context.scene.camera if bpy.context.scene else None
+    if camera:
+        return camera.matrix_world.translation
+    return None
+
+
+def tile_resolution(base_resolution, distance, lod_distance):
+    """Halve the tile resolution for every doubling of distance beyond lod_distance"""
+    level = int(math.log2(max(distance / max(lod_distance, 1e-6), 1.0)))
+    return max(base_resolution >> level, min(MIN_TILE_RESOLUTION, base_resolution))
+
+
+def update_terrain_lod():
+    """Timer callback: re-resolve every terrain tile against the current viewer"""
+    collection = bpy.data.collections.get(TILES_COLLECTION)
+    if collection is None or not collection.objects:
+        return LOD_UPDATE_INTERVAL * 4
+
+    viewer = get_viewer_location()
+    if viewer is None:
+        return LOD_UPDATE_INTERVAL
+
+    for obj in collection.objects:
+        modifier = obj.modifiers.get("BeamNG_Terrain")
+        if modifier is None or "beamng_tile_center" not in obj:
+            continue
+
+        center = obj.matrix_world @ Vector(obj["beamng_tile_center"])
+        resolution = tile_resolution(
+            obj["beamng_tile_base_resolution"],
+            (center - viewer).length,
+            obj["beamng_tile_lod_distance"]
+        )
+        if set_modifier_input(modifier, "Resolution", resolution):
+            obj.update_tag()
+
+    return LOD_UPDATE_INTERVAL
+
+
+def register():
+    """Start the terrain LOD timer"""
+    if not bpy.app.timers.is_registered(update_terrain_lod):
+        bpy.app.timers.register(update_terrain_lod, first_interval=LOD_UPDATE_INTERVAL, persistent=True)
+
+
+def unregister():
+    """Stop the terrain LOD timer"""
+    if bpy.app.timers.is_registered(update_terrain_lod):
+        bpy.app.timers.unregister(update_terrain_lod)
@@ -0,0 +1,314 @@
+"""
+Adaptive terrain mesh for BeamNG Blender addon
+Builds a right-triangulated irregular network (RTIN) from the heightmap so flat
+ground and water use a handful of large triangles instead of the full grid
+"""
+
+import numpy as np
+
+import bpy
+
+
+def pad_heights(heights: np.ndarray):
+    """Pad a heightmap to the (2^k + 1)^2 grid RTIN needs by repeating the edge values
+
+    Returns (padded, grid_size) where grid_size is the number of cells per side.
+    """
+    size = max(heights.shape)
+    grid_size = 1 << max(int(np.ceil(np.log2(max(size, 2)))), 1)
+    pad_rows = grid_size + 1 - heights.shape[0]
+    pad_cols = grid_size + 1 - heights.shape[1]
+    return np.pad(heights, ((0, pad_rows), (0, pad_cols)), mode='edge'), grid_size
+
+
+def rtin_errors(heights: np.ndarray, forced: np.ndarray = None) -> np.ndarray:
+    """Compute the RTIN approximation error of every vertex of a (2^k + 1)^2 grid
+
+    Each vertex is the hypotenuse midpoint of some triangle in the RTIN hierarchy.
+    Its error is the interpolation error at that vertex, maxed with the errors of
+    the triangles below it, so a triangle is split whenever one of the hierarchy
+    vertices beneath it is off by more than the threshold. Only those vertices
+    are measured: grid points between them can still deviate by more, so the
+    threshold is not a bound on the error of the final mesh. The hierarchy alternates between square
+    centres (diagonal splits) and square edge midpoints (axis splits), which lets
+    every level be processed as a handful of strided array views, smallest first.
+    Vertices set in the optional forced mask get an infinite error, so every
+    triangle touching them is refined down to single grid cells.
+    """
+    grid_size = heights.shape[0] - 1
+    errors = np.zeros(heights.shape, dtype=np.float32)
+    if forced is not None:
+        errors[forced] = np.inf
+
+    step = 2
+    while step <= grid_size:
+        half = step // 2
+        quarter = half // 2
+
+        # Axis splits: midpoints of the horizontal and vertical square edges
+        horizontal = errors[0::step, half::step]
+        np.maximum(horizontal, np.abs(heights[0::step, half::step] -
+                                      (heights[0::step, 0:grid_size:step] + heights[0::step, step::step]) * 0.5),
+                   out=horizontal)
+        vertical = errors[half::step, 0::step]
+        np.maximum(vertical, np.abs(heights[half::step, 0::step] -
+                                    (heights[0:grid_size:step, 0::step] + heights[step::step, 0::step]) * 0.5),
+                   out=vertical)
+
+        # Fold in the centres of the half-size squares cornered on each edge midpoint
+        if quarter:
+            np.maximum(horizontal[:-1], errors[quarter::step, half - quarter::step], out=horizontal[:-1])
+            np.maximum(horizontal[:-1], errors[quarter::step, half + quarter::step], out=horizontal[:-1])
+            np.maximum(horizontal[1:], errors[step - quarter::step, half - quarter::step], out=horizontal[1:])
+            np.maximum(horizontal[1:], errors[step - quarter::step, half + quarter::step], out=horizontal[1:])
+
+            np.maximum(vertical[:, :-1], errors[half - quarter::step, quarter::step], out=vertical[:, :-1])
+            np.maximum(vertical[:, :-1], errors[half + quarter::step, quarter::step], out=vertical[:, :-1])
+            np.maximum(vertical[:, 1:], errors[half - quarter::step, step - quarter::step], out=vertical[:, 1:])
+            np.maximum(vertical[:, 1:], errors[half + quarter::step, step - quarter::step], out=vertical[:, 1:])
+
+        # Diagonal splits: square centres, the diagonal alternates like a checkerboard
+        centers = errors[half::step, half::step]
+        main_diagonal = (heights[0:grid_size:step, 0:grid_size:step] + heights[step::step, step::step]) * 0.5
+        anti_diagonal = (heights[0:grid_size:step, step::step] + heights[step::step, 0:grid_size:step]) * 0.5
+        cells = np.indices(centers.shape).sum(axis=0) & 1
+        np.maximum(centers, np.abs(heights[half::step, half::step] - np.where(cells == 0, main_diagonal, anti_diagonal)),
+                   out=centers)
+
+        np.maximum(centers, errors[0:grid_size:step, half::step], out=centers)
+        np.maximum(centers, errors[step::step, half::step], out=centers)
+        np.maximum(centers, errors[half::step, 0:grid_size:step], out=centers)
+        np.maximum(centers, errors[half::step, step::step], out=centers)
+
+        step *= 2
+
+    return errors
+
+
+def rtin_triangles(errors: np.ndarray, max_error: float) -> np.ndarray:
+    """Extract the RTIN triangles whose error is within max_error
+
+    Returns an (N, 3, 2) int32 array of (x, y) grid coordinates. Triangles are
+    refined a whole level at a time, so the work is proportional to the output.
+    """
+    grid_size = errors.shape[0] - 1
+    # Each triangle is (a, b, c): hypotenuse a-b, right angle at c
+    triangles = np.array([
+        [[0, 0], [grid_size, grid_size], [0, grid_size]],
+        [[grid_size, grid_size], [0, 0], [grid_size, 0]],
+    ], dtype=np.int32)
+
+    done = []
+    while len(triangles):
+        a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+        mid = (a + b) // 2
+        leg = np.abs(a - c).sum(axis=1)
+        split = (leg > 1) & (errors[mid[:, 1], mid[:, 0]] > max_error)
+
+        done.append(triangles[~split])
+
+        a, b, c, mid = a[split], b[split], c[split], mid[split]
+        triangles = np.concatenate([
+            np.stack([c, a, mid], axis=1),
+            np.stack([b, c, mid], axis=1),
+        ])
+
+    return np.concatenate(done)
+
+
+def hole_vertices(hole_mask: np.ndarray, grid_size: int) -> np.ndarray:
+    """Mark the four corner vertices of every hole cell on the padded vertex grid"""
+    rows, cols = hole_mask.shape
+    forced = np.zeros((grid_size + 1, grid_size + 1), dtype=bool)
+    for dy in (0, 1):
+        for dx in (0, 1):
+            forced[dy:rows + dy, dx:cols + dx] |= hole_mask
+    return forced
+
+
+def build_adaptive_mesh(heights: np.ndarray, max_error: float, hole_mask: np.ndarray = None):
+    """Triangulate a float heightmap (in metres) with RTIN error threshold max_error
+
+    Triangles are split while a hierarchy vertex beneath them is off by more
+    than max_error metres (see rtin_errors); the surface can still deviate by
+    somewhat more at grid points in between. Cells set in hole_mask are refined to full resolution and left out of the
+    mesh. Returns (grid_points, faces, grid_size): (V, 2) int32 grid
+    coordinates, (F, 3) vertex indices wound counter-clockwise seen from
+    above, and the number of cells per side of the padded grid.
+    """
+    padded, grid_size = pad_heights(heights)
+    forced = hole_vertices(hole_mask, grid_size) if hole_mask is not None and hole_mask.any() else None
+    errors = rtin_errors(padded, forced)
+    del padded
+    triangles = rtin_triangles(errors, max_error)
+    del errors
+
+    # Hole cells only contain single-cell triangles, whose cell is their min corner
+    if forced is not None:
+        leaf = np.abs(triangles[:, 0] - triangles[:, 2]).sum(axis=1) == 1
+        cell = triangles.min(axis=1)
+        inside = leaf & (cell[:, 0] < hole_mask.shape[1]) & (cell[:, 1] < hole_mask.shape[0])
+        holes = np.zeros(len(triangles), dtype=bool)
+        holes[inside] = hole_mask[cell[inside, 1], cell[inside, 0]]
+        triangles = triangles[~holes]
+
+    keys = triangles[..., 1].astype(np.int64) * (grid_size + 1) + triangles[..., 0]
+    unique_keys, faces = np.unique(keys.ravel(), return_inverse=True)
+    faces = faces.reshape((-1, 3)).astype(np.int32)
+    grid_points = np.stack([unique_keys % (grid_size + 1), unique_keys // (grid_size + 1)], axis=1).astype(np.int32)
+
+    # Flip clockwise triangles so every face points up
+    edge_1 = triangles[:, 1] - triangles[:, 0]
+    edge_2 = triangles[:, 2] - triangles[:, 0]
+    clockwise = edge_1[:, 0] * edge_2[:, 1] - edge_1[:, 1] * edge_2[:, 0] < 0
+    faces[clockwise] = faces[clockwise][:, ::-1]
+
+    return grid_points, faces, grid_size
+
+
+def _rasterize_boxes(heights, covered, tri_xy, tri_z, x0, y0, width, rows):
+    """Interpolate triangle heights at every grid pixel inside each (x0, y0, width, rows) box"""
+    counts = width * rows
+    item = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    x = x0[item] + local % width[item]
+    y = y0[item] + local // width[item]
+
+    a, b, c = tri_xy[item, 0], tri_xy[item, 1], tri_xy[item, 2]
+    ab, ac = b - a, c - a
+    ap_x, ap_y = x - a[:, 0], y - a[:, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        det = ab[:, 0] * ac[:, 1] - ac[:, 0] * ab[:, 1]
+        weight_b = (ap_x * ac[:, 1] - ac[:, 0] * ap_y) / det
+        weight_c = (ab[:, 0] * ap_y - ap_x * ab[:, 1]) / det
+    weight_a = 1.0 - weight_b - weight_c
+
+    eps = 1e-6
+    inside = (det != 0) & (weight_a >= -eps) & (weight_b >= -eps) & (weight_c >= -eps)
+    z = tri_z[item]
+    values = weight_a * z[:, 0] + weight_b * z[:, 1] + weight_c * z[:, 2]
+    heights[y[inside], x[inside]] = values[inside]
+    covered[y[inside], x[inside]] = True
+
+
+def sample_mesh_heights(coords, triangles, size, spacing, origin=(0.0, 0.0), budget=1 << 20):
+    """Interpolate a triangle mesh's heights at every pixel of a size x size heightmap
+
+    Pixel (x, y) sits at origin + (x, y) * spacing, the layout of the terrain
+    node group grid. Works for any triangulation of the terrain (full grid,
+    LOD tiles, adaptive mesh, holes): each pixel takes the barycentric height
+    of the triangle above it. Triangles are rasterized over their pixel
+    bounding boxes about budget pixels at a time. Returns (heights, covered),
+    where covered marks the pixels some triangle lies over.
+    """
+    xy = (coords[:, :2].astype(np.float64) - np.asarray(origin, dtype=np.float64)) / spacing
+    tri_xy = xy[triangles]
+    tri_z = coords[:, 2].astype(np.float64)[triangles]
+
+    lo = np.maximum(np.ceil(tri_xy.min(axis=1) - 1e-6), 0).astype(np.int64)
+    hi = np.minimum(np.floor(tri_xy.max(axis=1) + 1e-6), size - 1).astype(np.int64)
+    extent = np.maximum(hi - lo + 1, 0)
+    keep = (extent > 0).all(axis=1)
+    tri_xy, tri_z, lo, extent = tri_xy[keep], tri_z[keep], lo[keep], extent[keep]
+    areas = extent[:, 0] * extent[:, 1]
+
+    heights = np.zeros((size, size), dtype=np.float32)
+    covered = np.zeros((size, size), dtype=bool)
+
+    # Small triangles in batches of about budget pixels
+    small = np.flatnonzero(areas <= budget)
+    batch_ids = (np.cumsum(areas[small]) - 1) // budget
+    for batch in np.split(small, np.flatnonzero(np.diff(batch_ids)) + 1):
+        if len(batch):
+            _rasterize_boxes(heights, covered, tri_xy[batch], tri_z[batch], lo[batch, 0], lo[batch, 1],
+                             extent[batch, 0], extent[batch, 1])
+
+    # Large triangles (flat ground of an adaptive mesh) a band of rows at a time
+    for index in np.flatnonzero(areas > budget):
+        rows_per_band = max(budget // int(extent[index, 0]), 1)
+        for row in range(0, int(extent[index, 1]), rows_per_band):
+            rows = min(rows_per_band, int(extent[index, 1]) - row)
+            _rasterize_boxes(heights, covered, tri_xy[index:index + 1], tri_z[index:index + 1],
+                             lo[index:index + 1, 0], lo[index:index + 1, 1] + row,
+                             extent[index:index + 1, 0], np.array([rows]))
+
+    return heights, covered
+
+
+def fold_to_grid(grid_points: np.ndarray, faces: np.ndarray, cells: int):
+    """Fold padded RTIN vertices beyond a cells x cells grid onto its far edges
+
+    Vertices that collapse onto the same grid point are merged and the faces
+    left without area are dropped. Clamping each axis keeps the winding of
+    the remaining faces. Returns (grid_points, faces).
+    """
+    clamped = np.minimum(grid_points, cells)
+    keys = clamped[:, 1].astype(np.int64) * (cells + 1) + clamped[:, 0]
+    unique_keys, remap = np.unique(keys, return_inverse=True)
+    faces = remap.reshape(-1)[faces].astype(np.int32)
+    grid_points = np.stack([unique_keys % (cells + 1), unique_keys // (cells + 1)], axis=1).astype(np.int32)
+
+    corners = grid_points[faces].astype(np.int64)
+    edge_1 = corners[:, 1] - corners[:, 0]
+    edge_2 = corners[:, 2] - corners[:, 0]
+    area = edge_1[:, 0] * edge_2[:, 1] - edge_1[:, 1] * edge_2[:, 0]
+    faces = faces[area != 0]
+
+    # Drop grid points only the removed faces used
+    used = np.zeros(len(grid_points), dtype=bool)
+    used[faces.ravel()] = True
+    remap = np.cumsum(used) - 1
+    return grid_points[used], remap[faces].astype(np.int32)
+
+
+def create_adaptive_terrain_mesh(name, heightmap, layermap, size, height_scale, position=(0.0, 0.0, 0.0), max_error=0.1,
+                                 hole_mask=None):
+    """Create a Blender mesh approximating the terrain with RTIN error threshold max_error metres
+
+    Vertices sit where the terrain node group samples the heightmap: the
+    node group's UV is world position / size, so heightmap pixel (x, y) of an
+    N x N heightmap sits at position + (x, y) * size / N, whatever the node
+    group's Resolution. Like a full resolution node group grid, the mesh
+    spans size with N + 1 vertices per side; the last row and column repeat
+    the edge pixels and RTIN padding beyond them is folded back onto the
+    edge. The UVMap and material_layer point attributes match what the
+    terrain node group stores.
+    """
+    resolution = heightmap.shape[0]
+    heights = heightmap.astype(np.float32) * np.float32(height_scale / 65535.0)
+    grid_points, faces, grid_size = build_adaptive_mesh(heights, max_error, hole_mask)
+    if grid_size > resolution:
+        grid_points, faces = fold_to_grid(grid_points, faces, resolution)
+
+    # Padded vertices sample the nearest edge pixel
+    rows = np.minimum(grid_points[:, 1], heightmap.shape[0] - 1)
+    cols = np.minimum(grid_points[:, 0], heightmap.shape[1] - 1)
+
+    coords = np.empty((len(grid_points), 3), dtype=np.float32)
+    coords[:, :2] = grid_points * np.float32(size / resolution)
+    coords[:, 2] = heights[rows, cols]
+    coords += np.asarray(position, dtype=np.float32)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', coords.ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set('vertex_index', faces.ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set('loop_start', np.arange(0, faces.size, 3, dtype=np.int32))
+    mesh.polygons.foreach_set('use_smooth', np.ones(len(faces), dtype=bool))
+
+    uv_attribute = mesh.attributes.new("UVMap", 'FLOAT2', 'POINT')
+    uv_attribute.data.foreach_set('vector', (grid_points / np.float32(resolution)).astype(np.float32).ravel())
+
+    if layermap is not None:
+        layer_attribute = mesh.attributes.new("material_layer", 'FLOAT', 'POINT')
+        layer_attribute.data.foreach_set('value', layermap[rows, cols].astype(np.float32))
+
+    mesh.update(calc_edges=True)
+
+    full_vertices = (resolution + 1) ** 2
+    print(f"✅ Built adaptive terrain mesh: {len(coords):,} vertices, {len(faces):,} triangles "
+          f"({len(coords) / full_vertices:.1%} of the {resolution + 1}x{resolution + 1} grid, error threshold {max_error} m)")
+
+    return mesh
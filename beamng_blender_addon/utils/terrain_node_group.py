@@ -1,7 +1,11 @@
 import bpy
 
 #initialize terrain node group
-def terrain_node_group(displacement_image=None, layermap_image=None, material=None, position=(0.0, 0.0, 0.0), size=1024.0, resolution=1024, height=100.0):
+def terrain_node_group(displacement_image=None, layermap_image=None, material=None, position=(0.0, 0.0, 0.0), size=1024.0, resolution=1024, height=100.0, layermap_scale=None, tile_count=1, hole_image=None):
+    # 8-bit layermap images sample as id/255, float ones hold the raw material id
+    if layermap_scale is None:
+        layermap_scale = 255.0 if layermap_image is not None and not layermap_image.is_float else 1.0
+
     # Always create a new node group - let Blender handle incremental naming
     group = bpy.data.node_groups.new(type = 'GeometryNodeTree', name = "BeamNGTerrain")
     print(f"🔧 Created node group: {group.name} (ID: {id(group)})")
@@ -56,6 +60,30 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     position_socket.subtype = 'NONE'
     position_socket.attribute_domain = 'POINT'
 
+    #Socket Tile Count - the terrain is split into Tile Count x Tile Count chunks, 1 = whole terrain
+    tile_count_socket = group.interface.new_socket(name = "Tile Count", in_out='INPUT', socket_type = 'NodeSocketInt')
+    tile_count_socket.default_value = tile_count
+    tile_count_socket.min_value = 1
+    tile_count_socket.max_value = 1024
+    tile_count_socket.subtype = 'NONE'
+    tile_count_socket.attribute_domain = 'POINT'
+
+    #Socket Tile X
+    tile_x_socket = group.interface.new_socket(name = "Tile X", in_out='INPUT', socket_type = 'NodeSocketInt')
+    tile_x_socket.default_value = 0
+    tile_x_socket.min_value = 0
+    tile_x_socket.max_value = 1023
+    tile_x_socket.subtype = 'NONE'
+    tile_x_socket.attribute_domain = 'POINT'
+
+    #Socket Tile Y
+    tile_y_socket = group.interface.new_socket(name = "Tile Y", in_out='INPUT', socket_type = 'NodeSocketInt')
+    tile_y_socket.default_value = 0
+    tile_y_socket.min_value = 0
+    tile_y_socket.max_value = 1023
+    tile_y_socket.subtype = 'NONE'
+    tile_y_socket.attribute_domain = 'POINT'
+
 
     #initialize beamngterrain nodes
     #node Group Input
@@ -99,6 +127,14 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     #Frame
     layermap_texture.inputs[2].default_value = 0
 
+    #node Layermap Scale
+    layermap_scale_math = group.nodes.new("ShaderNodeMath")
+    layermap_scale_math.name = "Layermap Scale"
+    layermap_scale_math.operation = 'MULTIPLY'
+    layermap_scale_math.use_clamp = False
+    #Value_001
+    layermap_scale_math.inputs[1].default_value = layermap_scale
+
     #node Combine XYZ
     combine_xyz = group.nodes.new("ShaderNodeCombineXYZ")
     combine_xyz.name = "Combine XYZ"
@@ -151,25 +187,43 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     #node Named Attribute
     named_attribute = group.nodes.new("GeometryNodeInputNamedAttribute")
     named_attribute.name = "Named Attribute"
-    named_attribute.data_type = 'FLOAT'
+    named_attribute.data_type = 'BOOLEAN'
     #Name
-    named_attribute.inputs[0].default_value = "material_layer"
+    named_attribute.inputs[0].default_value = "beamng_hole"
+
+    #node Hole Mask Texture - one pixel per terrain cell, white = hole (layermap 255)
+    hole_mask_texture = group.nodes.new("GeometryNodeImageTexture")
+    hole_mask_texture.name = "Hole Mask Texture"
+    hole_mask_texture.extension = 'REPEAT'
+    hole_mask_texture.interpolation = 'Closest'
+    if hole_image:
+        hole_mask_texture.inputs[0].default_value = hole_image
+    #Frame
+    hole_mask_texture.inputs[2].default_value = 0
 
     #node Compare
     compare = group.nodes.new("FunctionNodeCompare")
     compare.name = "Compare"
     compare.data_type = 'FLOAT'
     compare.mode = 'ELEMENT'
-    compare.operation = 'EQUAL'
+    compare.operation = 'GREATER_THAN'
     #B
-    compare.inputs[1].default_value = 255.0
-    #Epsilon
-    compare.inputs[12].default_value = 0.0010000000474974513
+    compare.inputs[1].default_value = 0.5
+
+    #node Store Hole Attribute
+    store_hole_attribute = group.nodes.new("GeometryNodeStoreNamedAttribute")
+    store_hole_attribute.name = "Store Hole Attribute"
+    store_hole_attribute.data_type = 'BOOLEAN'
+    store_hole_attribute.domain = 'FACE'
+    #Selection
+    store_hole_attribute.inputs[1].default_value = True
+    #Name
+    store_hole_attribute.inputs[2].default_value = "beamng_hole"
 
     #node Delete Geometry
     delete_geometry = group.nodes.new("GeometryNodeDeleteGeometry")
     delete_geometry.name = "Delete Geometry"
-    delete_geometry.domain = 'POINT'
+    delete_geometry.domain = 'FACE'
     delete_geometry.mode = 'ALL'
 
     #node Vector Math
@@ -200,6 +254,52 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     #Z
     combine_xyz_001.inputs[2].default_value = 0.0
 
+    #node Group Input Tile
+    group_input_tile = group.nodes.new("NodeGroupInput")
+    group_input_tile.name = "Group Input Tile"
+
+    #node Tile Size
+    tile_size = group.nodes.new("ShaderNodeMath")
+    tile_size.name = "Tile Size"
+    tile_size.operation = 'DIVIDE'
+    tile_size.use_clamp = False
+
+    #node Tile UV Offset
+    tile_uv_offset = group.nodes.new("ShaderNodeCombineXYZ")
+    tile_uv_offset.name = "Tile UV Offset"
+    #Z
+    tile_uv_offset.inputs[2].default_value = 0.0
+
+    #node Tile UV Add
+    tile_uv_add = group.nodes.new("ShaderNodeVectorMath")
+    tile_uv_add.name = "Tile UV Add"
+    tile_uv_add.operation = 'ADD'
+
+    #node Tile UV Factor
+    tile_uv_factor = group.nodes.new("ShaderNodeMath")
+    tile_uv_factor.name = "Tile UV Factor"
+    tile_uv_factor.operation = 'DIVIDE'
+    tile_uv_factor.use_clamp = False
+    #Value
+    tile_uv_factor.inputs[0].default_value = 1.0
+
+    #node Tile UV Scale
+    tile_uv_scale = group.nodes.new("ShaderNodeVectorMath")
+    tile_uv_scale.name = "Tile UV Scale"
+    tile_uv_scale.operation = 'SCALE'
+
+    #node Tile Offset X
+    tile_offset_x = group.nodes.new("ShaderNodeMath")
+    tile_offset_x.name = "Tile Offset X"
+    tile_offset_x.operation = 'MULTIPLY_ADD'
+    tile_offset_x.use_clamp = False
+
+    #node Tile Offset Y
+    tile_offset_y = group.nodes.new("ShaderNodeMath")
+    tile_offset_y.name = "Tile Offset Y"
+    tile_offset_y.operation = 'MULTIPLY_ADD'
+    tile_offset_y.use_clamp = False
+
     #node Store Named Attribute
     store_named_attribute = group.nodes.new("GeometryNodeStoreNamedAttribute")
     store_named_attribute.name = "Store Named Attribute"
@@ -221,6 +321,7 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     set_position.location = (1258.742431640625, 46.31529998779297)
     image_texture.location = (155.740234375, 49.381717681884766)
     layermap_texture.location = (151.71380615234375, -178.93560791015625)
+    layermap_scale_math.location = (1258.742431640625, -178.93560791015625)
     combine_xyz.location = (759.5379638671875, -30.323625564575195)
     math.location = (593.09375, -17.11091423034668)
     set_shade_smooth.location = (1832.332763671875, -3.284168243408203)
@@ -229,6 +330,8 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     set_material.location = (2012.46142578125, -1.7147369384765625)
     named_attribute.location = (1387.27783203125, -270.93914794921875)
     compare.location = (1596.190673828125, -260.7309875488281)
+    hole_mask_texture.location = (1387.27783203125, -420.0)
+    store_hole_attribute.location = (1596.190673828125, -420.0)
     delete_geometry.location = (1632.4910888671875, -54.790870666503906)
     vector_math.location = (917.141357421875, -29.272382736206055)
     vector_math_001.location = (1078.6322021484375, -27.7032527923584)
@@ -236,6 +339,14 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     math_002.location = (707.1993408203125, -201.60931396484375)
     combine_xyz_001.location = (884.0307006835938, -197.49993896484375)
     store_named_attribute.location = (164.4757843017578, 266.8240661621094)
+    group_input_tile.location = (-517.251953125, 300.0)
+    tile_size.location = (-294.4574890136719, 300.0)
+    tile_uv_offset.location = (-124.76260375976562, 300.0)
+    tile_uv_add.location = (-124.76260375976562, 460.0)
+    tile_uv_factor.location = (-294.4574890136719, 460.0)
+    tile_uv_scale.location = (0.0, 460.0)
+    tile_offset_x.location = (707.1993408203125, -360.0)
+    tile_offset_y.location = (707.1993408203125, -520.0)
 
     #Set dimensions
     group_input.width, group_input.height = 140.0, 100.0
@@ -244,6 +355,7 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     set_position.width, set_position.height = 140.0, 100.0
     image_texture.width, image_texture.height = 226.33042907714844, 100.0
     layermap_texture.width, layermap_texture.height = 226.33042907714844, 100.0
+    layermap_scale_math.width, layermap_scale_math.height = 140.0, 100.0
     combine_xyz.width, combine_xyz.height = 140.0, 100.0
     math.width, math.height = 140.0, 100.0
     set_shade_smooth.width, set_shade_smooth.height = 140.0, 100.0
@@ -252,6 +364,8 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     set_material.width, set_material.height = 140.0, 100.0
     named_attribute.width, named_attribute.height = 140.0, 100.0
     compare.width, compare.height = 140.0, 100.0
+    hole_mask_texture.width, hole_mask_texture.height = 226.33042907714844, 100.0
+    store_hole_attribute.width, store_hole_attribute.height = 140.0, 100.0
     delete_geometry.width, delete_geometry.height = 140.0, 100.0
     vector_math.width, vector_math.height = 140.0, 100.0
     vector_math_001.width, vector_math_001.height = 140.0, 100.0
@@ -259,6 +373,14 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     math_002.width, math_002.height = 140.0, 100.0
     combine_xyz_001.width, combine_xyz_001.height = 140.0, 100.0
     store_named_attribute.width, store_named_attribute.height = 140.0, 100.0
+    group_input_tile.width, group_input_tile.height = 140.0, 100.0
+    tile_size.width, tile_size.height = 140.0, 100.0
+    tile_uv_offset.width, tile_uv_offset.height = 140.0, 100.0
+    tile_uv_add.width, tile_uv_add.height = 140.0, 100.0
+    tile_uv_factor.width, tile_uv_factor.height = 140.0, 100.0
+    tile_uv_scale.width, tile_uv_scale.height = 140.0, 100.0
+    tile_offset_x.width, tile_offset_x.height = 140.0, 100.0
+    tile_offset_y.width, tile_offset_y.height = 140.0, 100.0
 
     #initialize beamngterrain links
     #set_material.Geometry -> group_output.Geometry
@@ -275,10 +397,10 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     group.links.new(math_001.outputs[0], grid.inputs[2])
     #math_001.Value -> grid.Vertices Y
     group.links.new(math_001.outputs[0], grid.inputs[3])
-    #group_input.Size -> grid.Size X
-    group.links.new(group_input.outputs[1], grid.inputs[0])
-    #group_input.Size -> grid.Size Y
-    group.links.new(group_input.outputs[1], grid.inputs[1])
+    #tile_size.Value -> grid.Size X
+    group.links.new(tile_size.outputs[0], grid.inputs[0])
+    #tile_size.Value -> grid.Size Y
+    group.links.new(tile_size.outputs[0], grid.inputs[1])
     #image_texture.Color -> math.Value
     group.links.new(image_texture.outputs[0], math.inputs[0])
     #group_input.Height -> math.Value
@@ -287,18 +409,27 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     group.links.new(set_shade_smooth.outputs[0], set_material.inputs[0])
     #set_position.Geometry -> store_layermap_attribute.Geometry
     group.links.new(set_position.outputs[0], store_layermap_attribute.inputs[0])
-    #layermap_texture.Color -> store_layermap_attribute.Value
-    group.links.new(layermap_texture.outputs[0], store_layermap_attribute.inputs[3])
-    #named_attribute.Attribute -> compare.A
-    group.links.new(named_attribute.outputs[0], compare.inputs[0])
-    #grid.UV Map -> image_texture.Vector
-    group.links.new(grid.outputs[1], image_texture.inputs[1])
-    #grid.UV Map -> layermap_texture.Vector
-    group.links.new(grid.outputs[1], layermap_texture.inputs[1])
-    #compare.Result -> delete_geometry.Selection
-    group.links.new(compare.outputs[0], delete_geometry.inputs[1])
-    #store_layermap_attribute.Geometry -> delete_geometry.Geometry
-    group.links.new(store_layermap_attribute.outputs[0], delete_geometry.inputs[0])
+    #layermap_texture.Color -> layermap_scale_math.Value
+    group.links.new(layermap_texture.outputs[0], layermap_scale_math.inputs[0])
+    #layermap_scale_math.Value -> store_layermap_attribute.Value
+    group.links.new(layermap_scale_math.outputs[0], store_layermap_attribute.inputs[3])
+    #hole_mask_texture.Color -> compare.A - left unlinked without holes, so nothing is deleted
+    if hole_image:
+        group.links.new(hole_mask_texture.outputs[0], compare.inputs[0])
+    #tile_uv_scale.Vector -> hole_mask_texture.Vector, sampled at face centres
+    group.links.new(tile_uv_scale.outputs[0], hole_mask_texture.inputs[1])
+    #compare.Result -> store_hole_attribute.Value
+    group.links.new(compare.outputs[0], store_hole_attribute.inputs[3])
+    #tile_uv_scale.Vector -> image_texture.Vector
+    group.links.new(tile_uv_scale.outputs[0], image_texture.inputs[1])
+    #tile_uv_scale.Vector -> layermap_texture.Vector
+    group.links.new(tile_uv_scale.outputs[0], layermap_texture.inputs[1])
+    #named_attribute.Attribute -> delete_geometry.Selection
+    group.links.new(named_attribute.outputs[0], delete_geometry.inputs[1])
+    #store_layermap_attribute.Geometry -> store_hole_attribute.Geometry
+    group.links.new(store_layermap_attribute.outputs[0], store_hole_attribute.inputs[0])
+    #store_hole_attribute.Geometry -> delete_geometry.Geometry
+    group.links.new(store_hole_attribute.outputs[0], delete_geometry.inputs[0])
     #delete_geometry.Geometry -> set_shade_smooth.Geometry
     group.links.new(delete_geometry.outputs[0], set_shade_smooth.inputs[0])
     #combine_xyz.Vector -> vector_math.Vector
@@ -307,16 +438,104 @@ def terrain_node_group(displacement_image=None, layermap_image=None, material=No
     group.links.new(vector_math.outputs[0], vector_math_001.inputs[0])
     #group_input_001.Position -> vector_math.Vector
     group.links.new(group_input_001.outputs[4], vector_math.inputs[1])
-    #group_input_001.Size -> math_002.Value
-    group.links.new(group_input_001.outputs[1], math_002.inputs[0])
-    #math_002.Value -> combine_xyz_001.X
-    group.links.new(math_002.outputs[0], combine_xyz_001.inputs[0])
-    #math_002.Value -> combine_xyz_001.Y
-    group.links.new(math_002.outputs[0], combine_xyz_001.inputs[1])
+    #tile_size.Value -> math_002.Value
+    group.links.new(tile_size.outputs[0], math_002.inputs[0])
+    #tile_offset_x.Value -> combine_xyz_001.X
+    group.links.new(tile_offset_x.outputs[0], combine_xyz_001.inputs[0])
+    #tile_offset_y.Value -> combine_xyz_001.Y
+    group.links.new(tile_offset_y.outputs[0], combine_xyz_001.inputs[1])
     #combine_xyz_001.Vector -> vector_math_001.Vector
     group.links.new(combine_xyz_001.outputs[0], vector_math_001.inputs[1])
     #grid.Mesh -> store_named_attribute.Geometry
     group.links.new(grid.outputs[0], store_named_attribute.inputs[0])
-    #grid.UV Map -> store_named_attribute.Value
-    group.links.new(grid.outputs[1], store_named_attribute.inputs[3])
+    #tile_uv_scale.Vector -> store_named_attribute.Value
+    group.links.new(tile_uv_scale.outputs[0], store_named_attribute.inputs[3])
+    #group_input_tile.Size -> tile_size.Value
+    group.links.new(group_input_tile.outputs[1], tile_size.inputs[0])
+    #group_input_tile.Tile Count -> tile_size.Value
+    group.links.new(group_input_tile.outputs[5], tile_size.inputs[1])
+    #group_input_tile.Tile X -> tile_uv_offset.X
+    group.links.new(group_input_tile.outputs[6], tile_uv_offset.inputs[0])
+    #group_input_tile.Tile Y -> tile_uv_offset.Y
+    group.links.new(group_input_tile.outputs[7], tile_uv_offset.inputs[1])
+    #grid.UV Map -> tile_uv_add.Vector
+    group.links.new(grid.outputs[1], tile_uv_add.inputs[0])
+    #tile_uv_offset.Vector -> tile_uv_add.Vector
+    group.links.new(tile_uv_offset.outputs[0], tile_uv_add.inputs[1])
+    #group_input_tile.Tile Count -> tile_uv_factor.Value
+    group.links.new(group_input_tile.outputs[5], tile_uv_factor.inputs[1])
+    #tile_uv_add.Vector -> tile_uv_scale.Vector
+    group.links.new(tile_uv_add.outputs[0], tile_uv_scale.inputs[0])
+    #tile_uv_factor.Value -> tile_uv_scale.Scale
+    group.links.new(tile_uv_factor.outputs[0], tile_uv_scale.inputs[3])
+    #group_input_tile.Tile X -> tile_offset_x.Value
+    group.links.new(group_input_tile.outputs[6], tile_offset_x.inputs[0])
+    #tile_size.Value -> tile_offset_x.Value
+    group.links.new(tile_size.outputs[0], tile_offset_x.inputs[1])
+    #math_002.Value -> tile_offset_x.Value
+    group.links.new(math_002.outputs[0], tile_offset_x.inputs[2])
+    #group_input_tile.Tile Y -> tile_offset_y.Value
+    group.links.new(group_input_tile.outputs[7], tile_offset_y.inputs[0])
+    #tile_size.Value -> tile_offset_y.Value
+    group.links.new(tile_size.outputs[0], tile_offset_y.inputs[1])
+    #math_002.Value -> tile_offset_y.Value
+    group.links.new(math_002.outputs[0], tile_offset_y.inputs[2])
+    return group
+
+
+#initialize terrain tiles proxy node group
+def terrain_tiles_node_group(tiles_collection):
+    """Merge the terrain tile objects into one geometry, so BeamNG_Terrain can still be raycast"""
+    group = bpy.data.node_groups.new(type = 'GeometryNodeTree', name = "BeamNGTerrainTiles")
+
+    group.color_tag = 'NONE'
+    group.description = ""
+    group.default_group_node_width = 140
+
+    group.is_modifier = True
+
+    #beamngterraintiles interface
+    #Socket Geometry
+    geometry_socket = group.interface.new_socket(name = "Geometry", in_out='OUTPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket.attribute_domain = 'POINT'
+
+    #Socket Geometry
+    geometry_socket_1 = group.interface.new_socket(name = "Geometry", in_out='INPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket_1.attribute_domain = 'POINT'
+
+    #initialize beamngterraintiles nodes
+    #node Group Input
+    group_input = group.nodes.new("NodeGroupInput")
+    group_input.name = "Group Input"
+
+    #node Group Output
+    group_output = group.nodes.new("NodeGroupOutput")
+    group_output.name = "Group Output"
+    group_output.is_active_output = True
+
+    #node Collection Info
+    collection_info = group.nodes.new("GeometryNodeCollectionInfo")
+    collection_info.name = "Collection Info"
+    collection_info.transform_space = 'RELATIVE'
+    collection_info.inputs[0].default_value = tiles_collection
+    #Separate Children
+    collection_info.inputs[1].default_value = False
+    #Reset Children
+    collection_info.inputs[2].default_value = False
+
+    #node Realize Instances
+    realize_instances = group.nodes.new("GeometryNodeRealizeInstances")
+    realize_instances.name = "Realize Instances"
+
+    #Set locations
+    group_input.location = (-340.0, 0.0)
+    collection_info.location = (-160.0, 0.0)
+    realize_instances.location = (40.0, 0.0)
+    group_output.location = (240.0, 0.0)
+
+    #initialize beamngterraintiles links
+    #collection_info.Instances -> realize_instances.Geometry
+    group.links.new(collection_info.outputs[0], realize_instances.inputs[0])
+    #realize_instances.Geometry -> group_output.Geometry
+    group.links.new(realize_instances.outputs[0], group_output.inputs[0])
     return group
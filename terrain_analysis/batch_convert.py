@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Batch-convert BeamNG levels into the addon's import cache
+
+Takes a content/levels root (level folders and/or level zips) or individual
+levels and converts them in parallel worker processes. For each level it writes:
+  - a terrain entry in the import cache (arrays, textures, metadata), so the
+    addon re-imports the level without parsing the .ter
+  - the persisted level index the addon would otherwise build on first import
+  - roads.json / materials.json manifests and manifest.json with the stats
+Unchanged levels are skipped.
+
+Usage:
+  python batch_convert.py ".../BeamNG.drive/content/levels" --cache-dir <addon cache directory>
+  python batch_convert.py <levels> --cache-dir <dir> --image-format FLOAT PNG16
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import types
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Load the addon's bpy-free packages without running its bpy-dependent __init__
+ADDON_DIR = Path(__file__).resolve().parent.parent / "beamng_blender_addon"
+if "beamng_blender_addon" not in sys.modules:
+    addon_package = types.ModuleType("beamng_blender_addon")
+    addon_package.__path__ = [str(ADDON_DIR)]
+    sys.modules["beamng_blender_addon"] = addon_package
+
+from beamng_blender_addon.formats.exr import write_exr
+from beamng_blender_addon.formats.png import write_grayscale_png
+from beamng_blender_addon.formats.stats import terrain_stats
+from beamng_blender_addon.parsers.decal_road_parser import DecalRoadParser
+from beamng_blender_addon.parsers.level_index import LEVEL_MARKERS, LevelIndex
+from beamng_blender_addon.parsers.terrain_preset import DEFAULT_HEIGHT_SCALE, TerrainPreset
+from beamng_blender_addon.utils.import_cache import TERRAIN_IMAGE_NAMES, ImportCache, terrain_entry_metadata, terrain_key_files
+
+# The importer's terrain_image_format choices; each is its own cache entry
+IMAGE_FORMATS = ('FLOAT', 'HALF', 'PNG16')
+DEFAULT_IMAGE_FORMAT = 'FLOAT'  # the importer's default
+MANIFEST_VERSION = 1
+DEFAULT_CACHE_SIZE_MB = 4096
+
+
+def find_levels(paths: List[str]) -> List[Path]:
+    """Level directories and zips under the given paths (a level itself or a folder of levels)"""
+    levels = []
+    for path in map(Path, paths):
+        if path.is_file() and zipfile.is_zipfile(path):
+            levels.append(path)
+        elif is_level_directory(path):
+            levels.append(path)
+        elif path.is_dir():
+            for child in sorted(path.iterdir()):
+                if (child.is_file() and child.suffix.lower() == '.zip') or is_level_directory(child):
+                    levels.append(child)
+        else:
+            print(f"⚠️  Not a level, level zip or levels folder: {path}")
+    return levels
+
+
+def is_level_directory(path: Path) -> bool:
+    if not path.is_dir():
+        return False
+    return any(entry.is_file() and (entry.name.lower() in LEVEL_MARKERS or entry.name.lower().endswith('.ter'))
+               for entry in os.scandir(path))
+
+
+def manifest_directory(cache_dir: Path, level_root: Path) -> Path:
+    digest = hashlib.blake2b(str(level_root).encode('utf-8'), digest_size=8).hexdigest()
+    return cache_dir / "levels" / f"{level_root.name}_{digest}"
+
+
+def read_manifest(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json(path: Path, data: Any) -> None:
+    pending = path.with_name(path.name + '.part')
+    with open(pending, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(pending, path)
+
+
+def convert_level(level_path: str, cache_dir: str, cache_size_mb: int, image_formats: List[str],
+                  force: bool = False) -> Dict[str, Any]:
+    """Convert one level; runs in a worker process and returns its summary row"""
+    start = time.perf_counter()
+    cache_dir = Path(cache_dir)
+    summary = {'level': Path(level_path).name, 'status': 'converted', 'bytes': 0, 'roads': 0, 'materials': 0}
+    try:
+        index = LevelIndex.load(level_path, cache_dir)
+        source = index.source
+        summary['level'] = index.root.name
+        cache = ImportCache(cache_dir, cache_size_mb * 1024 * 1024)
+
+        key_files = terrain_key_files(index)
+        ter_file, json_file = key_files[:2] if key_files else (None, None)
+        road_files = index.road_files()
+        material_files = index.files('materials')
+
+        # Everything the outputs depend on, fingerprinted without reading it all
+        terrain_keys = {image_format: cache.key_for(*key_files, variant=image_format, source=source)
+                        for image_format in image_formats} if key_files else {}
+        inputs_key = cache.key_for(*road_files, *material_files,
+                                   variant=f"manifest{MANIFEST_VERSION}:{','.join(terrain_keys.values())}",
+                                   source=source)
+
+        output_dir = manifest_directory(cache_dir, index.root)
+        manifest = read_manifest(output_dir / "manifest.json")
+        missing_keys = {image_format: key for image_format, key in terrain_keys.items()
+                        if force or cache.get(key) is None}
+        if not force and manifest.get('inputs_key') == inputs_key and not missing_keys:
+            summary.update(status='unchanged', roads=manifest.get('roads', 0), materials=manifest.get('materials', 0))
+            return summary
+
+        stats = None
+        if missing_keys:
+            stats, summary['bytes'] = convert_terrain(cache, missing_keys, index, ter_file, json_file)
+        elif terrain_keys:
+            stats = cache.metadata(cache.get(next(iter(terrain_keys.values()))))['stats']
+
+        # Road and material manifests
+        parser = DecalRoadParser(str(index.root), index)
+        parser.parse_level()
+        roads = [dict({key: value for key, value in road.__dict__.items() if not key.startswith('_')},
+                      nodes=road.nodes.tolist(), content_hash=road.content_hash())
+                 for road in parser.get_roads_data()]
+        materials = {name: material.__dict__ for name, material in parser.materials.items()}
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        write_json(output_dir / "roads.json", roads)
+        write_json(output_dir / "materials.json", materials)
+        summary.update(roads=len(roads), materials=len(materials))
+        write_json(output_dir / "manifest.json", {
+            'version': MANIFEST_VERSION,
+            'level': str(index.root),
+            'inputs_key': inputs_key,
+            'terrain_cache_keys': terrain_keys,
+            'stats': stats,
+            'roads': len(roads),
+            'materials': len(materials),
+            'level_summary': index.summary(),
+        })
+        if not terrain_keys:
+            summary['status'] = 'no terrain'
+    except Exception as e:
+        summary.update(status='failed', error=f"{type(e).__name__}: {e}")
+    finally:
+        summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+def write_terrain_texture(path: Path, role: str, array: np.ndarray, image_format: str) -> str:
+    """Encode one texture the way the importer packs it for image_format; returns the file name
+
+    FLOAT and HALF heightmaps are single-channel EXRs normalised to 0-1, the
+    FLOAT layermap keeps raw material IDs in a float EXR, and everything
+    else is an 8/16-bit PNG.
+    """
+    if role == 'displacement' and image_format != 'PNG16':
+        filename = f"{role}.exr"
+        write_exr(path / filename, array, image_format, scale=1.0 / 65535.0)
+    elif role == 'layermap' and image_format == 'FLOAT':
+        filename = f"{role}.exr"
+        write_exr(path / filename, array, 'FLOAT')
+    else:
+        filename = f"{role}.png"
+        write_grayscale_png(path / filename, array)
+    return filename
+
+
+def convert_terrain(cache: ImportCache, keys: Dict[str, str], index: LevelIndex, ter_file: Path, json_file: Path):
+    """Decode the .ter once and commit a terrain entry per image format, in the layout the importer reads
+
+    keys maps each image format to convert to its cache key.
+
+    Returns (height statistics, bytes of .ter decoded).
+    """
+    source = index.source
+    terrain = source.terrain_file(ter_file, json_file)
+    terrain.load()
+
+    preset = None
+    preset_file = index.first('presets', top_level=True)
+    if preset_file:
+        try:
+            preset = TerrainPreset.load(preset_file, source)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  {index.root.name}: unreadable terrain preset: {e}")
+
+    terrain_data = {
+        'ter_file': ter_file,
+        'json_file': json_file,
+        'header': {
+            'version': terrain.version,
+            'size': terrain.size,
+            'data_start': terrain.layout.heightmap_offset,
+            'encoding': 'all_little_endian'
+        },
+        'config': terrain.config,
+        'materials': terrain.materials,
+        'material_names': terrain.material_names,
+        'height_scale': preset.height_scale if preset else DEFAULT_HEIGHT_SCALE,
+        'terrain_position': dict(preset.position) if preset and preset.position else None,
+        'preset': preset,
+        'stats': terrain_stats(terrain.heightmap),
+    }
+
+    try:
+        textures = {'displacement': terrain.heightmap}
+        if terrain.layermap is not None:
+            textures['layermap'] = terrain.layermap
+            hole_mask = terrain.hole_mask
+            if hole_mask is not None and hole_mask.any():
+                textures['holes'] = np.multiply(hole_mask, 255, dtype=np.uint8)
+
+        for image_format, key in keys.items():
+            pending = cache.begin()
+            try:
+                np.save(pending / "heightmap.npy", terrain.heightmap)
+                if terrain.layermap is not None:
+                    np.save(pending / "layermap.npy", terrain.layermap)
+
+                images = {}
+                for role, array in textures.items():
+                    filename = write_terrain_texture(pending, role, array, image_format)
+                    images[role] = {'file': filename, 'name': TERRAIN_IMAGE_NAMES[role]}
+
+                cache.commit(key, pending, terrain_entry_metadata(terrain_data, images))
+            except Exception:
+                cache.abort(pending)
+                raise
+    finally:
+        terrain.close()
+    return terrain_data['stats'], terrain.file_size
+
+
+def print_report(rows: List[Dict[str, Any]], elapsed: float) -> None:
+    """Per-level throughput table plus totals"""
+    print(f"\n{'Level':<32} {'Status':<11} {'Time':>8} {'MB/s':>8} {'Roads':>7} {'Mats':>6}")
+    for row in sorted(rows, key=lambda row: row['level'].lower()):
+        megabytes = row['bytes'] / (1024 * 1024)
+        rate = f"{megabytes / row['seconds']:.1f}" if row['bytes'] and row['seconds'] > 0 else "-"
+        print(f"{row['level'][:32]:<32} {row['status']:<11} {row['seconds']:>7.2f}s {rate:>8} "
+              f"{row['roads']:>7} {row['materials']:>6}")
+        if 'error' in row:
+            print(f"   ❌ {row['error']}")
+
+    counts = {}
+    for row in rows:
+        counts[row['status']] = counts.get(row['status'], 0) + 1
+    total_mb = sum(row['bytes'] for row in rows) / (1024 * 1024)
+    print(f"\n📊 {len(rows)} levels in {elapsed:.2f}s ({', '.join(f'{n} {s}' for s, n in counts.items())}), "
+          f"{total_mb:.1f} MB of terrain decoded ({total_mb / elapsed if elapsed > 0 else 0:.1f} MB/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert BeamNG levels into the Blender addon's import cache")
+    parser.add_argument("paths", nargs="+",
+                        help="content/levels folder(s), level folders or level zips")
+    parser.add_argument("--cache-dir", "-c", required=True,
+                        help="Import cache directory (the addon's Cache Directory preference)")
+    parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_CACHE_SIZE_MB,
+                        help=f"Cache size budget in MB (default: {DEFAULT_CACHE_SIZE_MB})")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--image-format", "-i", nargs="+", choices=IMAGE_FORMATS, default=[DEFAULT_IMAGE_FORMAT],
+                        help=f"Terrain image format(s) to cache, as in the importer's Terrain Image Format "
+                             f"(default: {DEFAULT_IMAGE_FORMAT}, the importer's default)")
+    parser.add_argument("--force", "-f", action="store_true",
+                        help="Convert levels even if they are unchanged")
+    args = parser.parse_args()
+
+    levels = find_levels(args.paths)
+    if not levels:
+        print("❌ No levels found")
+        return 1
+
+    print(f"🔄 Converting {len(levels)} levels with {args.jobs} workers into {args.cache_dir}")
+    start = time.perf_counter()
+    rows = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = [executor.submit(convert_level, str(level), args.cache_dir, args.cache_size_mb,
+                                   list(dict.fromkeys(args.image_format)), args.force)
+                   for level in levels]
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            print(f"   {'✅' if row['status'] != 'failed' else '❌'} {row['level']}: {row['status']} "
+                  f"({row['seconds']:.2f}s)")
+
+    print_report(rows, time.perf_counter() - start)
+    return 1 if any(row['status'] == 'failed' for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
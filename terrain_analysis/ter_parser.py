@@ -5,154 +5,64 @@ BeamNG .ter Terrain Parser - Fixed Version
 Data starts at offset 5 (after header). All data uses little-endian encoding.
 """
 
-import struct
 import json
+import sys
 import numpy as np
 from pathlib import Path
 from typing import Dict, Optional
 
+# Share the addon's bpy-free .ter reader and EXR writer
+sys.path.append(str(Path(__file__).resolve().parent.parent / "beamng_blender_addon"))
+from formats.ter import TerrainFile
+from formats.stats import cached_terrain_stats
+from formats.exr import write_exr
+
+HEIGHTMAP_EXR = "BeamNG_Terrain_Displacement.exr"
+LAYERMAP_EXR = "BeamNG_Terrain_Layermap.exr"
+
 class BeamNGTerrainParser:
     def __init__(self, ter_file: str, json_file: str):
-        self.ter_file = Path(ter_file)
-        self.json_file = Path(json_file)
-        
-        # Load JSON configuration
-        with open(self.json_file, 'r') as f:
-            self.config = json.load(f)
+        self.terrain = TerrainFile(ter_file, json_file)
+        self.ter_file = self.terrain.path
+        self.json_file = self.terrain.json_path
         
         # Extract parameters
-        self.version = self.config['version']
-        self.size = self.config['size']
-        self.heightmap_size = self.config['heightMapSize']
-        self.heightmap_item_size = self.config['heightMapItemSize']
-        self.layermap_size = self.config['layerMapSize']
-        self.layermap_item_size = self.config['layerMapItemSize']
-        self.materials = self.config['materials']
+        self.config = self.terrain.config
+        self.version = self.terrain.version
+        self.size = self.terrain.size
+        self.materials = self.terrain.materials
         
-        print("🏞️  BeamNG Terrain Parser")
-        print(f"📁 Terrain: {self.ter_file.name}")
-        print(f"📊 Dimensions: {self.size}x{self.size}")
-        print(f"🎭 Materials: {len(self.materials)}")
-        print("✅ Using offset 5 (after header), all data: little-endian")
+        print(f"🏞️  BeamNG Terrain: {self.ter_file.name} ({self.size}x{self.size}, {len(self.materials)} materials)")
     
     def parse_terrain(self) -> Dict:
-        """Parse the terrain file using CORRECTED offset and encoding"""
+        """Decode every terrain section in one sequential pass over the .ter"""
+        self.terrain.load()
+        
+        # Cross-check the embedded material table against .terrain.json
+        for problem in self.terrain.validate_materials():
+            print(f"⚠️  {problem}")
         
-        with open(self.ter_file, 'rb') as f:
-            # Read header (little-endian)
-            version = struct.unpack('B', f.read(1))[0]
-            size = struct.unpack('<I', f.read(4))[0]
-            
-            # Verify header
-            if version != self.version or size != self.size:
-                raise ValueError(f"Header mismatch: got version={version}, size={size}")
-            
-            # FIXED: Data starts at offset 5 (immediately after header)
-            data_start = 5
-            print(f"📍 Using CORRECTED data offset: {data_start} (0x{data_start:x})")
-            
-            # Read heightmap with LITTLE-ENDIAN encoding
-            f.seek(data_start)
-            heightmap_bytes = self.heightmap_size * self.heightmap_item_size
-            heightmap_data = f.read(heightmap_bytes)
-            
-            if len(heightmap_data) != heightmap_bytes:
-                print(f"⚠️  Warning: Expected {heightmap_bytes} bytes, got {len(heightmap_data)}")
-            
-            # Parse as 16-bit LITTLE-ENDIAN (CORRECTED)
-            num_heights = len(heightmap_data) // 2
-            heights = struct.unpack(f'<{num_heights}H', heightmap_data)  # <H = little-endian
-            
-            # Reshape to 2D
-            heightmap = np.array(heights, dtype=np.uint16).reshape((self.size, self.size))
-            
-            # Calculate layer map position
-            layermap_start = data_start + heightmap_bytes
-            layermap = None
-            
-            try:
-                f.seek(layermap_start)
-                
-                # Calculate how much layermap data is actually available
-                remaining_file_bytes = len(f.read())  # Read to end to get remaining size
-                f.seek(layermap_start)  # Seek back
-                
-                expected_layermap_bytes = self.layermap_size * self.layermap_item_size
-                available_layermap_bytes = min(expected_layermap_bytes, remaining_file_bytes)
-                
-                print("📊 Layermap info:")
-                print(f"   Expected: {expected_layermap_bytes:,} bytes")
-                print(f"   Available: {available_layermap_bytes:,} bytes")
-                
-                if available_layermap_bytes > 0:
-                    layermap_data = f.read(available_layermap_bytes)
-                    layers = struct.unpack(f'{len(layermap_data)}B', layermap_data)
-                    
-                    # Calculate how many complete rows we have
-                    pixels_available = len(layers)
-                    complete_rows = pixels_available // self.size
-                    remaining_pixels = pixels_available % self.size
-                    
-                    print(f"   Pixels available: {pixels_available:,}")
-                    print(f"   Complete rows: {complete_rows}")
-                    print(f"   Remaining pixels: {remaining_pixels}")
-                    
-                    if complete_rows > 0:
-                        # Create layermap with available data, pad with zeros if needed
-                        if pixels_available == self.layermap_size:
-                            # Perfect match
-                            layermap = np.array(layers, dtype=np.uint8).reshape((self.size, self.size))
-                            print(f"✅ Complete layer map loaded: {layermap.shape}")
-                        else:
-                            # Partial data - pad with zeros or truncate
-                            if pixels_available < self.layermap_size:
-                                # Pad with zeros
-                                padded_layers = list(layers) + [0] * (self.layermap_size - pixels_available)
-                                layermap = np.array(padded_layers, dtype=np.uint8).reshape((self.size, self.size))
-                                print(f"⚠️  Partial layer map loaded and padded: {layermap.shape}")
-                            else:
-                                # Truncate to expected size
-                                truncated_layers = layers[:self.layermap_size]
-                                layermap = np.array(truncated_layers, dtype=np.uint8).reshape((self.size, self.size))
-                                print(f"⚠️  Layer map loaded and truncated: {layermap.shape}")
-                    else:
-                        print("❌ Not enough data for even one complete row")
-                        layermap = None
-                else:
-                    print("❌ No layermap data available")
-                    layermap = None
-                    
-            except Exception as e:
-                print(f"❌ Could not read layer map: {e}")
-                layermap = None
-            
-            return {
-                'header': {
-                    'version': version,
-                    'size': size,
-                    'data_start': data_start,
-                    'encoding': 'all_little_endian'  # CORRECTED encoding description
-                },
-                'heightmap': heightmap,
-                'layermap': layermap,
-                'materials': self.materials,
-                'config': self.config
-            }
-    
-    def get_terrain_stats(self, heightmap: np.ndarray) -> Dict:
-        """Calculate terrain statistics"""
         return {
-            'shape': heightmap.shape,
-            'min_height': int(np.min(heightmap)),
-            'max_height': int(np.max(heightmap)),
-            'mean_height': float(np.mean(heightmap)),
-            'std_height': float(np.std(heightmap)),
-            'median_height': float(np.median(heightmap)),
-            'unique_values': len(np.unique(heightmap)),
-            'zero_count': int(np.sum(heightmap == 0)),
-            'zero_percentage': float(np.sum(heightmap == 0) / heightmap.size * 100)
+            'header': {
+                'version': self.version,
+                'size': self.size,
+                'data_start': self.terrain.layout.heightmap_offset,
+                'encoding': 'all_little_endian'
+            },
+            'terrain': self.terrain,
+            'heightmap': self.terrain.heightmap,
+            'layermap': self.terrain.layermap,
+            'layer_texture_map': self.terrain.layer_texture_map,
+            'coverage_maps': self.terrain.coverage_maps,
+            'material_names': self.terrain.material_names,
+            'materials': self.materials,
+            'config': self.config
         }
     
+    def get_terrain_stats(self, heightmap: np.ndarray) -> Dict:
+        """Height statistics from one chunked histogram pass, cached next to the .ter"""
+        return cached_terrain_stats(self.terrain.path, heightmap)
+    
     def analyze_materials(self, layermap: Optional[np.ndarray]) -> Dict:
         """Analyze material usage"""
         if layermap is None:
@@ -192,21 +102,21 @@ class BeamNGTerrainParser:
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
         
-        # Save heightmap as float32 for Blender (better precision)
-        heightmap_normalized = heightmap.astype(np.float32)
-        np.save(output_path / "heightmap.npy", heightmap_normalized)
+        # Stream the heightmap (normalised to 0-1) and layermap straight into EXRs
+        write_exr(output_path / HEIGHTMAP_EXR, heightmap, 'FLOAT', scale=1.0 / 65535.0)
         
-        # Save layer map if available
+        # Save layer map if available (material IDs are exact in half precision)
         if layermap is not None:
-            np.save(output_path / "layermap.npy", layermap)
+            write_exr(output_path / LAYERMAP_EXR, layermap, 'HALF')
         
         # Create Blender import metadata
         blender_metadata = {
             'terrain_info': {
                 'source_file': str(self.ter_file),
                 'dimensions': [self.size, self.size],
-                'heightmap_file': 'heightmap.npy',
-                'layermap_file': 'layermap.npy' if layermap is not None else None,
+                'heightmap_file': HEIGHTMAP_EXR,
+                'heightmap_scale': 65535,
+                'layermap_file': LAYERMAP_EXR if layermap is not None else None,
             },
             'heightmap_stats': stats,
             'materials': {
@@ -8,7 +8,7 @@ the terrain is properly loaded without wrapping artifacts.
 
 import numpy as np
 import matplotlib.pyplot as plt
-from ter_parser import BeamNGTerrainParser
+from ter_parser import TerrainFile
 
 def visualize_corrected_terrain():
     """Visualize the final corrected terrain data"""
@@ -17,14 +17,11 @@ def visualize_corrected_terrain():
     ter_file = f"{default_path}/small_island.ter"
     json_file = f"{default_path}/small_island.terrain.json"
     
-    # Create parser
-    parser = BeamNGTerrainParser(ter_file, json_file)
-    
-    # Parse terrain
-    terrain_data = parser.parse_terrain()
-    heightmap = terrain_data['heightmap']
-    layermap = terrain_data['layermap']
-    materials = terrain_data['materials']
+    # Open terrain - only the heightmap and layermap sections are decoded
+    terrain = TerrainFile(ter_file, json_file)
+    heightmap = terrain.heightmap
+    layermap = terrain.layermap
+    materials = terrain.materials
     
     print("Terrain data loaded successfully!")
     print(f"   Shape: {heightmap.shape}")